@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark parse_command throughput against the original regex cascade.
+
+The "cascade" baseline below reproduces the parser as it was before the
+compiled matcher: every parse_* helper re-normalizes the text and walks
+its own pattern list through the `re` module cache. Both parsers are run
+over the same corpus and their outputs are compared before timing.
+
+With --extra-intents N, N synthetic custom intents (each with its own
+leading verb) are registered before timing, to check that parse cost
+stays flat as the intent registry grows.
+
+Usage:
+    python benchmarks/bench_text_parsing.py [--rounds N] [--extra-intents N]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.command_corpus import COMMANDS
+from jarvis.utils.text_parsing import (
+    normalize_text, parse_command, register_intent, clear_parse_cache
+)
+
+def _cascade_app_launch(text):
+    text = normalize_text(text)
+    for pattern in [r'open\s+(.+)', r'launch\s+(.+)', r'start\s+(.+)', r'run\s+(.+)']:
+        match = re.match(pattern, text)
+        if match:
+            return re.sub(r'\s+(please|now|for me)$', '', match.group(1).strip())
+    return None
+
+def _cascade_browser(text):
+    text = normalize_text(text)
+    for pattern in [r'search\s+(?:google\s+)?for\s+(.+)', r'google\s+(.+)',
+                    r'search\s+(.+)', r'look\s+up\s+(.+)']:
+        match = re.match(pattern, text)
+        if match:
+            return {"action": "google_search", "query": match.group(1).strip()}
+    for pattern in [r'(?:open\s+)?youtube\s+(?:for\s+)?(.+)',
+                    r'search\s+youtube\s+(?:for\s+)?(.+)', r'play\s+(.+)\s+on\s+youtube']:
+        match = re.match(pattern, text)
+        if match:
+            return {"action": "youtube_search", "query": match.group(1).strip()}
+    for pattern in [r'(?:open\s+|go\s+to\s+)(https?://\S+)', r'(?:open\s+|go\s+to\s+)(www\.\S+)']:
+        match = re.match(pattern, text)
+        if match:
+            url = match.group(1)
+            if not url.startswith('http'):
+                url = 'https://' + url
+            return {"action": "open_url", "url": url}
+    return None
+
+def _cascade_file(text):
+    text = normalize_text(text)
+    for action in ("copy", "move"):
+        for pattern in [action + r'\s+(?:files?|folder|directory)?\s*(?:from)?\s+(.+?)\s+to\s+(.+)',
+                        action + r'\s+(.+?)\s+(?:to|into)\s+(.+)']:
+            match = re.match(pattern, text)
+            if match:
+                return {
+                    "action": action,
+                    "source": match.group(1).strip().strip('"\''),
+                    "destination": match.group(2).strip().strip('"\'')
+                }
+    for pattern in [r'delete\s+(?:file|folder)?\s*(?:at|in)?\s+(.+)',
+                    r'remove\s+(?:file|folder)?\s*(?:at|in)?\s+(.+)']:
+        match = re.match(pattern, text)
+        if match:
+            return {"action": "delete", "path": match.group(1).strip().strip('"\'')}
+    return None
+
+def _cascade_system(text):
+    text = normalize_text(text)
+    checks = [
+        (r'volume\s+up|increase\s+volume|louder', "volume_up"),
+        (r'volume\s+down|decrease\s+volume|quieter', "volume_down"),
+        (r'mute|silence', "mute"),
+        (r'unmute', "unmute"),
+        (r'screenshot|screen\s+shot|take\s+a?\s*picture', "screenshot"),
+        (r'shut\s*down|turn\s+off|power\s+off', "shutdown"),
+        (r'restart|reboot', "restart"),
+    ]
+    for pattern, action in checks:
+        if re.search(pattern, text):
+            return {"action": action}
+    return None
+
+def _cascade_typing(text):
+    text = normalize_text(text)
+    for pattern in [r'type\s+["\']?(.+?)["\']?$', r'write\s+["\']?(.+?)["\']?$',
+                    r'enter\s+["\']?(.+?)["\']?$', r'input\s+["\']?(.+?)["\']?$']:
+        match = re.match(pattern, text)
+        if match:
+            return match.group(1).strip()
+    if 'type this' in text or 'type the following' in text:
+        parts = text.split(':', 1)
+        if len(parts) > 1:
+            return parts[1].strip()
+    return None
+
+def cascade_parse_command(text):
+    """The original one-regex-at-a-time parse_command."""
+    if not text or not text.strip():
+        return {"type": "unknown", "data": None, "original": text}
+
+    original = text
+    text = normalize_text(text)
+
+    typing_text = _cascade_typing(original)
+    if typing_text:
+        return {"type": "typing", "data": {"text": typing_text}, "original": original}
+
+    for command_type, parser in [("app_launch", _cascade_app_launch),
+                                 ("browser", _cascade_browser),
+                                 ("file", _cascade_file),
+                                 ("system", _cascade_system)]:
+        data = parser(text)
+        if data:
+            if command_type == "app_launch":
+                data = {"app_name": data}
+            return {"type": command_type, "data": data, "original": original}
+
+    return {"type": "chat", "data": {"message": original}, "original": original}
+
+def _throughput(parser, corpus, rounds, before_round=None):
+    elapsed = 0.0
+    for _ in range(rounds):
+        if before_round:
+            before_round()
+        start = time.perf_counter()
+        for command in corpus:
+            parser(command)
+        elapsed += time.perf_counter() - start
+    return len(corpus) * rounds / elapsed
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--rounds", type=int, default=2000,
+                            help="passes over the corpus per parser")
+    arg_parser.add_argument("--extra-intents", type=int, default=0,
+                            help="synthetic custom intents to register first")
+    args = arg_parser.parse_args()
+
+    for index in range(args.extra_intents):
+        verb = f"customverb{index}"
+        register_intent(
+            f"custom_{index}",
+            lambda text, verb=verb: {"args": text[len(verb):].strip()}
+            if text.startswith(verb + " ") else None,
+            leading=(verb,),
+        )
+
+    mismatches = [
+        command for command in COMMANDS
+        if cascade_parse_command(command) != parse_command(command)
+    ]
+    for command in mismatches:
+        print(f"MISMATCH: {command!r}")
+        print(f"  cascade:  {cascade_parse_command(command)}")
+        print(f"  compiled: {parse_command(command)}")
+
+    before = _throughput(cascade_parse_command, COMMANDS, args.rounds)
+    uncached = _throughput(parse_command, COMMANDS, args.rounds, clear_parse_cache)
+    after = _throughput(parse_command, COMMANDS, args.rounds)
+
+    print(f"corpus: {len(COMMANDS)} commands x {args.rounds} rounds, "
+          f"{args.extra_intents} extra intents")
+    print(f"cascade:  {before:>12,.0f} commands/s")
+    print(f"compiled: {uncached:>12,.0f} commands/s (parse cache cleared every round)")
+    print(f"cached:   {after:>12,.0f} commands/s")
+    print(f"speedup:  {uncached / before:>12.2f}x uncached, {after / before:.2f}x cached")
+
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Representative command strings, as sent by the voice loop and phone app.
+Shared by the parser benchmarks.
+"""
+
+COMMANDS = [
+    # App launch
+    "open chrome",
+    "Open Spotify please",
+    "launch VS Code",
+    "start notepad now",
+    "run calculator",
+    "open file explorer for me",
+    "Launch Microsoft Edge.",
+
+    # Browser
+    "search for python list comprehension",
+    "search google for cheap flights to tokyo",
+    "google weather tomorrow",
+    "look up the capital of australia",
+    "search youtube for lofi beats",
+    "youtube for cooking pasta",
+    "play bohemian rhapsody on youtube",
+    "go to https://github.com",
+    "go to www.wikipedia.org",
+
+    # File operations
+    'copy files from "C:/Users/me/Documents" to "D:/Backup"',
+    "copy report.docx to D:/shared",
+    "move folder from C:/temp/photos to D:/pictures",
+    "move notes.txt into C:/archive",
+    "delete file at C:/temp/old.log",
+    "remove folder in C:/Users/me/Downloads/junk",
+
+    # System
+    "volume up",
+    "turn the volume down",
+    "make it louder",
+    "mute",
+    "unmute",
+    "take a screenshot",
+    "take a picture of the screen",
+    "shutdown",
+    "confirm shutdown",
+    "cancel shutdown",
+    "reboot the computer",
+
+    # Typing
+    "type 'hello world'",
+    'write "meeting moved to 3pm"',
+    "type this: see you tomorrow",
+    "enter my email address",
+
+    # Chat
+    "how are you today",
+    "what's the weather like?",
+    "tell me a joke",
+    "who won the game last night",
+    "what can you do",
+    "thanks buddy",
+    "I had a long day at work",
+    "explain quantum computing in simple terms",
+]
@@ -2,14 +2,32 @@
 Flask REST API server for remote control from Android app.
 """
 
+import json
 import threading
-from flask import Flask, request, jsonify
+import time
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from loguru import logger
 
 from jarvis.config.settings import FLASK_HOST, FLASK_PORT, FLASK_DEBUG
 from jarvis.remote.remote_controller import remote_controller
 from jarvis.core.ai_engine import ai_engine
+from jarvis.core.command_router import command_router
+from jarvis.core.async_runtime import async_runtime
+from jarvis.core.scheduler import command_scheduler, PRIORITY_CHAT
+from jarvis.core.streaming import stream_sentences, time_to_first_audio, time_to_first_chunk
+from jarvis.database.db_manager import db_manager
+from jarvis.core.ack_engine import ack_engine
+from jarvis.core.conversation_store import conversation_store
+from jarvis.core.prompt_builder import prompt_builder
+from jarvis.api.response_cache import response_cache
+from jarvis.utils.text_parsing import get_parse_cache_stats
+
+SESSION_HEADER = "X-Jarvis-Session"
+
+def _session_id(data: dict):
+    """The caller's conversation: the session header, else session_id/device_id in the body."""
+    return request.headers.get(SESSION_HEADER) or data.get('session_id') or data.get('device_id')
 
 def create_app() -> Flask:
     """Create and configure Flask app."""
@@ -33,7 +51,8 @@ def create_app() -> Flask:
                 }), 400
             
             command_text = data['command']
-            result = remote_controller.handle_remote_command(command_text)
+            session_id = _session_id(data)
+            result = remote_controller.handle_remote_command(command_text, session_id=session_id)
             
             return jsonify(result)
             
@@ -67,9 +86,30 @@ def create_app() -> Flask:
                 "error": str(e)
             }), 500
     
+    def stream_reply(message: str, session_id=None):
+        """NDJSON lines: {"text": sentence} as each completes, then {"done": true}."""
+        started = time.perf_counter()
+        sentences = async_runtime.iterate(command_scheduler.stream(
+            "api", PRIORITY_CHAT,
+            lambda: stream_sentences(ai_engine.stream_reply_async(message, session_id=session_id))
+        ))
+        try:
+            first = True
+            for sentence in sentences:
+                if first:
+                    time_to_first_chunk.observe((time.perf_counter() - started) * 1000)
+                    first = False
+                yield json.dumps({"text": sentence}) + "\n"
+            yield json.dumps({"done": True, "success": True, "action": "chat"}) + "\n"
+        except Exception as e:
+            logger.error(f"API error in streamed /ask: {e}")
+            yield json.dumps({"done": True, "success": False, "error": str(e)}) + "\n"
+        finally:
+            sentences.close()
+    
     @app.route('/ask', methods=['POST'])
     def ask():
-        """Direct AI chat endpoint."""
+        """Direct AI chat endpoint ("stream": true for chunked NDJSON output), per session."""
         try:
             data = request.get_json()
             if not data or 'message' not in data:
@@ -79,7 +119,13 @@ def create_app() -> Flask:
                 }), 400
             
             message = data['message']
-            response = ai_engine.generate_reply(message)
+            session_id = _session_id(data)
+            if data.get('stream'):
+                return Response(stream_reply(message, session_id), mimetype='application/x-ndjson')
+            
+            response = async_runtime.run(command_scheduler.run(
+                "api", PRIORITY_CHAT, lambda: ai_engine.generate_reply_async(message, session_id=session_id)
+            ))
             
             return jsonify({
                 "success": True,
@@ -94,6 +140,116 @@ def create_app() -> Flask:
                 "error": str(e)
             }), 500
     
+    @app.route('/stats/parser', methods=['GET'])
+    def parser_stats():
+        """Command parser cache counters."""
+        return jsonify({
+            "success": True,
+            "cache": get_parse_cache_stats()
+        })
+    
+    @app.route('/stats/handlers', methods=['GET'])
+    def handler_stats():
+        """Per-handler call counters and latency histograms."""
+        return jsonify({
+            "success": True,
+            "handlers": command_router.handlers.stats()
+        })
+    
+    @app.route('/stats/command_log', methods=['GET'])
+    def command_log_stats():
+        """Command history write-behind queue counters."""
+        return jsonify({
+            "success": True,
+            "command_log": db_manager.get_command_log_stats()
+        })
+    
+    @app.route('/stats/acks', methods=['GET'])
+    def ack_stats():
+        """Acknowledgement phrase pool sizes and counters."""
+        return jsonify({
+            "success": True,
+            "acks": ack_engine.stats()
+        })
+    
+    @app.route('/stats/speculation', methods=['GET'])
+    def speculation_stats():
+        """Speculative reply usage and time saved per command type."""
+        return jsonify({
+            "success": True,
+            "active": command_router.speculating,
+            "speculation": command_router.speculation_stats.snapshot()
+        })
+    
+    @app.route('/stats/coalescer', methods=['GET'])
+    def coalescer_stats():
+        """Repeated commands received vs. actions executed."""
+        return jsonify({
+            "success": True,
+            "coalescer": command_router.coalescer.stats()
+        })
+    
+    @app.route('/stats/scheduler', methods=['GET'])
+    def scheduler_stats():
+        """Command queue depth and wait times per priority class."""
+        return jsonify({
+            "success": True,
+            "scheduler": command_scheduler.stats()
+        })
+    
+    @app.route('/stats/llm_cache', methods=['GET'])
+    def llm_cache_stats():
+        """LLM response cache hit/miss counters."""
+        return jsonify({
+            "success": True,
+            "llm_cache": response_cache.stats()
+        })
+    
+    @app.route('/stats/conversations', methods=['GET'])
+    def conversation_stats():
+        """In-memory conversation buffers and their write-behind writer."""
+        return jsonify({
+            "success": True,
+            "conversations": conversation_store.stats(),
+            "writer": db_manager.get_conversation_log_stats()
+        })
+    
+    @app.route('/stats/prompts', methods=['GET'])
+    def prompt_stats():
+        """Reply prompt sizes, summaries and LLM latency by prompt size."""
+        return jsonify({
+            "success": True,
+            "prompts": prompt_builder.stats()
+        })
+    
+    @app.route('/stats/gemini', methods=['GET'])
+    def gemini_stats():
+        """LLM backend, circuit breaker, coalesced requests and rate limiter."""
+        return jsonify({
+            "success": True,
+            "backend": ai_engine.client.backend.name,
+            "circuit": ai_engine.client.breaker.stats(),
+            "single_flight": ai_engine.client.single_flight.stats(),
+            "rate_limiter": ai_engine.client.limiter.stats()
+        })
+    
+    @app.route('/stats/llm', methods=['GET'])
+    def llm_stats():
+        """LLM latency, retries, sizes, cache status and fallbacks per call site and source."""
+        return jsonify({
+            "success": True,
+            **ai_engine.client.telemetry.stats()
+        })
+    
+    @app.route('/stats/streaming', methods=['GET'])
+    def streaming_stats():
+        """Time to first audio (voice) and first chunk (streamed /ask)."""
+        return jsonify({
+            "success": True,
+            "time_to_first_audio_ms": time_to_first_audio.snapshot(),
+            "time_to_first_chunk_ms": time_to_first_chunk.snapshot()
+        })
+    
     @app.errorhandler(404)
     def not_found(e):
         return jsonify({
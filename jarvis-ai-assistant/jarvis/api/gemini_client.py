@@ -1,43 +1,66 @@
 """
 Google Gemini API client wrapper with retry logic and error handling.
+Retries back off exponentially with jitter inside a per-call deadline;
+a circuit breaker skips straight to local fallbacks while Gemini is down.
+Concurrent identical requests (same prompt and parameters) share one
+in-flight call, and every attempt needs a permit from the rate limiter
+(requests per minute, outstanding calls, fair queue per call site and
+source; low-priority call sites fall back locally instead of waiting).
+The model call itself goes through an LLMBackend (Gemini by default,
+see llm_backend.py), so the same client can run against a local stand-in.
+Every call is reported to the LLM telemetry (latency, attempts, sizes,
+cache status and fallbacks per call site and source, see llm_telemetry.py).
 """
 
 import os
 import time
-from typing import Optional, List, Dict, Any
-import google.generativeai as genai
+import asyncio
+from typing import Optional, List, Dict, Any, AsyncIterator
 from loguru import logger
 
-from jarvis.config.settings import GEMINI_API_KEY, GEMINI_MODEL, JARVIS_NAME, BUDDY_SYSTEM_PROMPT
+from jarvis.config.settings import GEMINI_MODEL, JARVIS_NAME, BUDDY_SYSTEM_PROMPT
+from jarvis.api.llm_backend import LLMBackend, GeminiBackend, create_backend
+from jarvis.api.response_cache import ResponseCache, response_cache, cache_key
+from jarvis.api.resilience import CircuitBreaker, RetryPolicy
+from jarvis.api.single_flight import SingleFlight
+from jarvis.api.rate_limiter import RateLimiter
+from jarvis.api.llm_telemetry import LLMTelemetry, llm_telemetry
 
 class GeminiClient:
-    """Wrapper for Google Gemini API."""
+    """Wrapper for Google Gemini API (or another LLMBackend)."""
     
-    def __init__(self, api_key: Optional[str] = None):
-        self.api_key = api_key or GEMINI_API_KEY
-        if not self.api_key:
-            logger.warning("No Gemini API key provided. AI features will be limited.")
-            self.model = None
-            return
-        
-        try:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel(GEMINI_MODEL)
-            logger.info("Gemini client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Gemini: {e}")
-            self.model = None
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        retry: Optional[RetryPolicy] = None,
+        backend: Optional[LLMBackend] = None,
+        single_flight: Optional[SingleFlight] = None,
+        limiter: Optional[RateLimiter] = None,
+        telemetry: Optional[LLMTelemetry] = None
+    ):
+        self.backend = backend or (GeminiBackend(api_key) if api_key else create_backend())
+        self.cache = cache if cache is not None else response_cache
+        self.breaker = breaker or CircuitBreaker()
+        self.retry = retry or RetryPolicy()
+        self.single_flight = single_flight or SingleFlight()
+        self.limiter = limiter or RateLimiter()
+        self.telemetry = telemetry if telemetry is not None else llm_telemetry
+        self.max_output_tokens = 500
     
     def is_available(self) -> bool:
-        """Check if Gemini API is configured and available."""
-        return self.model is not None
+        """Check if the LLM backend is configured and available."""
+        return self.backend.is_available()
     
     def chat(
         self, 
         prompt: str, 
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
-        max_retries: int = 3
+        max_retries: Optional[int] = None,
+        cache: bool = False,
+        call_site: str = "chat"
     ) -> str:
         """
         Send a chat message to Gemini with retry logic.
@@ -46,46 +69,378 @@ class GeminiClient:
             prompt: User message
             system_prompt: Optional system instructions
             temperature: Creativity level (0.0 to 1.0)
-            max_retries: Number of retry attempts
+            max_retries: Number of attempts (default: the retry policy's)
+            cache: Serve/store the response from the response cache
+            call_site: Call site for the rate limiter (sets the queueing
+                priority) and telemetry
             
         Returns:
             Response text or fallback message
         """
         if not self.is_available():
+            self.telemetry.record(call_site, fallback="offline")
             return self._fallback_response()
         
-        # Build system prompt with personality
-        if system_prompt is None:
-            system_prompt = BUDDY_SYSTEM_PROMPT.format(name=JARVIS_NAME)
-        
-        full_prompt = f"{system_prompt}\n\nUser: {prompt}\n\n{JARVIS_NAME}:"
+        response = self._complete(
+            self._build_prompt(prompt, system_prompt), temperature, max_retries, cache, call_site
+        )
+        return response if response is not None else self._fallback_response(error=True)
+    
+    async def chat_async(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_retries: Optional[int] = None,
+        cache: bool = False,
+        call_site: str = "chat"
+    ) -> str:
+        """
+        Awaitable version of chat(); same retry behaviour, but waits
+        without blocking the event loop.
+        """
+        if not self.is_available():
+            self.telemetry.record(call_site, fallback="offline")
+            return self._fallback_response()
         
-        for attempt in range(max_retries):
+        response = await self._complete_async(
+            self._build_prompt(prompt, system_prompt), temperature, max_retries, cache, call_site
+        )
+        return response if response is not None else self._fallback_response(error=True)
+
+    def complete(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        cache: bool = False,
+        call_site: str = "chat"
+    ) -> Optional[str]:
+        """
+        Like chat(), but returns None instead of a fallback reply, for
+        callers with their own fallback that must not mistake one for
+        real output.
+        """
+        if not self.is_available():
+            self.telemetry.record(call_site, fallback="offline")
+            return None
+        return self._complete(self._build_prompt(prompt, system_prompt), temperature, cache=cache, call_site=call_site)
+    
+    async def complete_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        cache: bool = False,
+        call_site: str = "chat"
+    ) -> Optional[str]:
+        """Awaitable version of complete()."""
+        if not self.is_available():
+            self.telemetry.record(call_site, fallback="offline")
+            return None
+        return await self._complete_async(
+            self._build_prompt(prompt, system_prompt), temperature, cache=cache, call_site=call_site
+        )
+
+    def _complete(
+        self,
+        full_prompt: str,
+        temperature: float,
+        max_retries: Optional[int] = None,
+        cache: bool = False,
+        call_site: str = "chat"
+    ) -> Optional[str]:
+        """
+        Call Gemini with retries, backoff, the call deadline, the rate
+        limiter and the circuit breaker; concurrent identical calls share
+        one request. Returns None if no answer could be obtained.
+        """
+        started = time.perf_counter()
+        trace = {"cache": "miss" if cache else "off"}
+        response = None
+        try:
+            key = self._cache_key(full_prompt, temperature)
+            if cache:
+                response = self.cache.get(key)
+                if response is not None:
+                    trace["cache"] = "hit"
+                    return response
+            
+            response = self.single_flight.do(
+                key, lambda: self._call(full_prompt, temperature, max_retries, call_site, trace)
+            )
+            return self._store(key if cache else None, response) if response is not None else None
+        finally:
+            self._record(call_site, started, full_prompt, response, trace)
+    
+    def _call(
+        self,
+        full_prompt: str,
+        temperature: float,
+        max_retries: Optional[int] = None,
+        call_site: str = "chat",
+        trace: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        One logical request: the retry loop behind _complete(). Backend
+        attempts and the reason for giving up are noted in `trace`.
+        """
+        trace = trace if trace is not None else {}
+        trace["attempts"] = 0
+        trace["fallback"] = "failed"
+        attempts = max_retries or self.retry.max_attempts
+        deadline = self.retry.start()
+        for attempt in range(attempts):
+            if not self.breaker.allow():
+                logger.debug("Gemini circuit open; using fallback")
+                trace["fallback"] = "circuit_open"
+                return None
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                break
+            if not self.limiter.acquire(call_site, max_wait=remaining):
+                logger.debug(f"Rate limited ({call_site}); using fallback")
+                trace["fallback"] = "rate_limited"
+                return None
+            trace["attempts"] += 1
             try:
-                response = self.model.generate_content(
-                    full_prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=temperature,
-                        max_output_tokens=500,
-                    )
+                text = self.backend.generate(
+                    full_prompt, temperature, self.max_output_tokens, timeout=max(0.001, deadline.remaining())
                 )
-                
-                if response.text:
-                    logger.debug(f"Gemini response received ({len(response.text)} chars)")
-                    return response.text.strip()
-                else:
-                    logger.warning("Empty response from Gemini")
-                    if attempt < max_retries - 1:
-                        time.sleep(0.5 * (attempt + 1))
-                        
             except Exception as e:
+                self.breaker.record_failure()
                 logger.error(f"Gemini API error (attempt {attempt + 1}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(1 * (attempt + 1))
-                else:
+            else:
+                self.breaker.record_success()
+                if text:
+                    logger.debug(f"Gemini response received ({len(text)} chars)")
+                    trace["fallback"] = None
+                    return text.strip()
+                logger.warning("Empty response from Gemini")
+            finally:
+                self.limiter.release()
+            
+            if attempt < attempts - 1:
+                # Short, capped backoff: this sleep holds the caller's thread
+                delay = self.retry.backoff(attempt, blocking=True)
+                if delay >= deadline.remaining():
+                    break
+                time.sleep(delay)
+        
+        return None
+    
+    async def _complete_async(
+        self,
+        full_prompt: str,
+        temperature: float,
+        max_retries: Optional[int] = None,
+        cache: bool = False,
+        call_site: str = "chat"
+    ) -> Optional[str]:
+        """Awaitable version of _complete()."""
+        started = time.perf_counter()
+        trace = {"cache": "miss" if cache else "off"}
+        response = None
+        try:
+            key = self._cache_key(full_prompt, temperature)
+            if cache:
+                response = self.cache.get(key)
+                if response is not None:
+                    trace["cache"] = "hit"
+                    return response
+            
+            response = await self.single_flight.do_async(
+                key, lambda: self._call_async(full_prompt, temperature, max_retries, call_site, trace)
+            )
+            return self._store(key if cache else None, response) if response is not None else None
+        except asyncio.CancelledError:
+            trace["fallback"] = "cancelled"
+            raise
+        finally:
+            self._record(call_site, started, full_prompt, response, trace)
+    
+    async def _call_async(
+        self,
+        full_prompt: str,
+        temperature: float,
+        max_retries: Optional[int] = None,
+        call_site: str = "chat",
+        trace: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """Awaitable version of _call()."""
+        trace = trace if trace is not None else {}
+        trace["attempts"] = 0
+        trace["fallback"] = "failed"
+        attempts = max_retries or self.retry.max_attempts
+        deadline = self.retry.start()
+        for attempt in range(attempts):
+            if not self.breaker.allow():
+                logger.debug("Gemini circuit open; using fallback")
+                trace["fallback"] = "circuit_open"
+                return None
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                break
+            if not await self.limiter.acquire_async(call_site, max_wait=remaining):
+                logger.debug(f"Rate limited ({call_site}); using fallback")
+                trace["fallback"] = "rate_limited"
+                return None
+            trace["attempts"] += 1
+            try:
+                text = await asyncio.wait_for(
+                    self.backend.generate_async(full_prompt, temperature, self.max_output_tokens),
+                    max(0.001, deadline.remaining())
+                )
+            except Exception as e:
+                self.breaker.record_failure()
+                logger.error(f"Gemini API error (attempt {attempt + 1}): {e!r}")
+            else:
+                self.breaker.record_success()
+                if text:
+                    logger.debug(f"Gemini response received ({len(text)} chars)")
+                    trace["fallback"] = None
+                    return text.strip()
+                logger.warning("Empty response from Gemini")
+            finally:
+                self.limiter.release()
+            
+            if attempt < attempts - 1:
+                delay = self.retry.backoff(attempt)
+                if delay >= deadline.remaining():
                     break
+                await asyncio.sleep(delay)
+        
+        return None
+    
+    async def chat_stream_async(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        cache: bool = False,
+        call_site: str = "chat"
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat response as it is generated.
+        
+        Args:
+            prompt: User message
+            system_prompt: Optional system instructions
+            temperature: Creativity level (0.0 to 1.0)
+            cache: Serve/store the complete response from the response cache
+            call_site: Call site for the rate limiter and telemetry
+            
+        Yields:
+            Text chunks; a fallback message if the request fails before
+            anything was received (a stream that breaks off midway, or is
+            still running at the call deadline, just ends)
+        """
+        if not self.is_available():
+            self.telemetry.record(call_site, fallback="offline")
+            yield self._fallback_response()
+            return
+        
+        started = time.perf_counter()
+        full_prompt = self._build_prompt(prompt, system_prompt)
+        trace = {"cache": "miss" if cache else "off", "attempts": 0, "fallback": None}
+        parts = []
+        try:
+            key = self._cache_key(full_prompt, temperature) if cache else None
+            if key:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    trace["cache"] = "hit"
+                    parts.append(cached)
+                    yield cached
+                    return
+            
+            if not self.breaker.allow():
+                logger.debug("Gemini circuit open; using fallback")
+                trace["fallback"] = "circuit_open"
+                yield self._fallback_response(error=True)
+                return
+            
+            # The permit is held until the stream ends
+            deadline = self.retry.start()
+            if not await self.limiter.acquire_async(call_site, max_wait=deadline.remaining()):
+                logger.debug(f"Rate limited ({call_site} stream); using fallback")
+                trace["fallback"] = "rate_limited"
+                yield self._fallback_response(error=True)
+                return
+            
+            trace["attempts"] = 1
+            stream = self.backend.stream_async(full_prompt, temperature, self.max_output_tokens)
+            try:
+                # The call deadline bounds the whole stream, not just the first chunk
+                while True:
+                    text = await asyncio.wait_for(anext(stream, None), max(0.001, deadline.remaining()))
+                    if text is None:
+                        break
+                    if text:
+                        parts.append(text)
+                        yield text
+            except Exception as e:
+                self.breaker.record_failure()
+                logger.error(f"Gemini streaming error after {len(parts)} chunks: {e!r}")
+                if not parts:
+                    trace["fallback"] = "failed"
+                    yield self._fallback_response(error=True)
+                return
+            finally:
+                await stream.aclose()
+                self.limiter.release()
+            
+            self.breaker.record_success()
+            if parts:
+                self._store(key, "".join(parts).strip())
+            else:
+                logger.warning("Empty response from Gemini")
+                trace["fallback"] = "failed"
+                yield self._fallback_response(error=True)
+        finally:
+            # Latency runs until the stream is finished (or abandoned)
+            self._record(
+                call_site, started, full_prompt, "".join(parts) if trace["fallback"] is None else None, trace
+            )
+    
+    def _record(
+        self, call_site: str, started: float, full_prompt: str, response: Optional[str], trace: Dict[str, Any]
+    ):
+        """Report a finished call to the telemetry."""
+        if "attempts" not in trace and trace["cache"] != "hit":
+            # _call never ran for us: we joined another caller's request
+            trace["cache"] = "shared"
+        fallback = None
+        if response is None:
+            fallback = trace.get("fallback") or "failed"
+        self.telemetry.record(
+            call_site,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            prompt_chars=len(full_prompt),
+            response_chars=len(response) if response else 0,
+            attempts=trace.get("attempts", 0),
+            cache=trace["cache"],
+            fallback=fallback
+        )
+    
+    def _build_prompt(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Prefix the user message with the (personality) system prompt."""
+        if system_prompt is None:
+            system_prompt = BUDDY_SYSTEM_PROMPT.format(name=JARVIS_NAME)
         
-        return self._fallback_response(error=True)
+        return f"{system_prompt}\n\nUser: {prompt}\n\n{JARVIS_NAME}:"
+    
+    def _cache_key(self, full_prompt: str, temperature: float) -> str:
+        return cache_key(
+            backend=self.backend.name, model=GEMINI_MODEL, prompt=full_prompt,
+            temperature=temperature, max_output_tokens=self.max_output_tokens
+        )
+    
+    def _store(self, key: Optional[str], response: str) -> str:
+        """Cache a real (non-fallback) response if the call opted in."""
+        if key:
+            self.cache.put(key, response)
+        return response
     
     def generate_command_response(
         self, 
@@ -109,20 +464,44 @@ class GeminiClient:
         if not self.is_available():
             return self._generate_local_response(command_type, success, details)
         
-        # Build contextual prompt
-        status = "succeeded" if success else "failed"
-        prompt = f"""The user asked me to {command_type}. It {status}.
-Details: {details}
-
-Give a brief, friendly response (1-2 sentences) as a helpful buddy. 
-Be natural and conversational. If it failed, be supportive and suggest what might have gone wrong."""
+        prompt = self._command_response_prompt(command_type, success, details)
 
         try:
-            response = self.chat(prompt, temperature=0.6)
-            return response
+            response = self._complete(self._build_prompt(prompt), temperature=0.6, call_site="command_response")
         except Exception as e:
             logger.error(f"Failed to generate command response: {e}")
+            response = None
+        return response if response is not None else self._generate_local_response(command_type, success, details)
+    
+    async def generate_command_response_async(
+        self, 
+        command_type: str, 
+        success: bool, 
+        details: str = ""
+    ) -> str:
+        """Awaitable version of generate_command_response()."""
+        if not self.is_available():
             return self._generate_local_response(command_type, success, details)
+        
+        prompt = self._command_response_prompt(command_type, success, details)
+
+        try:
+            response = await self._complete_async(
+                self._build_prompt(prompt), temperature=0.6, call_site="command_response"
+            )
+        except Exception as e:
+            logger.error(f"Failed to generate command response: {e}")
+            response = None
+        return response if response is not None else self._generate_local_response(command_type, success, details)
+    
+    def _command_response_prompt(self, command_type: str, success: bool, details: str) -> str:
+        """Build the contextual prompt for a command confirmation."""
+        status = "succeeded" if success else "failed"
+        return f"""The user asked me to {command_type}. It {status}.
+Details: {details}
+
+Give a brief, friendly response (1-2 sentences) as a helpful buddy. 
+Be natural and conversational. If it failed, be supportive and suggest what might have gone wrong."""
     
     def _generate_local_response(
         self, 
@@ -0,0 +1,252 @@
+"""
+LLM backends: the raw "prompt in, text out" call behind GeminiClient.
+
+GeminiClient (prompting, caching, retries, circuit breaker) talks to an
+LLMBackend instead of google.generativeai directly, so the whole stack
+can run against a different model service, or fully offline:
+
+- GeminiBackend: Google Gemini (google.generativeai is imported lazily)
+- LocalBackend: deterministic in-process stand-in with configurable
+  latency distribution, error rate and streaming, for tests and offline
+  benchmarks of the router, /ask and the AI engine
+
+LLM_BACKEND selects the default ("gemini" or "local").
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from loguru import logger
+
+from jarvis.config.settings import (
+    GEMINI_API_KEY, GEMINI_MODEL, LLM_BACKEND,
+    LOCAL_LLM_LATENCY_MS, LOCAL_LLM_LATENCY_JITTER_MS, LOCAL_LLM_LATENCY_DISTRIBUTION,
+    LOCAL_LLM_ERROR_RATE, LOCAL_LLM_STREAM_CHUNK_CHARS, LOCAL_LLM_CHUNK_DELAY_MS,
+    LOCAL_LLM_SEED
+)
+from jarvis.core.async_runtime import async_runtime
+
+class LLMBackend:
+    """Interface every backend implements."""
+
+    name = "base"
+
+    def is_available(self) -> bool:
+        return True
+
+    def generate(
+        self, prompt: str, temperature: float, max_output_tokens: int, timeout: Optional[float] = None
+    ) -> str:
+        """Blocking completion; raises on failure."""
+        raise NotImplementedError
+
+    async def generate_async(self, prompt: str, temperature: float, max_output_tokens: int) -> str:
+        """Awaitable completion; raises on failure."""
+        raise NotImplementedError
+
+    def stream_async(self, prompt: str, temperature: float, max_output_tokens: int) -> AsyncIterator[str]:
+        """Async iterator of text chunks; raises on failure."""
+        raise NotImplementedError
+
+class GeminiBackend(LLMBackend):
+    """
+    Google Gemini via google.generativeai.
+
+    The pinned SDK (0.3.x) has no per-request timeout, so generate()
+    runs the async call on the shared async runtime under the timeout;
+    a call that times out is cancelled rather than left running.
+    """
+
+    name = "gemini"
+
+    def __init__(self, api_key: Optional[str] = None, model_name: str = GEMINI_MODEL):
+        self.api_key = api_key or GEMINI_API_KEY
+        self.model = None
+        self._genai = None
+        if not self.api_key:
+            logger.warning("No Gemini API key provided. AI features will be limited.")
+            return
+
+        try:
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+            self._genai = genai
+            self.model = genai.GenerativeModel(model_name)
+            logger.info("Gemini client initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize Gemini: {e}")
+            self.model = None
+
+    def is_available(self) -> bool:
+        return self.model is not None
+
+    def _generation_config(self, temperature: float, max_output_tokens: int):
+        if self._genai is None:
+            return {"temperature": temperature, "max_output_tokens": max_output_tokens}
+        return self._genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+        )
+
+    def generate(self, prompt, temperature, max_output_tokens, timeout=None):
+        if async_runtime.in_loop_thread():
+            # Can't wait on the loop from its own thread
+            response = self.model.generate_content(
+                prompt,
+                generation_config=self._generation_config(temperature, max_output_tokens)
+            )
+            return response.text
+        try:
+            return async_runtime.run(
+                asyncio.wait_for(self.generate_async(prompt, temperature, max_output_tokens), timeout)
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Gemini call timed out after {timeout:.1f}s") from None
+
+    async def generate_async(self, prompt, temperature, max_output_tokens):
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=self._generation_config(temperature, max_output_tokens)
+        )
+        return response.text
+
+    async def stream_async(self, prompt, temperature, max_output_tokens):
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=self._generation_config(temperature, max_output_tokens),
+            stream=True
+        )
+        async for chunk in response:
+            yield chunk.text
+
+class LocalBackendError(RuntimeError):
+    """Simulated service failure from LocalBackend."""
+
+_LIST_REQUEST = re.compile(r"Write (\d+) different")
+_REPLIES = [
+    "Sure thing! {topic} sounds good to me. Anything else I can do?",
+    "Got it. Here's the short version on {topic}: it's all under control.",
+    "Happy to help with {topic}! Let me know if you need more detail.",
+    "On it! {topic} is exactly the kind of thing I like. What's next?",
+]
+
+def default_responder(prompt: str) -> str:
+    """Deterministic canned reply derived from the prompt text."""
+    digest = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+
+    # Acknowledgement-pool refills ask for a list, one reply per line
+    wanted = _LIST_REQUEST.search(prompt)
+    if wanted:
+        return "\n".join(f"All done, reply number {i + 1}! 👍" for i in range(int(wanted.group(1))))
+
+    lines = [line for line in prompt.splitlines() if line.strip()]
+    last = lines[-2] if len(lines) > 1 and lines[-1].rstrip().endswith(":") else (lines[-1] if lines else "")
+    topic = last.split(":", 1)[-1].strip().strip("'\"")[:60] or "that"
+    return _REPLIES[digest % len(_REPLIES)].format(topic=topic)
+
+class LocalBackend(LLMBackend):
+    """
+    Offline stand-in with realistic timing.
+
+    Latency (time to the full reply, or to the first streamed chunk) is
+    drawn from a "fixed", "uniform" (latency_ms +- jitter_ms) or
+    "lognormal" (mean latency_ms, standard deviation jitter_ms)
+    distribution. A fraction error_rate of calls fail with
+    LocalBackendError after that latency. Streaming yields stream_chunk_chars-sized chunks every
+    chunk_delay_ms. Replies are a deterministic function of the prompt.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        latency_ms: float = LOCAL_LLM_LATENCY_MS,
+        jitter_ms: float = LOCAL_LLM_LATENCY_JITTER_MS,
+        distribution: str = LOCAL_LLM_LATENCY_DISTRIBUTION,
+        error_rate: float = LOCAL_LLM_ERROR_RATE,
+        stream_chunk_chars: int = LOCAL_LLM_STREAM_CHUNK_CHARS,
+        chunk_delay_ms: float = LOCAL_LLM_CHUNK_DELAY_MS,
+        seed: Optional[int] = LOCAL_LLM_SEED,
+        responder: Callable[[str], str] = default_responder
+    ):
+        if distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+        self.error_rate = error_rate
+        self.stream_chunk_chars = max(1, stream_chunk_chars)
+        self.chunk_delay_ms = chunk_delay_ms
+        self.responder = responder
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def _draw(self) -> tuple:
+        """(latency in seconds, whether this call fails) for one call."""
+        with self._lock:
+            self.calls += 1
+            if self.distribution == "fixed" or self.latency_ms <= 0:
+                latency = self.latency_ms
+            elif self.distribution == "uniform":
+                latency = self._random.uniform(self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms)
+            else:
+                # Mean latency_ms, standard deviation jitter_ms
+                sigma2 = math.log(1 + (self.jitter_ms / self.latency_ms) ** 2)
+                mu = math.log(self.latency_ms) - sigma2 / 2
+                latency = self._random.lognormvariate(mu, math.sqrt(sigma2))
+            fails = self._random.random() < self.error_rate
+            if fails:
+                self.errors += 1
+        return max(0.0, latency) / 1000, fails
+
+    def _reply(self, prompt: str, max_output_tokens: int) -> str:
+        # Roughly 4 characters per token
+        return self.responder(prompt)[:max_output_tokens * 4]
+
+    def generate(self, prompt, temperature, max_output_tokens, timeout=None):
+        latency, fails = self._draw()
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Local LLM call exceeded {timeout:.2f}s")
+        time.sleep(latency)
+        if fails:
+            raise LocalBackendError("Simulated LLM failure")
+        return self._reply(prompt, max_output_tokens)
+
+    async def generate_async(self, prompt, temperature, max_output_tokens):
+        latency, fails = self._draw()
+        await asyncio.sleep(latency)
+        if fails:
+            raise LocalBackendError("Simulated LLM failure")
+        return self._reply(prompt, max_output_tokens)
+
+    async def stream_async(self, prompt, temperature, max_output_tokens):
+        latency, fails = self._draw()
+        await asyncio.sleep(latency)
+        if fails:
+            raise LocalBackendError("Simulated LLM failure")
+        reply = self._reply(prompt, max_output_tokens)
+        for start in range(0, len(reply), self.stream_chunk_chars):
+            if start:
+                await asyncio.sleep(self.chunk_delay_ms / 1000)
+            yield reply[start:start + self.stream_chunk_chars]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": self.calls, "errors": self.errors}
+
+def create_backend(name: str = LLM_BACKEND, **kwargs) -> LLMBackend:
+    """Instantiate the backend called name ('gemini' or 'local')."""
+    if name == "gemini":
+        return GeminiBackend(**kwargs)
+    if name == "local":
+        return LocalBackend(**kwargs)
+    raise ValueError(f"Unknown LLM backend: {name}")
@@ -0,0 +1,203 @@
+"""
+Per-call-site LLM telemetry.
+
+GeminiClient reports every logical call (chat, command responses, error
+explanations, unknown commands, summaries, acknowledgement refills...)
+with its latency, the number of backend attempts, prompt and response
+sizes, how the response cache was involved and, if no answer came back,
+why the caller fell back locally. Counters are kept per (call site,
+source), the source being the request_source the command scheduler sets
+for every job (voice, phone, api...), so the stats show which caller is
+driving latency and quota.
+
+Cache status is one of
+    hit     served from the response cache
+    miss    looked up, not found, called the LLM
+    shared  joined an identical call already in flight
+    off     the call site doesn't use the cache
+
+The current numbers are served at /stats/llm; a background thread also
+appends a snapshot to LLM_TELEMETRY_PATH (one JSON object per line)
+every LLM_TELEMETRY_INTERVAL seconds while there is new data.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+from jarvis.config.settings import LLM_TELEMETRY_INTERVAL, LLM_TELEMETRY_PATH
+from jarvis.api.rate_limiter import request_source
+from jarvis.utils.metrics import LatencyHistogram
+
+CACHE_STATUSES = ("hit", "miss", "shared", "off")
+
+# Snapshot files are rotated (one backup kept) past this size
+MAX_SNAPSHOT_BYTES = 10 * 1024 * 1024
+
+class _CallSiteStats:
+    """Counters for one (call site, source)."""
+
+    __slots__ = (
+        "latency", "calls", "attempts", "retries", "prompt_chars", "max_prompt_chars",
+        "response_chars", "max_response_chars", "cache", "fallbacks"
+    )
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.prompt_chars = 0
+        self.max_prompt_chars = 0
+        self.response_chars = 0
+        self.max_response_chars = 0
+        self.cache = dict.fromkeys(CACHE_STATUSES, 0)
+        self.fallbacks: Dict[str, int] = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "latency_ms": self.latency.snapshot(),
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "prompt_chars": {
+                "mean": round(self.prompt_chars / self.calls, 1) if self.calls else 0.0,
+                "max": self.max_prompt_chars
+            },
+            "response_chars": {
+                "mean": round(self.response_chars / self.calls, 1) if self.calls else 0.0,
+                "max": self.max_response_chars
+            },
+            "cache": dict(self.cache),
+            "fallbacks": sum(self.fallbacks.values()),
+            "fallback_reasons": dict(self.fallbacks)
+        }
+
+class LLMTelemetry:
+    """Latency, retries, sizes, cache status and fallbacks per call site and source."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = LLM_TELEMETRY_PATH,
+        interval: float = LLM_TELEMETRY_INTERVAL
+    ):
+        self.path = Path(path) if path else None
+        self.interval = interval
+        self._stats: Dict[Tuple[str, str], _CallSiteStats] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._written_calls = 0
+        self.calls = 0
+        self.snapshots = 0
+
+    def record(
+        self,
+        call_site: str,
+        latency_ms: float = 0.0,
+        prompt_chars: int = 0,
+        response_chars: int = 0,
+        attempts: int = 0,
+        cache: str = "off",
+        fallback: Optional[str] = None
+    ):
+        """
+        Record one finished call.
+
+        Args:
+            call_site: Which kind of call it was (chat, explain_error...)
+            latency_ms: Time until the caller had its answer (or gave up)
+            prompt_chars: Size of the full prompt sent
+            response_chars: Size of the response (0 if there was none)
+            attempts: Backend requests made (0 for cache hits and shared calls)
+            cache: Cache status, one of CACHE_STATUSES
+            fallback: Why there was no answer (offline, circuit_open,
+                rate_limited, failed...), None if there was one
+        """
+        key = (call_site, request_source.get())
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _CallSiteStats()
+            stats.calls += 1
+            stats.attempts += attempts
+            stats.retries += max(0, attempts - 1)
+            stats.prompt_chars += prompt_chars
+            stats.max_prompt_chars = max(stats.max_prompt_chars, prompt_chars)
+            stats.response_chars += response_chars
+            stats.max_response_chars = max(stats.max_response_chars, response_chars)
+            stats.cache[cache] = stats.cache.get(cache, 0) + 1
+            if fallback:
+                stats.fallbacks[fallback] = stats.fallbacks.get(fallback, 0) + 1
+            self.calls += 1
+            start_writer = self._writer is None and self.path is not None and self.interval > 0
+            if start_writer:
+                self._writer = threading.Thread(target=self._write_loop, name="llm-telemetry", daemon=True)
+        stats.latency.observe(latency_ms)
+        if start_writer:
+            self._writer.start()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All counters, by call site and then by source."""
+        with self._lock:
+            items = sorted(self._stats.items())
+            calls = self.calls
+        call_sites: Dict[str, Dict[str, Any]] = {}
+        for (call_site, source), stats in items:
+            call_sites.setdefault(call_site, {})[source] = stats.snapshot()
+        return {"calls": calls, "call_sites": call_sites}
+
+    def write_snapshot(self) -> bool:
+        """Append the current snapshot to the snapshot file; False if there was nothing new."""
+        if self.path is None:
+            return False
+        with self._lock:
+            if self.calls == self._written_calls:
+                return False
+            self._written_calls = self.calls
+        line = json.dumps({"time": time.time(), **self.snapshot()}, ensure_ascii=False)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists() and self.path.stat().st_size > MAX_SNAPSHOT_BYTES:
+                self.path.replace(self.path.with_suffix(self.path.suffix + ".1"))
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"Could not write LLM telemetry snapshot to {self.path}: {e}")
+            return False
+        self.snapshots += 1
+        return True
+
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            self.write_snapshot()
+
+    def stop(self):
+        """Stop the snapshot thread and write a final snapshot."""
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join(timeout=1)
+            self.write_snapshot()
+
+    def reset(self):
+        """Forget all counters."""
+        with self._lock:
+            self._stats.clear()
+            self.calls = 0
+            self._written_calls = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """The snapshot plus where snapshots go."""
+        return {
+            **self.snapshot(),
+            "snapshot_path": str(self.path) if self.path else None,
+            "snapshot_interval": self.interval,
+            "snapshots": self.snapshots
+        }
+
+# Global instance
+llm_telemetry = LLMTelemetry()
@@ -0,0 +1,288 @@
+"""
+Client-side rate limiting for LLM calls.
+
+Every request attempt needs a permit: a token from a bucket refilled at
+LLM_RATE_LIMIT_RPM per minute (holding up to LLM_RATE_LIMIT_BURST), and
+one of LLM_MAX_CONCURRENT slots while the call is outstanding. Callers
+that can't get one right away queue, ordered by the priority of their
+call site
+
+    chat  >  command responses, error explanations  >  background work
+
+and, within a priority, round-robin across (call site, source) flows,
+so a burst of acknowledgements from the phone cannot starve a voice
+chat and vice versa.
+
+Low-priority call sites have a local fallback, so they don't queue for
+long: a caller whose wait is expected to exceed LLM_LOW_PRIORITY_MAX_WAIT
+is refused straight away, and one still queued at that point gives up.
+Refused callers use their fallback instead of calling the LLM.
+
+The source (voice, phone, api...) is taken from the request_source
+context variable, which the command scheduler sets for every job.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from jarvis.config.settings import (
+    LLM_RATE_LIMIT_RPM, LLM_RATE_LIMIT_BURST, LLM_MAX_CONCURRENT, LLM_LOW_PRIORITY_MAX_WAIT
+)
+from jarvis.utils.metrics import LatencyHistogram
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_LOW = 1
+PRIORITY_BACKGROUND = 2
+
+CALL_SITE_PRIORITIES = {
+    "chat": PRIORITY_INTERACTIVE,
+    "unknown_command": PRIORITY_INTERACTIVE,
+    "command_response": PRIORITY_LOW,
+    "explain_error": PRIORITY_LOW,
+    "summary": PRIORITY_BACKGROUND,
+    "ack_refill": PRIORITY_BACKGROUND,
+}
+
+# Who the current LLM call is made for; set per job by the command scheduler
+request_source: ContextVar[str] = ContextVar("llm_request_source", default="local")
+
+class _Waiter:
+    """A queued permit request, woken through an Event (threads) or a Future (asyncio)."""
+
+    __slots__ = ("flow", "priority", "granted", "event", "future", "loop")
+
+    def __init__(self, flow: Tuple[str, str], priority: int, event=None, future=None, loop=None):
+        self.flow = flow
+        self.priority = priority
+        self.granted = False
+        self.event = event
+        self.future = future
+        self.loop = loop
+
+    def grant(self):
+        self.granted = True
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+class RateLimiter:
+    """Token bucket plus concurrency cap with a priority/fair wait queue."""
+
+    def __init__(
+        self,
+        rpm: float = LLM_RATE_LIMIT_RPM,
+        burst: int = LLM_RATE_LIMIT_BURST,
+        max_concurrent: int = LLM_MAX_CONCURRENT,
+        low_priority_wait: float = LLM_LOW_PRIORITY_MAX_WAIT,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rpm / 60 if rpm > 0 else 0.0  # tokens per second; 0 = no request limit
+        self.capacity = max(1, burst)
+        self.max_concurrent = max(1, max_concurrent)
+        self.low_priority_wait = low_priority_wait
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(self.capacity)
+        self._refilled_at = clock()
+        self._active = 0
+        # priority -> flow -> waiters; OrderedDict order is the round-robin turn
+        self._queues: Dict[int, "OrderedDict[Tuple[str, str], Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in (PRIORITY_INTERACTIVE, PRIORITY_LOW, PRIORITY_BACKGROUND)
+        }
+        self._wait: Dict[str, LatencyHistogram] = {}
+        self._granted: Dict[str, int] = {}
+        self._shed: Dict[str, int] = {}
+        self._by_source: Dict[str, int] = {}
+        self.max_active = 0
+
+    # Bucket and queue (caller holds the lock)
+
+    def _refill(self):
+        now = self._clock()
+        if self.rate:
+            self._tokens = min(self.capacity, self._tokens + (now - self._refilled_at) * self.rate)
+        else:
+            self._tokens = float(self.capacity)
+        self._refilled_at = now
+
+    def _queued(self, up_to_priority: int = PRIORITY_BACKGROUND) -> int:
+        return sum(
+            len(waiters)
+            for priority, flows in self._queues.items() if priority <= up_to_priority
+            for waiters in flows.values()
+        )
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        for flows in self._queues.values():
+            if flows:
+                flow, waiters = next(iter(flows.items()))
+                waiter = waiters.popleft()
+                del flows[flow]
+                if waiters:
+                    flows[flow] = waiters  # back of the round-robin turn
+                return waiter
+        return None
+
+    def _dispatch(self):
+        self._refill()
+        while self._active < self.max_concurrent and self._tokens >= 1:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            self._tokens -= 1
+            self._active += 1
+            self.max_active = max(self.max_active, self._active)
+            waiter.grant()
+
+    def _retry_in(self, remaining: float) -> float:
+        """How long a waiter sleeps before re-checking the bucket itself."""
+        if self._tokens >= 1 or not self.rate:
+            return remaining  # only a release can help; it wakes the waiter
+        return min(remaining, (1 - self._tokens) / self.rate)
+
+    def _enqueue(self, call_site: str, max_wait: Optional[float], **wake) -> Tuple[Optional[_Waiter], float]:
+        """Queue a request; returns (waiter, wait budget), or (None, 0) if it is refused."""
+        priority = CALL_SITE_PRIORITIES.get(call_site, PRIORITY_INTERACTIVE)
+        source = request_source.get()
+        budget = float("inf") if max_wait is None else max_wait
+        if priority == PRIORITY_LOW:
+            budget = min(budget, self.low_priority_wait)
+
+        with self._lock:
+            self._refill()
+            if priority == PRIORITY_LOW and self.rate:
+                # Tokens needed by everyone ahead of us, plus our own
+                expected = (self._queued(priority) + 1 - self._tokens) / self.rate
+                if expected > budget:
+                    self._shed[call_site] = self._shed.get(call_site, 0) + 1
+                    return None, 0.0
+            waiter = _Waiter((call_site, source), priority, **wake)
+            self._queues[priority].setdefault(waiter.flow, deque()).append(waiter)
+            self._dispatch()
+        return waiter, budget
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Take a waiter out of the queue; False if it was granted meanwhile."""
+        with self._lock:
+            if waiter.granted:
+                return False
+            flows = self._queues[waiter.priority]
+            waiters = flows.get(waiter.flow)
+            if waiters is not None:
+                waiters.remove(waiter)
+                if not waiters:
+                    del flows[waiter.flow]
+            call_site = waiter.flow[0]
+            self._shed[call_site] = self._shed.get(call_site, 0) + 1
+            return True
+
+    def _record_grant(self, waiter: _Waiter, waited: float):
+        call_site, source = waiter.flow
+        with self._lock:
+            self._granted[call_site] = self._granted.get(call_site, 0) + 1
+            self._by_source[source] = self._by_source.get(source, 0) + 1
+            histogram = self._wait.setdefault(call_site, LatencyHistogram())
+        histogram.observe(waited * 1000)
+
+    # Public API
+
+    def acquire(self, call_site: str = "chat", max_wait: Optional[float] = None) -> bool:
+        """
+        Wait for a permit (blocking).
+
+        Args:
+            call_site: Which kind of call this is (see CALL_SITE_PRIORITIES)
+            max_wait: Longest acceptable wait in seconds (low-priority call
+                sites are further capped at low_priority_wait)
+
+        Returns:
+            True with a permit held (call release() when the call is
+            done), False if the caller should use its fallback instead
+        """
+        started = self._clock()
+        waiter, budget = self._enqueue(call_site, max_wait, event=threading.Event())
+        if waiter is None:
+            return False
+
+        while not waiter.granted:
+            remaining = budget - (self._clock() - started)
+            if remaining <= 0 and self._abandon(waiter):
+                return False
+            with self._lock:
+                timeout = self._retry_in(remaining)
+            waiter.event.wait(max(0.0, min(timeout, 3600)))
+            with self._lock:
+                self._dispatch()
+
+        self._record_grant(waiter, self._clock() - started)
+        return True
+
+    async def acquire_async(self, call_site: str = "chat", max_wait: Optional[float] = None) -> bool:
+        """Awaitable version of acquire()."""
+        loop = asyncio.get_running_loop()
+        started = self._clock()
+        waiter, budget = self._enqueue(call_site, max_wait, future=loop.create_future(), loop=loop)
+        if waiter is None:
+            return False
+
+        try:
+            while not waiter.granted:
+                remaining = budget - (self._clock() - started)
+                if remaining <= 0 and self._abandon(waiter):
+                    return False
+                with self._lock:
+                    timeout = self._retry_in(remaining)
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), max(0.0, min(timeout, 3600)))
+                except asyncio.TimeoutError:
+                    with self._lock:
+                        self._dispatch()
+        except asyncio.CancelledError:
+            if not self._abandon(waiter):
+                self.release()  # granted, but nobody will use it
+            raise
+
+        self._record_grant(waiter, self._clock() - started)
+        return True
+
+    def release(self):
+        """Return a permit's concurrency slot."""
+        with self._lock:
+            self._active -= 1
+            self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """Bucket level, outstanding calls, queue depth and per call site counters."""
+        with self._lock:
+            self._refill()
+            call_sites = sorted(set(self._granted) | set(self._shed))
+            stats = {
+                "rpm": round(self.rate * 60, 3),
+                "burst": self.capacity,
+                "tokens": round(self._tokens, 3),
+                "active": self._active,
+                "max_concurrent": self.max_concurrent,
+                "max_active": self.max_active,
+                "queued": self._queued(),
+                "by_source": dict(self._by_source),
+                "call_sites": {
+                    call_site: {
+                        "granted": self._granted.get(call_site, 0),
+                        "shed": self._shed.get(call_site, 0)
+                    }
+                    for call_site in call_sites
+                }
+            }
+            histograms = dict(self._wait)
+        for call_site, histogram in histograms.items():
+            stats["call_sites"][call_site]["wait_ms"] = histogram.snapshot()
+        return stats
@@ -0,0 +1,134 @@
+"""
+Resilience helpers for remote API calls.
+
+- CircuitBreaker: after LLM_BREAKER_FAILURES consecutive failures the
+  circuit opens and calls are refused immediately (callers use their
+  local fallback). After LLM_BREAKER_RESET seconds one probe call is let
+  through (half-open); its outcome closes or re-opens the circuit.
+- RetryPolicy: exponential backoff with full jitter, bounded by an
+  overall per-call deadline no matter how many attempts are left.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from jarvis.config.settings import (
+    LLM_MAX_ATTEMPTS, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX, LLM_BLOCKING_BACKOFF_MAX, LLM_CALL_DEADLINE,
+    LLM_BREAKER_FAILURES, LLM_BREAKER_RESET
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open circuit breaker."""
+
+    def __init__(
+        self,
+        failure_threshold: int = LLM_BREAKER_FAILURES,
+        reset_timeout: float = LLM_BREAKER_RESET,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = None
+        self.opens = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """True if a call may go out now (closed, or the half-open probe)."""
+        with self._lock:
+            now = self._clock()
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._probe_started = None
+            if self._state == HALF_OPEN:
+                # One probe at a time; a probe that never reported back
+                # (e.g. cancelled) is replaced after another reset_timeout
+                if self._probe_started is None or now - self._probe_started >= self.reset_timeout:
+                    self._probe_started = now
+                    return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.opens += 1
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probe_started = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "opens": self.opens,
+                "rejected": self.rejected
+            }
+
+class Deadline:
+    """Time budget for one logical call, across all of its attempts."""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires_at - self._clock())
+
+class RetryPolicy:
+    """Attempt count, exponential backoff with full jitter, and call deadline."""
+
+    def __init__(
+        self,
+        max_attempts: int = LLM_MAX_ATTEMPTS,
+        base_delay: float = LLM_BACKOFF_BASE,
+        max_delay: float = LLM_BACKOFF_MAX,
+        deadline: float = LLM_CALL_DEADLINE,
+        blocking_max_delay: float = LLM_BLOCKING_BACKOFF_MAX
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.blocking_max_delay = blocking_max_delay
+
+    def backoff(self, attempt: int, blocking: bool = False) -> float:
+        """
+        Delay before retry number attempt + 1 (attempt counts from 0).
+
+        blocking: the caller sleeps in its own thread, so the delay is
+        capped at blocking_max_delay
+        """
+        cap = min(self.max_delay, self.blocking_max_delay) if blocking else self.max_delay
+        return random.uniform(0, min(cap, self.base_delay * (2 ** attempt)))
+
+    def start(self) -> Deadline:
+        return Deadline(self.deadline)
@@ -0,0 +1,189 @@
+"""
+Persistent LLM response cache.
+
+Responses are keyed on a hash of everything that determines them (model,
+full prompt including the system prompt, generation parameters) and kept
+in two tiers: a small in-memory LRU in front of an SQLite file under
+CACHE_DIR that survives restarts. Both tiers expire entries after
+LLM_CACHE_TTL seconds; the disk tier evicts least recently used rows
+beyond LLM_CACHE_MAX_ENTRIES.
+
+Caching is opt-in per call site (GeminiClient.chat(..., cache=True)), so
+only prompts whose answer does not depend on the moment are cached.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from loguru import logger
+
+from jarvis.config.settings import (
+    LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_TTL,
+    LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MEMORY_ENTRIES
+)
+from jarvis.utils.cache import LRUCache
+
+def cache_key(**params: Any) -> str:
+    """Stable hash of the generation parameters (prompt, model, temperature, ...)."""
+    encoded = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """Two-tier (memory + SQLite) LRU/TTL cache of LLM responses."""
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = LLM_CACHE_PATH,
+        ttl: float = LLM_CACHE_TTL,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        enabled: bool = LLM_CACHE_ENABLED,
+        clock: Callable[[], float] = time.time
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._clock = clock
+        # Memory entries carry their wall-clock creation time, so a promoted
+        # disk entry keeps its original expiry
+        self._memory = LRUCache(max_size=memory_entries)
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expirations = 0
+        self.evictions = 0
+
+        if enabled and path is not None:
+            try:
+                self._db = sqlite3.connect(str(path), check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                    "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS ix_last_used ON responses (last_used)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache on disk unavailable, memory only: {e}")
+                self._db = None
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl > 0 and now - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for key, or None."""
+        if not self.enabled:
+            return None
+
+        now = self._clock()
+        entry = self._memory.get(key)
+        with self._lock:
+            if entry is not None:
+                response, created_at = entry
+                if not self._expired(created_at, now):
+                    self.memory_hits += 1
+                    return response
+                self._memory.pop(key)
+
+            row = None
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+            if self._expired(created_at, now):
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.disk_hits += 1
+
+        self._memory.put(key, (response, created_at))
+        return response
+
+    def put(self, key: str, response: str):
+        """Store a response in both tiers, evicting the least recently used rows."""
+        if not self.enabled:
+            return
+
+        now = self._clock()
+        self._memory.put(key, (response, now))
+        with self._lock:
+            self.stores += 1
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            overflow = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._db.commit()
+
+    def clear(self):
+        """Drop every cached response (counters are kept)."""
+        self._memory.clear()
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._db is None:
+                return len(self._memory)
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per tier and current sizes."""
+        size = len(self)
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "persistent": self._db is not None,
+                "size": size,
+                "memory_size": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+            }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+# Global instance
+response_cache = ResponseCache()
@@ -0,0 +1,153 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key (e.g. an identical LLM prompt
+with identical generation parameters, as when the phone app retries
+/ask after a client-side timeout) share one in-flight call instead of
+each making their own. Every caller gets the shared call's result, or
+its exception. The call is forgotten as soon as it finishes, so this is
+not a cache: later callers start a fresh call.
+
+Threads (do) and asyncio tasks (do_async) coalesce separately, each
+among themselves. An async caller that is cancelled only stops waiting;
+the shared call is cancelled once no caller is waiting for it.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from jarvis.config.settings import LLM_SINGLE_FLIGHT
+
+class _Call:
+    """An in-flight call made by a thread."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class _Flight:
+    """An in-flight call made by an asyncio task."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers with the same key."""
+
+    def __init__(self, enabled: bool = LLM_SINGLE_FLIGHT):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._flights: Dict[Tuple[int, Hashable], _Flight] = {}
+        self.requests = 0
+        self.executions = 0
+        self.shared = 0
+        self.errors = 0
+        self.cancelled = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Call fn(), or wait for the identical call another thread is making.
+
+        Args:
+            key: Identity of the call; equal keys share one execution
+            fn: The call to make
+
+        Returns:
+            fn()'s result (an exception from fn is raised in every caller)
+        """
+        if not self.enabled:
+            return fn()
+
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await factory(), or join the identical call already in flight.
+
+        Args:
+            key: Identity of the call; equal keys share one execution
+            factory: Returns the awaitable to run (only called by the first caller)
+
+        Returns:
+            The shared call's result (its exception is raised in every caller)
+        """
+        if not self.enabled:
+            return await factory()
+
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            self.requests += 1
+            flight = self._flights.get(flight_key)
+            if flight is None or flight.task.done():
+                flight = _Flight(loop.create_task(factory()))
+                self._flights[flight_key] = flight
+                flight.task.add_done_callback(lambda task: self._finish(flight_key, flight))
+                self.executions += 1
+            else:
+                self.shared += 1
+            flight.waiters += 1
+
+        try:
+            # Shield: one caller giving up must not cancel the others' call
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            with self._lock:
+                flight.waiters -= 1
+                abandon = flight.waiters == 0 and not flight.task.done()
+                if abandon:
+                    self.cancelled += 1
+            if abandon:
+                flight.task.cancel()
+            raise
+
+    def _finish(self, flight_key: Tuple[int, Hashable], flight: _Flight):
+        with self._lock:
+            if self._flights.get(flight_key) is flight:
+                del self._flights[flight_key]
+            if not flight.task.cancelled() and flight.task.exception() is not None:
+                self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests vs. executions; `shared` is the number of calls saved."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "requests": self.requests,
+                "executions": self.executions,
+                "shared": self.shared,
+                "in_flight": len(self._calls) + len(self._flights),
+                "errors": self.errors,
+                "cancelled": self.cancelled
+            }
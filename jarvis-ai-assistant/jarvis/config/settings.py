@@ -42,6 +42,126 @@ ENABLE_REMOTE_TYPING = os.getenv("ENABLE_REMOTE_TYPING", "true").lower() == "tru
 ENABLE_FILE_OPERATIONS = os.getenv("ENABLE_FILE_OPERATIONS", "true").lower() == "true"
 ENABLE_SYSTEM_SHUTDOWN = os.getenv("ENABLE_SYSTEM_SHUTDOWN", "false").lower() == "true"
 
+# Command parser cache (LRU keyed on normalized text; TTL in seconds, 0 = never expire)
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", 512))
+PARSE_CACHE_TTL = float(os.getenv("PARSE_CACHE_TTL", 0))
+PARSE_CACHE_MAX_TEXT_LENGTH = int(os.getenv("PARSE_CACHE_MAX_TEXT_LENGTH", 200))
+# Longer text is only checked for typing payloads, otherwise treated as chat
+PARSE_MAX_COMMAND_LENGTH = int(os.getenv("PARSE_MAX_COMMAND_LENGTH", 500))
+
+# Local intent classifier: reroutes confident near-miss "chat" utterances
+# to command handlers. Train with: python -m jarvis.tools.train_intent_classifier
+INTENT_CLASSIFIER_ENABLED = os.getenv("INTENT_CLASSIFIER_ENABLED", "true").lower() == "true"
+INTENT_CLASSIFIER_THRESHOLD = float(os.getenv("INTENT_CLASSIFIER_THRESHOLD", 0.9))
+INTENT_CLASSIFIER_MODEL = CACHE_DIR / "intent_classifier.npz"
+
+# Async command pipeline: threads for blocking automation and database calls
+ASYNC_EXECUTOR_WORKERS = int(os.getenv("ASYNC_EXECUTOR_WORKERS", 16))
+
+# Command log write-behind: rows are batched in memory and inserted by a
+# background thread. Overflow policy when the buffer is full:
+# "block", "drop_oldest" or "sync" (write inline)
+COMMAND_LOG_WRITE_BEHIND = os.getenv("COMMAND_LOG_WRITE_BEHIND", "true").lower() == "true"
+COMMAND_LOG_BATCH_SIZE = int(os.getenv("COMMAND_LOG_BATCH_SIZE", 100))
+COMMAND_LOG_FLUSH_INTERVAL = float(os.getenv("COMMAND_LOG_FLUSH_INTERVAL", 0.5))
+COMMAND_LOG_BUFFER_SIZE = int(os.getenv("COMMAND_LOG_BUFFER_SIZE", 10000))
+COMMAND_LOG_OVERFLOW = os.getenv("COMMAND_LOG_OVERFLOW", "sync").lower()
+
+# Conversation history: one conversation per client (X-Jarvis-Session
+# header or device id; anonymous clients and the voice loop share
+# "default"), served from a per-session in-memory ring buffer
+# (rehydrated from the database on first use), persisted write-behind
+# with the command log's batch size, capacity and overflow policy
+CONVERSATION_BUFFER_SIZE = int(os.getenv("CONVERSATION_BUFFER_SIZE", 20))  # messages kept per session
+CONVERSATION_MAX_SESSIONS = int(os.getenv("CONVERSATION_MAX_SESSIONS", 1000))  # sessions held in memory
+CONVERSATION_IDLE_TTL = float(os.getenv("CONVERSATION_IDLE_TTL", 1800))  # seconds; idle sessions leave memory
+CONVERSATION_WRITE_BEHIND = os.getenv("CONVERSATION_WRITE_BEHIND", "true").lower() == "true"
+CONVERSATION_FLUSH_INTERVAL = float(os.getenv("CONVERSATION_FLUSH_INTERVAL", 1.0))
+
+# Reply prompts: at most PROMPT_BUDGET_TOKENS (estimated at 4 characters
+# per token), the last PROMPT_RECENT_MESSAGES messages verbatim and a
+# rolling summary of older turns, refreshed in the background once
+# PROMPT_SUMMARY_BATCH messages have aged out of the verbatim window
+PROMPT_BUDGET_TOKENS = int(os.getenv("PROMPT_BUDGET_TOKENS", 1200))
+PROMPT_RECENT_MESSAGES = int(os.getenv("PROMPT_RECENT_MESSAGES", 6))
+PROMPT_SUMMARY_BATCH = int(os.getenv("PROMPT_SUMMARY_BATCH", 4))
+PROMPT_SUMMARY_MAX_TOKENS = int(os.getenv("PROMPT_SUMMARY_MAX_TOKENS", 150))
+
+# Acknowledgement engine: answer successful commands from pre-generated
+# phrasings (refilled from Gemini while idle) instead of an LLM call
+ACK_ENGINE_ENABLED = os.getenv("ACK_ENGINE_ENABLED", "true").lower() == "true"
+ACK_POOL_SIZE = int(os.getenv("ACK_POOL_SIZE", 20))
+ACK_REFILL_IDLE_SECONDS = float(os.getenv("ACK_REFILL_IDLE_SECONDS", 30))
+ACK_PHRASES_PATH = CACHE_DIR / "ack_phrases.json"
+
+# Start LLM-phrased replies (app launches, file operations) concurrently
+# with the command's action. Only takes effect with ACK_ENGINE_ENABLED=false:
+# with the acknowledgement engine on those replies make no LLM call
+SPECULATIVE_RESPONSES = os.getenv("SPECULATIVE_RESPONSES", "false").lower() == "true"
+
+# Pending confirmations for destructive commands, per source/session
+CONFIRMATION_TTL = float(os.getenv("CONFIRMATION_TTL", 60))
+CONFIRMATION_MAX_PENDING = int(os.getenv("CONFIRMATION_MAX_PENDING", 256))
+
+# Repeated volume/mute commands within this window (from any source) are
+# merged into one action; 0 disables coalescing
+COALESCE_WINDOW_MS = float(os.getenv("COALESCE_WINDOW_MS", 150))
+VOLUME_STEP = int(os.getenv("VOLUME_STEP", 10))  # percent per "volume up"
+
+# Command scheduler
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", 4))
+SCHEDULER_RESERVED_SLOTS = int(os.getenv("SCHEDULER_RESERVED_SLOTS", 1))  # kept for device control
+
+# LLM response cache (memory LRU in front of an SQLite file), used by
+# call sites that opt in with cache=True
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = CACHE_DIR / "llm_responses.sqlite3"
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 86400))  # seconds; 0 = never expire
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", 256))
+
+# Concurrent identical LLM requests (same prompt and parameters) share
+# one in-flight call
+LLM_SINGLE_FLIGHT = os.getenv("LLM_SINGLE_FLIGHT", "true").lower() == "true"
+
+# LLM call resilience: retries with exponential backoff + jitter inside an
+# overall per-call deadline, and a circuit breaker that switches to local
+# fallback replies after repeated failures. Blocking callers (Flask
+# threads, the summarizer) sleep at most LLM_BLOCKING_BACKOFF_MAX between
+# attempts so a retry doesn't tie their thread up for seconds
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", 3))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 0.5))  # seconds
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", 4.0))
+LLM_BLOCKING_BACKOFF_MAX = float(os.getenv("LLM_BLOCKING_BACKOFF_MAX", 0.25))
+LLM_CALL_DEADLINE = float(os.getenv("LLM_CALL_DEADLINE", 10.0))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", 3))
+LLM_BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", 30.0))  # seconds until a probe
+
+# LLM rate limiting: requests per minute (token bucket, 0 = unlimited),
+# burst size, outstanding calls, and how long low-priority call sites
+# (command responses, error explanations) wait before falling back locally
+LLM_RATE_LIMIT_RPM = float(os.getenv("LLM_RATE_LIMIT_RPM", 60))
+LLM_RATE_LIMIT_BURST = int(os.getenv("LLM_RATE_LIMIT_BURST", 10))
+LLM_MAX_CONCURRENT = int(os.getenv("LLM_MAX_CONCURRENT", 4))
+LLM_LOW_PRIORITY_MAX_WAIT = float(os.getenv("LLM_LOW_PRIORITY_MAX_WAIT", 1.0))  # seconds
+
+# LLM call telemetry per call site and source, served at /stats/llm and
+# appended to LLM_TELEMETRY_PATH every LLM_TELEMETRY_INTERVAL seconds
+# (0 = no snapshot file)
+LLM_TELEMETRY_INTERVAL = float(os.getenv("LLM_TELEMETRY_INTERVAL", 300))
+LLM_TELEMETRY_PATH = LOGS_DIR / "llm_telemetry.jsonl"
+
+# LLM backend: "gemini", or "local" for a deterministic offline stand-in
+# (used for tests and load tests at configurable latencies)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+LOCAL_LLM_LATENCY_MS = float(os.getenv("LOCAL_LLM_LATENCY_MS", 400))
+LOCAL_LLM_LATENCY_JITTER_MS = float(os.getenv("LOCAL_LLM_LATENCY_JITTER_MS", 150))
+LOCAL_LLM_LATENCY_DISTRIBUTION = os.getenv("LOCAL_LLM_LATENCY_DISTRIBUTION", "lognormal").lower()
+LOCAL_LLM_ERROR_RATE = float(os.getenv("LOCAL_LLM_ERROR_RATE", 0.0))
+LOCAL_LLM_STREAM_CHUNK_CHARS = int(os.getenv("LOCAL_LLM_STREAM_CHUNK_CHARS", 12))
+LOCAL_LLM_CHUNK_DELAY_MS = float(os.getenv("LOCAL_LLM_CHUNK_DELAY_MS", 30))
+LOCAL_LLM_SEED = int(os.getenv("LOCAL_LLM_SEED")) if os.getenv("LOCAL_LLM_SEED") else None
+
 # Default paths for operations
 DEFAULT_SCREENSHOT_FOLDER = DATA_DIR / "screenshots"
 DEFAULT_SCREENSHOT_FOLDER.mkdir(exist_ok=True)
@@ -85,7 +205,7 @@ APP_MAPPINGS = {
 }
 
 # Buddy personality system prompt
-BUDDY_SYSTEM_PROMPT = """You are {jarvis}, a friendly AI assistant with a buddy-like personality. 
+BUDDY_SYSTEM_PROMPT = """You are {name}, a friendly AI assistant with a buddy-like personality. 
 You're helpful, slightly informal, and supportive - like a tech-savvy friend who's always ready to help.
 
 Guidelines:
@@ -0,0 +1,221 @@
+"""
+Acknowledgement engine - instant "done!" messages without an LLM call.
+
+Successful (and failed) commands are acknowledged from a pool of
+pre-generated phrasings per action type. A background thread tops the
+pools up from Gemini only while JARVIS is idle, and the pools are saved
+to CACHE_DIR so they survive restarts. Until a pool has been filled,
+built-in phrasings are used, so command latency never waits on the LLM.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from jarvis.api.gemini_client import gemini_client
+from jarvis.config.settings import (
+    ACK_ENGINE_ENABLED, ACK_POOL_SIZE, ACK_REFILL_IDLE_SECONDS, ACK_PHRASES_PATH
+)
+
+# What each action type means, for the phrase-generation prompt
+ACTION_DESCRIPTIONS = {
+    "app_launch": "opening the application {target}",
+    "file_copy": "copying files",
+    "file_move": "moving files",
+    "file_delete": "deleting {target}",
+    "plan": "carrying out several requested tasks at once",
+}
+
+# Used until the pools have been filled from the LLM
+DEFAULT_PHRASES = {
+    True: [
+        "Done! Got it handled for you, buddy. 🙂",
+        "All set! Anything else you need? 😊",
+        "Finished! That was easy. 🔥",
+        "Done and done! Let me know what's next.",
+        "Success! Your wish is my command. ✨",
+    ],
+    False: [
+        "Hmm, I ran into a snag there. 😅 Want to try again?",
+        "Oops, that didn't work. Could you double-check the details?",
+        "I couldn't quite pull that off. Maybe a different approach?",
+        "That one gave me trouble. Want to try rephrasing it?",
+        "Hmm, no luck that time. Let's give it another shot! 💪",
+    ],
+}
+
+_LIST_MARKER = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s*')
+
+def _pool_key(action_type: str, success: bool) -> str:
+    return f"{action_type}:{'ok' if success else 'fail'}"
+
+class AckEngine:
+    """
+    Per-action pools of acknowledgement phrasings.
+
+    Phrases may contain a {target} placeholder (the app or file acted
+    on). Each acknowledgement takes a phrase out of its pool; used
+    phrases are recycled when a pool runs dry before the next refill.
+    """
+
+    def __init__(
+        self,
+        client=gemini_client,
+        path: Path = ACK_PHRASES_PATH,
+        pool_size: int = ACK_POOL_SIZE,
+        idle_seconds: float = ACK_REFILL_IDLE_SECONDS,
+        enabled: bool = ACK_ENGINE_ENABLED
+    ):
+        self.client = client
+        self.path = Path(path)
+        self.pool_size = pool_size
+        self.idle_seconds = idle_seconds
+        self.enabled = enabled
+
+        self._pools: Dict[str, List[str]] = {}
+        self._used: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._last_activity = 0.0
+        self._wake = threading.Event()
+        self._refiller: Optional[threading.Thread] = None
+
+        self.served = 0
+        self.served_from_defaults = 0
+        self.refills = 0
+        self.failed_refills = 0
+
+        self._load()
+
+    def acknowledge(self, action_type: str, success: bool, target: str = "") -> str:
+        """
+        An instant acknowledgement for a finished command.
+
+        Args:
+            action_type: Result action, e.g. 'app_launch', 'file_copy', 'plan'
+            success: Whether the command succeeded
+            target: What was acted on, substituted for {target}
+
+        Returns:
+            Response string
+        """
+        key = _pool_key(action_type, success)
+        with self._lock:
+            self._last_activity = time.monotonic()
+            self.served += 1
+            pool = self._pools.setdefault(key, [])
+            used = self._used.setdefault(key, [])
+            if pool:
+                phrase = pool.pop(random.randrange(len(pool)))
+                used.append(phrase)
+                del used[:-self.pool_size]
+            elif used:
+                phrase = random.choice(used)
+            else:
+                phrase = random.choice(DEFAULT_PHRASES[success])
+                self.served_from_defaults += 1
+
+        self._ensure_refiller()
+        return phrase.replace("{target}", target or "that")
+
+    def _needs_refill(self) -> Optional[str]:
+        """A pool below half its target size, if any (caller holds the lock)."""
+        for key in list(self._pools):
+            if key.split(":")[0] in ACTION_DESCRIPTIONS and len(self._pools[key]) < self.pool_size // 2:
+                return key
+        return None
+
+    def _ensure_refiller(self):
+        if self._refiller is None and self.enabled and self.client.is_available():
+            self._refiller = threading.Thread(target=self._refill_loop, name="ack-refill", daemon=True)
+            self._refiller.start()
+
+    def _refill_loop(self):
+        while not self._wake.wait(self.idle_seconds):
+            with self._lock:
+                idle = time.monotonic() - self._last_activity >= self.idle_seconds
+                key = self._needs_refill() if idle else None
+            if key:
+                self.refill(key)
+
+    def refill(self, key: str) -> int:
+        """
+        Top one pool up from the LLM and persist the pools.
+
+        Returns:
+            Number of phrases added
+        """
+        action_type, outcome = key.split(":")
+        description = ACTION_DESCRIPTIONS[action_type]
+        status = "succeeded" if outcome == "ok" else "failed"
+        prompt = (
+            f"Write {self.pool_size} different one-sentence replies a friendly assistant "
+            f"could say right after {description} {status}. "
+            f"Where the thing acted on would be named, write the placeholder {{target}} instead. "
+            f"One reply per line, no numbering, no quotes."
+        )
+
+        phrases = self._parse_phrases(self.client.chat(prompt, temperature=0.9, call_site="ack_refill"))
+        # A single line back is the client's error/offline fallback, not a list
+        if len(phrases) < 3:
+            self.failed_refills += 1
+            logger.warning(f"Acknowledgement refill for {key} returned no usable phrases")
+            return 0
+
+        with self._lock:
+            pool = self._pools.setdefault(key, [])
+            added = [phrase for phrase in phrases if phrase not in pool][:self.pool_size - len(pool)]
+            pool.extend(added)
+            self.refills += 1
+        self.save()
+        logger.debug(f"Refilled acknowledgement pool {key} with {len(added)} phrases")
+        return len(added)
+
+    def _parse_phrases(self, text: str) -> List[str]:
+        phrases = []
+        for line in (text or "").splitlines():
+            line = _LIST_MARKER.sub("", line).strip().strip('"')
+            if 3 <= len(line) <= 150 and "{" not in line.replace("{target}", ""):
+                phrases.append(line)
+        return phrases
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._pools = {key: list(phrases) for key, phrases in data.get("pools", {}).items()}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable acknowledgement pools at {self.path}: {e}")
+
+    def save(self):
+        """Persist the pools (written atomically)."""
+        with self._lock:
+            data = {"pools": {key: list(pool) for key, pool in self._pools.items()}}
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def stop(self):
+        """Stop the background refill thread."""
+        self._wake.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool sizes and serve/refill counters."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "pools": {key: len(pool) for key, pool in sorted(self._pools.items())},
+                "served": self.served,
+                "served_from_defaults": self.served_from_defaults,
+                "refills": self.refills,
+                "failed_refills": self.failed_refills
+            }
+
+# Global instance
+ack_engine = AckEngine()
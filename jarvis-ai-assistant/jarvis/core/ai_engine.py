@@ -1,14 +1,21 @@
 """
 AI Engine with buddy personality.
 Wraps Gemini client and maintains conversation context.
+
+Conversations are per session (a phone, an API client, the voice loop);
+callers pass session_id, and calls without one use the "default"
+session. Per-session state lives in the conversation store and prompt
+builder, so one engine serves all sessions concurrently.
 """
 
-from typing import Optional, Dict, Any, List
+import asyncio
+import time
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
 from loguru import logger
 
 from jarvis.api.gemini_client import gemini_client, GeminiClient
-from jarvis.database.db_manager import db_manager
-from jarvis.config.settings import JARVIS_NAME, BUDDY_SYSTEM_PROMPT
+from jarvis.core.conversation_store import conversation_store, ConversationStore
+from jarvis.core.prompt_builder import prompt_builder, PromptBuilder
 
 class AIEngine:
     """
@@ -16,16 +23,25 @@ class AIEngine:
     Manages conversations and generates contextual responses.
     """
     
-    def __init__(self):
-        self.client = gemini_client
-        self.session_id = "default"
-        self.max_context = 10
+    def __init__(
+        self,
+        client: Optional[GeminiClient] = None,
+        conversations: Optional[ConversationStore] = None,
+        prompts: Optional[PromptBuilder] = None
+    ):
+        self.client = client or gemini_client
+        self.conversations = conversations or conversation_store
+        self.prompts = prompts or prompt_builder
+        self.session_id = "default"  # used when a call names no session
     
     def generate_reply(
         self, 
         user_message: str, 
         context: Optional[Dict[str, Any]] = None,
-        use_history: bool = True
+        use_history: bool = True,
+        cache: bool = False,
+        session_id: Optional[str] = None,
+        call_site: str = "chat"
     ) -> str:
         """
         Generate a friendly reply to user message.
@@ -34,40 +50,131 @@ class AIEngine:
             user_message: What the user said
             context: Optional context (command results, etc.)
             use_history: Whether to use conversation history
+            cache: Reuse a cached reply to the identical prompt
+            session_id: Conversation to use and extend (default: "default")
+            call_site: What the reply is for, in rate limiting and telemetry
             
         Returns:
             Friendly response string
         """
-        # Build enriched prompt with context
-        prompt = user_message
-        
-        if context:
-            context_str = self._format_context(context)
-            prompt = f"{context_str}\n\nUser: {user_message}"
-        
-        # Get conversation history if enabled
+        session_id = session_id or self.session_id
         history = []
         if use_history and self.client.is_available():
-            history = db_manager.get_conversation_history(self.session_id, self.max_context)
-        
-        # Add history to prompt if available
-        if history:
-            history_str = "\n".join([
-                f"{'User' if msg['role'] == 'user' else JARVIS_NAME}: {msg['content']}"
-                for msg in history[-5:]  # Last 5 messages
-            ])
-            prompt = f"Previous conversation:\n{history_str}\n\nCurrent message: {prompt}"
+            history = self.conversations.history(session_id, self.prompts.history_limit(session_id))
         
         # Generate response
-        response = self.client.chat(prompt)
+        built = self._build_reply_prompt(user_message, context, history, session_id if use_history else None)
+        start = time.perf_counter()
+        response = self.client.chat(
+            built["prompt"], system_prompt=built["system_prompt"], cache=cache, call_site=call_site
+        )
+        self.prompts.observe(built, (time.perf_counter() - start) * 1000)
         
         # Save to conversation history
         if use_history:
-            db_manager.add_conversation_message("user", user_message, self.session_id)
-            db_manager.add_conversation_message("assistant", response, self.session_id)
+            self._save_exchange(session_id, user_message, response)
         
         return response
     
+    async def generate_reply_async(
+        self, 
+        user_message: str, 
+        context: Optional[Dict[str, Any]] = None,
+        use_history: bool = True,
+        cache: bool = False,
+        session_id: Optional[str] = None,
+        call_site: str = "chat"
+    ) -> str:
+        """
+        Awaitable version of generate_reply(); the LLM call is awaited
+        and history is read from memory (from the executor when the
+        session still has to be loaded).
+        """
+        session_id = session_id or self.session_id
+        history = []
+        if use_history:
+            await self._seed_async(session_id)
+            if self.client.is_available():
+                history = await self._history_async(session_id)
+        
+        built = self._build_reply_prompt(user_message, context, history, session_id if use_history else None)
+        start = time.perf_counter()
+        response = await self.client.chat_async(
+            built["prompt"], system_prompt=built["system_prompt"], cache=cache, call_site=call_site
+        )
+        self.prompts.observe(built, (time.perf_counter() - start) * 1000)
+        
+        if use_history:
+            await asyncio.to_thread(self._save_exchange, session_id, user_message, response)
+        
+        return response
+    
+    async def stream_reply_async(
+        self, 
+        user_message: str, 
+        context: Optional[Dict[str, Any]] = None,
+        use_history: bool = True,
+        cache: bool = False,
+        session_id: Optional[str] = None,
+        call_site: str = "chat"
+    ) -> AsyncIterator[str]:
+        """
+        Streaming version of generate_reply_async(): yields the reply in
+        chunks as Gemini produces them. The exchange is saved to history
+        once the stream is complete.
+        """
+        session_id = session_id or self.session_id
+        history = []
+        if use_history:
+            await self._seed_async(session_id)
+            if self.client.is_available():
+                history = await self._history_async(session_id)
+        
+        built = self._build_reply_prompt(user_message, context, history, session_id if use_history else None)
+        start = time.perf_counter()
+        parts = []
+        async for chunk in self.client.chat_stream_async(
+            built["prompt"], system_prompt=built["system_prompt"], cache=cache, call_site=call_site
+        ):
+            parts.append(chunk)
+            yield chunk
+        self.prompts.observe(built, (time.perf_counter() - start) * 1000)
+        
+        if use_history:
+            await asyncio.to_thread(self._save_exchange, session_id, user_message, "".join(parts).strip())
+    
+    def _build_reply_prompt(
+        self,
+        user_message: str,
+        context: Optional[Dict[str, Any]],
+        history: List[Dict[str, Any]],
+        session_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Enrich the user message with context, the summary and recent history, within the prompt budget."""
+        return self.prompts.build(
+            session_id,
+            user_message,
+            self._format_context(context) if context else "",
+            history
+        )
+    
+    async def _history_async(self, session_id: str) -> List[Dict[str, Any]]:
+        limit = self.prompts.history_limit(session_id)
+        if self.conversations.is_loaded(session_id):
+            return self.conversations.history(session_id, limit)
+        return await asyncio.to_thread(self.conversations.history, session_id, limit)
+    
+    async def _seed_async(self, session_id: str):
+        # Seeding may read the database; keep it off the event loop
+        if self.prompts.needs_seed(session_id):
+            await asyncio.to_thread(self.prompts.seed, session_id)
+    
+    def _save_exchange(self, session_id: str, user_message: str, response: str):
+        exchange = (("user", user_message), ("assistant", response))
+        self.conversations.extend(session_id, exchange)
+        for role, content in exchange:
+            self.prompts.record(session_id, role, content)
+    
     def generate_command_response(
         self,
         command_type: str,
@@ -98,6 +205,44 @@ class AIEngine:
             else:
                 return f"Command '{command_type}' failed: {details}"
     
+    async def generate_command_response_async(
+        self,
+        command_type: str,
+        success: bool,
+        details: str = "",
+        user_friendly: bool = True
+    ) -> str:
+        """Awaitable version of generate_command_response()."""
+        if not user_friendly:
+            return self.generate_command_response(command_type, success, details, user_friendly=False)
+        return await self.client.generate_command_response_async(command_type, success, details)
+    
+    def generate_plan_response(self, steps: List[Tuple[str, bool, str]]) -> str:
+        """
+        Generate one response for a multi-step command.
+        
+        Args:
+            steps: (command, success, details) for each executed step
+            
+        Returns:
+            Single response covering every step
+        """
+        return self.client.generate_command_response(*self._plan_summary(steps))
+    
+    async def generate_plan_response_async(self, steps: List[Tuple[str, bool, str]]) -> str:
+        """Awaitable version of generate_plan_response()."""
+        command_type, success, details = self._plan_summary(steps)
+        return await self.client.generate_command_response_async(command_type, success, details)
+    
+    def _plan_summary(self, steps: List[Tuple[str, bool, str]]) -> Tuple[str, bool, str]:
+        """Collapse plan steps into one (command, success, details) triple."""
+        command_type = " then ".join(command for command, _, _ in steps)
+        details = "; ".join(
+            f"{command}: {'done' if success else 'failed'}" + (f" ({detail})" if detail else "")
+            for command, success, detail in steps
+        )
+        return command_type, all(success for _, success, _ in steps), details
+    
     def explain_error(self, error: str, context: str = "") -> str:
         """
         Generate helpful error explanation.
@@ -109,17 +254,31 @@ class AIEngine:
         Returns:
             Helpful error message
         """
-        prompt = f"""I encountered an error while trying to help the user.
+        try:
+            response = self.client.complete(
+                self._error_prompt(error, context), temperature=0.5, cache=True, call_site="explain_error"
+            )
+        except:
+            response = None
+        return response or f"Hmm, I hit a snag: {error}. Want to try again? 😅"
+    
+    async def explain_error_async(self, error: str, context: str = "") -> str:
+        """Awaitable version of explain_error()."""
+        try:
+            response = await self.client.complete_async(
+                self._error_prompt(error, context), temperature=0.5, cache=True, call_site="explain_error"
+            )
+        except Exception:
+            response = None
+        return response or f"Hmm, I hit a snag: {error}. Want to try again? 😅"
+    
+    def _error_prompt(self, error: str, context: str) -> str:
+        return f"""I encountered an error while trying to help the user.
 Context: {context}
 Error: {error}
 
 Explain this error in a friendly, helpful way (1-2 sentences) and suggest what to try next.
 Be supportive and not overly technical."""
-        
-        try:
-            return self.client.chat(prompt, temperature=0.5)
-        except:
-            return f"Hmm, I hit a snag: {error}. Want to try again? 😅"
     
     def greet(self) -> str:
         """Generate a greeting."""
@@ -149,9 +308,11 @@ Be supportive and not overly technical."""
                 parts.append(f"{key}: {value}")
         return " | ".join(parts) if parts else ""
     
-    def clear_history(self):
-        """Clear conversation history."""
-        db_manager.clear_conversation_history(self.session_id)
+    def clear_history(self, session_id: Optional[str] = None):
+        """Clear a session's conversation history (default: the "default" session)."""
+        session_id = session_id or self.session_id
+        self.conversations.clear(session_id)
+        self.prompts.clear(session_id)
         logger.info("Conversation history cleared")
 
 # Global instance
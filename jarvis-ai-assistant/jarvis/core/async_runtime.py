@@ -0,0 +1,163 @@
+"""
+Shared asyncio runtime for the command pipeline.
+
+One event loop runs in a background daemon thread for the whole process.
+Synchronous callers (Flask request threads, the voice loop) hand it
+coroutines with submit()/run(), so many commands can be in flight on the
+same loop while blocking automation and database work is pushed to the
+loop's thread pool with asyncio.to_thread (which copies contextvars).
+"""
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Coroutine, Iterator, Optional
+
+from loguru import logger
+
+from jarvis.config.settings import ASYNC_EXECUTOR_WORKERS
+
+class AsyncRuntime:
+    """Lazily started event loop thread with a bounded default executor."""
+
+    def __init__(self, workers: int = ASYNC_EXECUTOR_WORKERS):
+        self.workers = workers
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started on first use."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._start()
+            return self._loop
+
+    def _start(self):
+        # Caller holds the lock
+        loop = asyncio.new_event_loop()
+        loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jarvis-blocking")
+        )
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="jarvis-event-loop", daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+        logger.debug("Async runtime started")
+
+    def in_loop_thread(self) -> bool:
+        """True when called from the event loop's own thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the loop; returns a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Must not be called from the loop thread itself (it would wait on
+        itself forever); code already on the loop should await instead.
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("AsyncRuntime.run() called from the event loop thread; await instead")
+        return self.submit(coro).result(timeout)
+
+    def iterate(self, stream: AsyncIterator[Any], timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Consume an async iterator on the loop from a synchronous thread
+        (e.g. a streamed Flask response), item by item.
+
+        Args:
+            stream: Async iterator to drive on the loop
+            timeout: Max seconds to wait for each item (TimeoutError)
+
+        Closing the returned generator early cancels the stream.
+        """
+        if self.in_loop_thread():
+            raise RuntimeError("AsyncRuntime.iterate() called from the event loop thread; use async for")
+        items: "queue.Queue" = queue.Queue()
+        end = object()
+
+        async def pump():
+            try:
+                async for item in stream:
+                    items.put((item, None))
+            except Exception as e:
+                items.put((end, e))
+            else:
+                items.put((end, None))
+            finally:
+                aclose = getattr(stream, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+        future = self.submit(pump())
+        try:
+            while True:
+                try:
+                    item, error = items.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No item from stream within {timeout}s") from None
+                if item is end:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+    async def _drain(self, loop: asyncio.AbstractEventLoop):
+        """Cancel every other task on the loop, shut down its executor, then stop it."""
+        try:
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_default_executor()
+        finally:
+            # After our own completion callbacks, so stop() sees the result
+            loop.call_soon(loop.stop)
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the loop and wait for its thread to exit.
+
+        Outstanding tasks are cancelled and the blocking executor is shut
+        down on the still-running loop first; the loop's own thread then
+        stops and closes it, so a loop stuck in a blocking call is left to
+        finish (and close) on its daemon thread.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        if threading.current_thread() is thread:
+            loop.stop()  # can't wait for ourselves; the thread exits after this callback
+            return
+        # The drain stops the loop when done, even if that is after our timeout
+        try:
+            asyncio.run_coroutine_threadsafe(self._drain(loop), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Blocking executor did not shut down cleanly: {e!r}")
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Event loop thread did not exit in time; leaving its loop open")
+            return
+        logger.debug("Async runtime stopped")
+
+# Global instance
+async_runtime = AsyncRuntime()
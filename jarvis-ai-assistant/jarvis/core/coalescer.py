@@ -0,0 +1,119 @@
+"""
+Command coalescing for rapid repeated actions.
+
+Holding the phone's volume button or saying "volume up" several times
+produces a burst of identical commands. Commands that share a coalescing
+key are merged: the first one runs immediately, anything with the same
+key arriving while it runs (or within the window after it started) is
+collected into a single follow-up execution with the summed magnitude.
+Every caller awaits the execution it was merged into and gets its own
+copy of the result.
+
+Only merge commands whose combined effect the executor can reproduce
+from the sum: additive steps (volume up/down) or toggles counted with
+magnitude 1, whose executor acts on the parity of the total.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from jarvis.config.settings import COALESCE_WINDOW_MS
+
+Executor = Callable[[int, int], Awaitable[Dict[str, Any]]]
+
+class _Batch:
+    """Commands merged into one execution."""
+
+    def __init__(self, execute: Executor):
+        self.execute = execute
+        self.amount = 0
+        self.callers = 0
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+class _KeyState:
+    def __init__(self):
+        self.lock = asyncio.Lock()  # one execution per key at a time
+        self.pending: Optional[_Batch] = None
+        self.last_start = float("-inf")
+
+class Coalescer:
+    """Merges same-key commands arriving within a short window."""
+
+    def __init__(self, window_ms: float = COALESCE_WINDOW_MS):
+        self.window = window_ms / 1000
+        self._keys: Dict[str, _KeyState] = {}
+        # The loop only keeps weak references to tasks; hold the flushes
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.executions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    async def submit(self, key: str, amount: int, execute: Executor) -> Dict[str, Any]:
+        """
+        Run a command, merged with any same-key commands in the window.
+
+        Args:
+            key: Coalescing key; commands with equal keys are merged
+            amount: This command's (signed) magnitude; 0 for idempotent commands,
+                1 for toggles (the executor acts on the parity of the total)
+            execute: Coroutine function called as execute(total_amount, callers)
+                for the merged batch (the first caller's executor is used)
+
+        Returns:
+            Copy of the merged execution's result
+        """
+        state = self._keys.setdefault(key, _KeyState())
+        batch = state.pending
+        if batch is None:
+            batch = state.pending = _Batch(execute)
+            task = asyncio.create_task(self._flush(state, batch))
+            self._tasks.add(task)
+            task.add_done_callback(lambda done: self._flushed(done, state, batch))
+        batch.amount += amount
+        batch.callers += 1
+        with self._stats_lock:
+            self.requests += 1
+
+        # Shield: one caller giving up must not cancel everyone's execution
+        result = await asyncio.shield(batch.future)
+        return dict(result)
+
+    async def _flush(self, state: _KeyState, batch: _Batch):
+        loop = asyncio.get_running_loop()
+        async with state.lock:
+            delay = state.last_start + self.window - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Close the batch; later arrivals start the next one
+            if state.pending is batch:
+                state.pending = None
+            state.last_start = loop.time()
+            with self._stats_lock:
+                self.executions += 1
+            try:
+                batch.future.set_result(await batch.execute(batch.amount, batch.callers))
+            except Exception as e:
+                batch.future.set_exception(e)
+
+    def _flushed(self, task: asyncio.Task, state: _KeyState, batch: _Batch):
+        self._tasks.discard(task)
+        if not batch.future.done():
+            # Cancelled, possibly before it started: don't leave the callers waiting
+            if state.pending is batch:
+                state.pending = None
+            batch.future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests received vs. actions actually executed."""
+        with self._stats_lock:
+            return {
+                "window_ms": round(self.window * 1000, 3),
+                "requests": self.requests,
+                "executions": self.executions,
+                "merged": self.requests - self.executions
+            }
@@ -3,11 +3,24 @@ Command Router - the brain that decides what to do with user input.
 Parses commands and routes to appropriate handlers.
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import re
+import time
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, List
 from loguru import logger
 
-from jarvis.utils.text_parsing import parse_command
-from jarvis.core.ai_engine import ai_engine
+from jarvis.utils.text_parsing import parse_plan, normalize_text
+from jarvis.core.ai_engine import ai_engine, AIEngine
+from jarvis.core.intent_classifier import intent_rerouter
+from jarvis.core.handler_registry import HandlerRegistry
+from jarvis.core.async_runtime import async_runtime
+from jarvis.core.ack_engine import ack_engine, AckEngine
+from jarvis.core.speculation import Speculation, SpeculationStats
+from jarvis.core.confirmation_store import ConfirmationStore
+from jarvis.core.coalescer import Coalescer
+from jarvis.core.streaming import speech_sink, stream_sentences
+from jarvis.config.settings import SPECULATIVE_RESPONSES, VOLUME_STEP
 from jarvis.automation.app_launcher import app_launcher
 from jarvis.automation.browser_control import browser_control
 from jarvis.automation.system_control import system_control
@@ -15,166 +28,535 @@ from jarvis.automation.file_manager import file_manager
 from jarvis.remote.typing_controller import typing_controller
 from jarvis.database.db_manager import db_manager
 
+# Steps that touch no shared state beyond their own app/tab/volume, so
+# consecutive ones in a plan can run side by side. Everything else
+# (typing, files, power, screenshots) waits for the steps before it.
+PARALLEL_SAFE_STEPS = {
+    "app_launch": None,
+    "browser": None,
+    "system": {"volume_up", "volume_down", "mute", "unmute"},
+}
+
+# Commands whose reply is phrased by the LLM, and the outcomes that get
+# phrased (failures are spoken as the handler's own message)
+SPECULATIVE_OUTCOMES = {
+    "app_launch": (True,),
+    "file": (True,),
+}
+
+# (intent, action) -> (coalescing key, signed magnitude). Volume steps
+# in a burst add up. Mute and unmute both press the same toggle key, so a
+# burst of them collapses by parity: an odd count is one key press, an
+# even count leaves the audio as it was.
+COALESCE_RULES = {
+    ("system", "volume_up"): ("volume", 1),
+    ("system", "volume_down"): ("volume", -1),
+    ("system", "mute"): ("mute_toggle", 1),
+    ("system", "unmute"): ("mute_toggle", 1),
+}
+
+# Replies to a "requires confirmation" prompt, on normalized text
+_CONFIRM_REPLY = re.compile(
+    r"(?:yes|yeah|yep|sure|confirm(?:ed)?|do it|go ahead)(?:,? (?:please|confirm|do it))?"
+    r"(?:,? (?:the )?(delete|deletion|shutdown|shut down|restart|reboot))?(?: (?:please|now|it))?"
+)
+_CANCEL_REPLY = re.compile(r"(?:no|nope|cancel|never ?mind|don't|stop)(?: it| that)?(?:,? thanks)?")
+_CONFIRM_KINDS = {
+    "delete": "delete", "deletion": "delete",
+    "shutdown": "shutdown", "shut down": "shutdown",
+    "restart": "restart", "reboot": "restart",
+}
+# Greetings and thanks: answered without history, so the reply is cacheable
+_SMALL_TALK = re.compile(
+    r"(?:hi|hello|hey|yo|good (?:morning|afternoon|evening|night)|thanks|thank you|"
+    r"how are you|what's up|whats up)(?:,? (?:jarvis|buddy|there))?"
+)
+
+# Conversation (session id) of the command being handled, for the chat
+# handlers; set per command, so concurrent commands never share it
+_conversation: ContextVar[Optional[str]] = ContextVar("conversation", default=None)
+
 class CommandRouter:
     """
     Routes parsed commands to appropriate handlers.
     Central hub for all command processing.
     """
     
-    def __init__(self):
-        self.ai = ai_engine
-        self.pending_confirmations = {}  # Store pending destructive actions
+    def __init__(self, ai: Optional[AIEngine] = None, acks: Optional[AckEngine] = None):
+        self.ai = ai or ai_engine
+        self.acks = acks or ack_engine
+        self.speculative = SPECULATIVE_RESPONSES
+        if self.speculative and self.acks.enabled:
+            logger.info("SPECULATIVE_RESPONSES has no effect while the acknowledgement engine is enabled")
+        self.speculation_stats = SpeculationStats()
+        self.confirmations = ConfirmationStore()  # Destructive commands awaiting confirmation
+        self.coalescer = Coalescer()
+        self.handlers = HandlerRegistry()
+        self._register_builtin_handlers()
+    
+    def _register_builtin_handlers(self):
+        """
+        Populate the dispatch table.
+        
+        Entries call the _handle_* methods at call time (rather than
+        binding them now) so patching a method on the router still works.
+        """
+        register = self.handlers.register
+        
+        register("app_launch", lambda data, text: self._handle_app_launch(data))
+        register("typing", lambda data, text: self._handle_typing(data))
+        register("chat", lambda data, text: self._handle_chat(data), asynchronous=True)
+        register("file", lambda data, text: self._handle_file(data, text))
+        
+        register("browser", lambda data, text: self._browser_result(
+            data, browser_control.open_url(data["url"])), action="open_url")
+        register("browser", lambda data, text: self._browser_result(
+            data, browser_control.google_search(data["query"])), action="google_search")
+        register("browser", lambda data, text: self._browser_result(
+            data, browser_control.open_youtube_search(data["query"])), action="youtube_search")
+        
+        for action in ("volume_up", "volume_down"):
+            register("system", self._volume_action(action), action=action)
+        for action in ("mute", "unmute", "screenshot"):
+            register("system", self._system_action(action), action=action)
+        register("system", lambda data, text: self._handle_power(data, text, "shutdown"), action="shutdown")
+        register("system", lambda data, text: self._handle_power(data, text, "restart"), action="restart")
+        register("system", lambda data, text: self._cancel_shutdown(), action="cancel_shutdown")
     
-    def handle_command(self, text: str, source: str = "voice") -> Dict[str, Any]:
+    def handle_command(
+        self,
+        text: str,
+        source: str = "voice",
+        session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Main entry point for processing commands.
         
+        Synchronous wrapper around handle_command_async: the command runs
+        on the shared event loop and this call blocks until it is done.
+        
+        Args:
+            text: Raw command text
+            source: 'voice', 'phone', or 'api'
+            session_id: Conversation/device the command belongs to
+            
+        Returns:
+            Dict with action results and response
+        """
+        return async_runtime.run(self.handle_command_async(text, source, session_id))
+    
+    async def handle_command_async(
+        self,
+        text: str,
+        source: str = "voice",
+        session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Process a command without blocking the event loop.
+        
+        Parsing runs inline (it is cheap), automation handlers and
+        database writes run in the loop's executor and LLM calls are
+        awaited, so many commands can be in flight at once.
+        
         Args:
             text: Raw command text
             source: 'voice', 'phone', or 'api'
+            session_id: Conversation/device the command belongs to;
+                chat uses that session's history, and confirmations
+                only apply within the same source and session
             
         Returns:
             Dict with action results and response
         """
         if not text or not text.strip():
-            return self._error_response("No command provided")
+            return await self._error_response("No command provided")
         
         text = text.strip()
+        session = (source, session_id or "default")
+        _conversation.set(session_id)
         logger.info(f"Processing command from {source}: {text[:50]}...")
         
-        # Parse the command
-        parsed = parse_command(text)
+        # Replies to a confirmation prompt replay the parked command
+        normalized = normalize_text(text)
+        confirm = _CONFIRM_REPLY.fullmatch(normalized)
+        parsed = None
+        if confirm:
+            parsed = self._confirmed_command(session, _CONFIRM_KINDS.get(confirm.group(1)))
+            if parsed is None and "confirm" in normalized:
+                return await self._log_result(source, text, "confirmation", {
+                    "action": "confirmation",
+                    "success": False,
+                    "spoken_response": "There's nothing waiting for confirmation right now. 🤔"
+                })
+        elif _CANCEL_REPLY.fullmatch(normalized) and self.confirmations.discard(session):
+            return await self._log_result(source, text, "confirmation", {
+                "action": "confirmation_cancelled",
+                "success": True,
+                "spoken_response": "Okay, I won't do it. 👍"
+            })
+        
+        if parsed is None:
+            # Compound utterances ("open chrome and turn the volume up")
+            # become a plan of several steps
+            steps = parse_plan(text)
+            if len(steps) > 1:
+                return await self._execute_plan(steps, source, session)
+            
+            # Near-miss commands the regex parser leaves as chat get a
+            # second look from the local classifier
+            parsed = steps[0]
+            if parsed["type"] == "chat":
+                parsed = intent_rerouter.reroute(text) or parsed
         command_type = parsed["type"]
-        data = parsed["data"]
         
-        # Route to handler
-        result = None
+        try:
+            result = await self._dispatch_and_phrase(command_type, parsed["data"], parsed["original"])
+            if result.get("requires_confirmation") is True:
+                self.confirmations.put(session, parsed["data"].get("action"), parsed)
+            return await self._log_result(source, text, command_type, result)
+            
+        except Exception as e:
+            logger.exception("Command handling failed")
+            error_result = await self._error_response(str(e))
+            return await self._log_result(source, text, command_type, error_result, error=str(e))
+    
+    def _confirmed_command(self, session, kind: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The session's parked command, marked as confirmed, if one is pending."""
+        parsed = self.confirmations.take(session, kind)
+        if parsed is None:
+            return None
+        logger.info(f"Confirmed pending {parsed['type']} command: {parsed['original'][:50]}")
+        return {
+            "type": parsed["type"],
+            "data": {**parsed["data"], "confirmed": True},
+            "original": parsed["original"]
+        }
+    
+    async def _log_result(
+        self,
+        source: str,
+        text: str,
+        command_type: str,
+        result: Dict[str, Any],
+        error: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Log a handled command to history and pass its result through."""
+        await asyncio.to_thread(
+            db_manager.log_command,
+            source=source,
+            raw_text=text,
+            action_type=command_type,
+            success=False if error else result.get("success", False),
+            error_message=error or result.get("error"),
+            response_text=result.get("spoken_response")
+        )
+        return result
+    
+    async def _dispatch(self, command_type: str, data: Optional[Dict], text: str) -> Dict[str, Any]:
+        """Route one parsed command to its registered handler."""
+        action = data.get("action") if isinstance(data, dict) else None
+        # "cancel the shutdown" parses as a shutdown; it must never run one
+        if command_type == "system" and "cancel" in text.lower() and "shutdown" in text.lower():
+            action = "cancel_shutdown"
+        
+        rule = COALESCE_RULES.get((command_type, action))
+        if rule and self.coalescer.enabled:
+            key, amount = rule
+            return await self.coalescer.submit(
+                key, amount,
+                lambda total, callers: self._run_coalesced(key, total, callers, data, text)
+            )
+        
+        handler = self.handlers.resolve(command_type, action)
+        if handler is None:
+            return await self._handle_unknown(text)
+        return await handler.call_async(data, text)
+    
+    async def _run_coalesced(
+        self,
+        key: str,
+        total: int,
+        callers: int,
+        data: Dict,
+        text: str
+    ) -> Dict[str, Any]:
+        """Execute one merged burst of volume/mute commands."""
+        if key == "volume":
+            if total == 0:
+                return {
+                    "action": "system_volume",
+                    "success": True,
+                    "spoken_response": "Volume's right where it was. 🔈"
+                }
+            action = "volume_up" if total > 0 else "volume_down"
+            data = {"action": action, "step": abs(total) * VOLUME_STEP}
+        elif total % 2 == 0:
+            # Toggled back and forth: pressing nothing has the same effect
+            return {
+                "action": "system_mute",
+                "success": True,
+                "spoken_response": "Sound's right where it was. 🔈",
+                "details": {"coalesced_commands": callers}
+            }
+        else:
+            action = data["action"]
+        
+        result = await self.handlers.resolve("system", action).call_async(data, text)
+        if callers > 1:
+            result["details"] = {"coalesced_commands": callers, **data}
+        return result
+    
+    async def _dispatch_and_phrase(self, command_type: str, data: Optional[Dict], text: str) -> Dict[str, Any]:
+        """
+        Run a command and phrase its reply.
+        
+        In speculative mode, commands whose reply goes to the LLM start
+        the phrasing request alongside the action, so the two latencies
+        overlap instead of adding up. The speculative prompt cannot
+        include the action's own result message.
+        """
+        command = self._speculative_command(command_type, data, text)
+        if command is None:
+            return await self._phrase_response(await self._dispatch(command_type, data, text))
         
+        speculation = Speculation(
+            lambda success: self.ai.generate_command_response_async(command, success, ""),
+            SPECULATIVE_OUTCOMES[command_type]
+        )
         try:
-            if command_type == "app_launch":
-                result = self._handle_app_launch(data)
-            elif command_type == "browser":
-                result = self._handle_browser(data)
-            elif command_type == "system":
-                result = self._handle_system(data, text)
-            elif command_type == "file":
-                result = self._handle_file(data, text)
-            elif command_type == "typing":
-                result = self._handle_typing(data)
-            elif command_type == "chat":
-                result = self._handle_chat(data)
+            action_start = time.perf_counter()
+            result = await self._dispatch(command_type, data, text)
+            action_ms = (time.perf_counter() - action_start) * 1000
+        except BaseException:
+            speculation.cancel()
+            self.speculation_stats.record_wasted(command_type)
+            raise
+        
+        request = result["phrase_request"] if "phrase_request" in result else None
+        resolved = await speculation.resolve(request["success"] if request else None)
+        if resolved is None:
+            self.speculation_stats.record_wasted(command_type)
+            return await self._phrase_response(result)
+        
+        response, llm_ms = resolved
+        wall_ms = (time.perf_counter() - speculation.started_at) * 1000
+        self.speculation_stats.record_used(command_type, action_ms, llm_ms, wall_ms)
+        result.pop("phrase_request")
+        result["spoken_response"] = response
+        return result
+    
+    @property
+    def speculating(self) -> bool:
+        """True if replies are speculated on: only while they are LLM-phrased (acks off)."""
+        return self.speculative and not self.acks.enabled
+    
+    def _speculative_command(self, command_type: str, data: Optional[Dict], text: str) -> Optional[str]:
+        """The phrasing prompt's command description, if this command is speculated on."""
+        if not self.speculating or command_type not in SPECULATIVE_OUTCOMES:
+            return None
+        if command_type == "app_launch":
+            return f"open {data['app_name']}"
+        if data["action"] == "delete" and not data.get("confirmed"):
+            return None  # only asks for confirmation
+        return f"{data['action']} files"
+    
+    async def _phrase_response(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace a handler's plain message with an AI-phrased one.
+        
+        Handlers that want a buddy-style confirmation leave a
+        'phrase_request' (command, success, details, target) in their
+        result instead of calling the LLM themselves, so a plan can phrase
+        all of its steps at once. With the acknowledgement engine enabled
+        the phrasing comes from its pre-generated pool, without an LLM call.
+        """
+        if "phrase_request" in result:
+            request = result.pop("phrase_request")
+            if self.acks.enabled:
+                result["spoken_response"] = self.acks.acknowledge(
+                    result["action"], request["success"], request.get("target", "")
+                )
             else:
-                result = self._handle_unknown(text)
-            
-            # Log the command
-            db_manager.log_command(
-                source=source,
-                raw_text=text,
-                action_type=command_type,
-                success=result.get("success", False),
-                error_message=result.get("error"),
-                response_text=result.get("spoken_response")
+                result["spoken_response"] = await self.ai.generate_command_response_async(
+                    request["command"], request["success"], request["details"]
+                )
+        return result
+    
+    def _plan_stages(self, steps: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Group plan steps into stages that run one after another.
+        
+        Consecutive parallel-safe steps share a stage; every other step
+        gets a stage of its own, so order is kept wherever it matters.
+        """
+        stages = []
+        grouping = False
+        for index, step in enumerate(steps):
+            safe_actions = PARALLEL_SAFE_STEPS.get(step["type"], ())
+            parallel = step["type"] in PARALLEL_SAFE_STEPS and (
+                safe_actions is None or step["data"]["action"] in safe_actions
             )
-            
-            return result
-            
+            if parallel and grouping:
+                stages[-1].append(index)
+            else:
+                stages.append([index])
+            grouping = parallel
+        return stages
+    
+    async def _run_step(self, step: Dict[str, Any], source: str, session) -> Dict[str, Any]:
+        """Execute and log one plan step, leaving its phrasing to the plan."""
+        text = step["original"]
+        try:
+            result = await self._dispatch(step["type"], step["data"], text)
         except Exception as e:
-            logger.exception("Command handling failed")
-            error_result = self._error_response(str(e))
+            logger.exception(f"Plan step failed: {text[:50]}")
+            result = {
+                "action": step["type"],
+                "success": False,
+                "spoken_response": f"Couldn't {text}: {e}",
+                "error": str(e)
+            }
+        
+        if result.get("requires_confirmation") is True:
+            self.confirmations.put(session, step["data"].get("action"), step)
+        return await self._log_result(source, text, step["type"], result)
+    
+    async def _execute_plan(self, steps: List[Dict[str, Any]], source: str, session) -> Dict[str, Any]:
+        """
+        Run a multi-step plan and build one combined response.
+        
+        Args:
+            steps: Parsed steps in utterance order
+            source: 'voice', 'phone', or 'api'
+            session: (source, session_id) for confirmations
             
-            db_manager.log_command(
-                source=source,
-                raw_text=text,
-                action_type=command_type,
-                success=False,
-                error_message=str(e),
-                response_text=error_result.get("spoken_response")
+        Returns:
+            Dict with action 'plan', overall success and per-step results
+        """
+        logger.info(f"Executing plan of {len(steps)} steps from {source}")
+        results: List[Optional[Dict[str, Any]]] = [None] * len(steps)
+        
+        for stage in self._plan_stages(steps):
+            stage_results = await asyncio.gather(
+                *(self._run_step(steps[index], source, session) for index in stage)
             )
-            
-            return error_result
+            for index, result in zip(stage, stage_results):
+                results[index] = result
+        
+        spoken = await self._combine_responses(steps, results)
+        for step, result in zip(steps, results):
+            result.pop("phrase_request", None)
+            result["command"] = step["original"]
+        
+        return {
+            "action": "plan",
+            "success": all(result.get("success", False) for result in results),
+            "spoken_response": spoken,
+            "details": {"steps": results}
+        }
+    
+    async def _combine_responses(self, steps: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> str:
+        """
+        One spoken response for a whole plan.
+        
+        Uses a single acknowledgement (or, with the acknowledgement engine
+        disabled, a single LLM call) when any step asked for AI phrasing,
+        plain step messages otherwise. Confirmation prompts are always
+        spoken verbatim so the user hears exactly what to say next.
+        """
+        outcomes = []
+        confirmations = []
+        for step, result in zip(steps, results):
+            if result.get("requires_confirmation") is True:
+                confirmations.append(result["spoken_response"])
+            else:
+                outcomes.append((step["original"], result.get("success", False),
+                                 result.get("spoken_response") or ""))
+        
+        if any("phrase_request" in result for result in results) and self.acks.enabled:
+            succeeded = all(success for _, success, _ in outcomes)
+            summary = [self.acks.acknowledge("plan", succeeded)] + [
+                message for _, success, message in outcomes if not success and message
+            ]
+        elif any("phrase_request" in result for result in results):
+            summary = [await self.ai.generate_plan_response_async(outcomes)]
+        else:
+            summary = [message for _, _, message in outcomes if message]
+        
+        return " ".join(summary + confirmations)
     
     def _handle_app_launch(self, data: Dict) -> Dict[str, Any]:
         """Handle app launch command."""
         app_name = data["app_name"]
         success, message = app_launcher.open_app(app_name)
         
-        response = self.ai.generate_command_response(
-            f"open {app_name}", success, message
-        ) if success else message
-        
-        return {
+        result = {
             "action": "app_launch",
             "success": success,
             "app_name": app_name,
-            "spoken_response": response,
+            "spoken_response": message,
             "details": {"message": message}
         }
+        if success:
+            result["phrase_request"] = {
+                "command": f"open {app_name}", "success": success,
+                "details": message, "target": app_name
+            }
+        return result
     
-    def _handle_browser(self, data: Dict) -> Dict[str, Any]:
-        """Handle browser commands."""
-        action = data["action"]
-        success, message = False, ""
-        
-        if action == "open_url":
-            success, message = browser_control.open_url(data["url"])
-        elif action == "google_search":
-            success, message = browser_control.google_search(data["query"])
-        elif action == "youtube_search":
-            success, message = browser_control.open_youtube_search(data["query"])
-        
+    def _browser_result(self, data: Dict, outcome) -> Dict[str, Any]:
+        """Build the result of a browser action from its (success, message)."""
+        success, message = outcome
         return {
-            "action": f"browser_{action}",
+            "action": f"browser_{data['action']}",
             "success": success,
             "spoken_response": message,
             "details": data
         }
     
-    def _handle_system(self, data: Dict, raw_text: str) -> Dict[str, Any]:
-        """Handle system control commands."""
-        action = data["action"]
-        success, message = False, ""
-        
-        # Check for cancellation first
-        if "cancel" in raw_text.lower() and "shutdown" in raw_text.lower():
-            success, message = system_control.cancel_shutdown()
+    def _volume_action(self, action: str):
+        """Handler for volume_up/volume_down; data may carry a merged 'step'."""
+        def handler(data: Dict, raw_text: str) -> Dict[str, Any]:
+            success, message = getattr(system_control, action)(step=data.get("step", VOLUME_STEP))
             return {
-                "action": "system_cancel_shutdown",
+                "action": f"system_{action}",
                 "success": success,
                 "spoken_response": message
             }
+        return handler
+    
+    def _system_action(self, action: str):
+        """Handler for a system_control method that takes no arguments."""
+        def handler(data: Dict, raw_text: str) -> Dict[str, Any]:
+            success, message = getattr(system_control, action)()
+            return {
+                "action": f"system_{action}",
+                "success": success,
+                "spoken_response": message
+            }
+        return handler
+    
+    def _cancel_shutdown(self) -> Dict[str, Any]:
+        """Abort a scheduled shutdown or restart."""
+        success, message = system_control.cancel_shutdown()
+        return {
+            "action": "system_cancel_shutdown",
+            "success": success,
+            "spoken_response": message
+        }
+    
+    def _handle_power(self, data: Dict, raw_text: str, action: str) -> Dict[str, Any]:
+        """Handle shutdown/restart, which require explicit confirmation."""
+        if not data.get("confirmed"):
+            return {
+                "action": f"system_{action}",
+                "success": False,
+                "spoken_response": f"{action.capitalize()} requires confirmation. "
+                                   f"Say 'confirm {action}' to proceed. ⚠️",
+                "requires_confirmation": True
+            }
         
-        if action == "volume_up":
-            success, message = system_control.volume_up()
-        elif action == "volume_down":
-            success, message = system_control.volume_down()
-        elif action == "mute":
-            success, message = system_control.mute()
-        elif action == "unmute":
-            success, message = system_control.unmute()
-        elif action == "screenshot":
-            success, message = system_control.screenshot()
-        elif action == "shutdown":
-            # Require explicit confirmation
-            if "confirm" in raw_text.lower():
-                success, message = system_control.shutdown(confirm=True)
-            else:
-                return {
-                    "action": "system_shutdown",
-                    "success": False,
-                    "spoken_response": "Shutdown requires confirmation. Say 'confirm shutdown' to proceed. ⚠️",
-                    "requires_confirmation": True
-                }
-        elif action == "restart":
-            if "confirm" in raw_text.lower():
-                success, message = system_control.restart(confirm=True)
-            else:
-                return {
-                    "action": "system_restart",
-                    "success": False,
-                    "spoken_response": "Restart requires confirmation. Say 'confirm restart' to proceed. ⚠️",
-                    "requires_confirmation": True
-                }
-        
+        success, message = getattr(system_control, action)(confirm=True)
         return {
             "action": f"system_{action}",
             "success": success,
@@ -186,13 +568,11 @@ class CommandRouter:
         action = data["action"]
         success, message = False, ""
         
-        # Check for confirmation on destructive operations
+        # Destructive operations only run once confirmed (the router
+        # parks the command and replays it with data["confirmed"] set)
         needs_confirm = action == "delete"
-        has_confirm = "confirm" in raw_text.lower()
         
-        if needs_confirm and not has_confirm:
-            # Store pending action
-            self.pending_confirmations["last_file_op"] = data
+        if needs_confirm and not data.get("confirmed"):
             return {
                 "action": f"file_{action}",
                 "success": False,
@@ -207,18 +587,18 @@ class CommandRouter:
         elif action == "delete":
             success, message = file_manager.delete_path(data["path"], confirm=True)
         
-        response = message
-        if success:
-            response = self.ai.generate_command_response(
-                f"{action} files", True, message
-            )
-        
-        return {
+        result = {
             "action": f"file_{action}",
             "success": success,
-            "spoken_response": response,
+            "spoken_response": message,
             "details": data
         }
+        if success:
+            result["phrase_request"] = {
+                "command": f"{action} files", "success": True,
+                "details": message, "target": data.get("path") or data.get("source", "")
+            }
+        return result
     
     def _handle_typing(self, data: Dict) -> Dict[str, Any]:
         """Handle typing commands."""
@@ -232,23 +612,47 @@ class CommandRouter:
             "characters_typed": len(text)
         }
     
-    def _handle_chat(self, data: Dict) -> Dict[str, Any]:
+    async def _handle_chat(self, data: Dict) -> Dict[str, Any]:
         """Handle general chat - pass to AI."""
         message = data["message"]
-        response = self.ai.generate_reply(message)
+        small_talk = _SMALL_TALK.fullmatch(normalize_text(message)) is not None
+        
+        sink = speech_sink.get()
+        if sink is None:
+            response = await self.ai.generate_reply_async(
+                message, use_history=not small_talk, cache=small_talk, session_id=_conversation.get()
+            )
+            return {
+                "action": "chat",
+                "success": True,
+                "spoken_response": response,
+                "is_chat": True
+            }
+        
+        # Hand each sentence over as soon as it is complete
+        sentences = []
+        async for sentence in stream_sentences(self.ai.stream_reply_async(
+            message, use_history=not small_talk, cache=small_talk, session_id=_conversation.get()
+        )):
+            sentences.append(sentence)
+            sink(sentence)
         
         return {
             "action": "chat",
             "success": True,
-            "spoken_response": response,
-            "is_chat": True
+            "spoken_response": " ".join(sentences),
+            "is_chat": True,
+            "streamed": True
         }
     
-    def _handle_unknown(self, text: str) -> Dict[str, Any]:
+    async def _handle_unknown(self, text: str) -> Dict[str, Any]:
         """Handle unrecognized commands."""
-        response = self.ai.generate_reply(
+        response = await self.ai.generate_reply_async(
             f"I don't know how to handle this command: '{text}'. "
-            f"Can you help me understand what you'd like me to do?"
+            f"Can you help me understand what you'd like me to do?",
+            use_history=False,
+            cache=True,
+            call_site="unknown_command"
         )
         
         return {
@@ -258,12 +662,12 @@ class CommandRouter:
             "error": "Unknown command type"
         }
     
-    def _error_response(self, error: str) -> Dict[str, Any]:
+    async def _error_response(self, error: str) -> Dict[str, Any]:
         """Generate error response."""
         return {
             "action": "error",
             "success": False,
-            "spoken_response": self.ai.explain_error(error),
+            "spoken_response": await self.ai.explain_error_async(error),
             "error": error
         }
 
@@ -0,0 +1,75 @@
+"""
+Pending confirmations for destructive commands.
+
+When a delete, shutdown or restart needs confirmation, the already
+parsed command is parked here under the (source, session) that asked for
+it. A later "confirm delete" from the same source and session replays
+that exact operation; nothing is re-parsed. Entries expire after
+CONFIRMATION_TTL seconds and the store holds at most
+CONFIRMATION_MAX_PENDING of them (least recently asked dropped first).
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from jarvis.config.settings import CONFIRMATION_TTL, CONFIRMATION_MAX_PENDING
+from jarvis.utils.cache import LRUCache
+
+SessionKey = Tuple[str, str]
+
+class ConfirmationStore:
+    """Thread-safe, expiring, size-bounded map of session -> pending command."""
+
+    def __init__(
+        self,
+        ttl: float = CONFIRMATION_TTL,
+        max_size: int = CONFIRMATION_MAX_PENDING,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._pending = LRUCache(max_size=max_size, ttl=ttl, clock=clock)
+        # Makes the kind check and the removal in take() one step
+        self._lock = threading.Lock()
+
+    def put(self, session: SessionKey, kind: str, parsed: Dict[str, Any]):
+        """
+        Park a command awaiting confirmation, replacing any earlier one
+        for the same session.
+
+        Args:
+            session: (source, session_id)
+            kind: What the user has to confirm ('delete', 'shutdown', 'restart')
+            parsed: The parse_command result to replay
+        """
+        with self._lock:
+            self._pending.put(session, (kind, parsed))
+
+    def take(self, session: SessionKey, kind: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Remove and return the session's pending command.
+
+        Args:
+            session: (source, session_id)
+            kind: Only take it if it is of this kind (None: any kind)
+
+        Returns:
+            The parsed command, or None if nothing (matching) is pending
+        """
+        with self._lock:
+            entry = self._pending.get(session)
+            if entry is None or (kind is not None and entry[0] != kind):
+                return None
+            self._pending.pop(session)
+            return entry[1]
+
+    def discard(self, session: SessionKey) -> bool:
+        """Drop the session's pending command; True if there was one."""
+        with self._lock:
+            return self._pending.pop(session) is not None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pending count and expiry/eviction counters."""
+        return self._pending.stats()
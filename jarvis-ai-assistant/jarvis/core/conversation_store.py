@@ -0,0 +1,148 @@
+"""
+In-memory conversation history.
+
+Each session's recent messages live in a ring buffer of
+CONVERSATION_BUFFER_SIZE messages, so building a reply prompt never hits
+the database. New messages go into the buffer and are queued for the
+database's write-behind writer. A session's buffer is rehydrated from
+the database the first time it is used after a restart, or after it was
+evicted: at most CONVERSATION_MAX_SESSIONS buffers are kept (least
+recently used dropped first), and sessions idle for CONVERSATION_IDLE_TTL
+seconds are dropped too.
+
+The session map's lock is only held to look up, insert or evict
+entries; each session's messages have their own lock, so traffic in one
+session (including its rehydration) never waits on another session.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from jarvis.config.settings import (
+    CONVERSATION_BUFFER_SIZE, CONVERSATION_MAX_SESSIONS, CONVERSATION_IDLE_TTL
+)
+from jarvis.database.db_manager import db_manager
+
+class _Session:
+    """One session's buffer; `lock` guards messages and loading."""
+
+    __slots__ = ("messages", "lock", "loaded", "last_used")
+
+    def __init__(self, max_messages: int, now: float):
+        self.messages = deque(maxlen=max_messages)
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.last_used = now
+
+class ConversationStore:
+    """Thread-safe per-session ring buffers over the conversation table."""
+
+    def __init__(
+        self,
+        max_messages: int = CONVERSATION_BUFFER_SIZE,
+        max_sessions: int = CONVERSATION_MAX_SESSIONS,
+        idle_ttl: float = CONVERSATION_IDLE_TTL,
+        db=db_manager,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_messages = max(1, max_messages)
+        self.max_sessions = max(1, max_sessions)
+        self.idle_ttl = idle_ttl
+        self.db = db
+        self._clock = clock
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.rehydrations = 0
+        self.evictions = 0
+        self.idle_evictions = 0
+
+    def is_loaded(self, session_id: str) -> bool:
+        """True if the session is in memory (reads won't touch the database)."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return session is not None and session.loaded
+
+    def _evict_idle(self, now: float):
+        """Drop sessions idle longer than idle_ttl (caller holds the map lock)."""
+        if self.idle_ttl <= 0:
+            return
+        # The map is in recency order, so idle sessions are at the front
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_used < self.idle_ttl:
+                break
+            self._sessions.popitem(last=False)
+            self.idle_evictions += 1
+
+    def _session(self, session_id: str) -> _Session:
+        """The session's entry, loaded from the database if needed. Caller holds no lock."""
+        now = self._clock()
+        with self._lock:
+            self._evict_idle(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = _Session(self.max_messages, now)
+                self._sessions[session_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._sessions.move_to_end(session_id)
+                session.last_used = now
+
+        if not session.loaded:
+            # Only this session waits for its rehydration
+            with session.lock:
+                if not session.loaded:
+                    messages = self.db.get_conversation_history(session_id, self.max_messages)
+                    session.messages.extend(messages)
+                    session.loaded = True
+                    with self._lock:
+                        self.rehydrations += 1
+        return session
+
+    def history(self, session_id: str = "default", limit: int = 10) -> List[Dict[str, str]]:
+        """The session's last `limit` messages, oldest first."""
+        session = self._session(session_id)
+        with session.lock:
+            messages = list(session.messages)
+        with self._lock:
+            self.reads += 1
+        return messages[-limit:] if limit else []
+
+    def append(self, session_id: str, role: str, content: str):
+        """Add a message to the session and queue it for the database."""
+        self.extend(session_id, [(role, content)])
+
+    def extend(self, session_id: str, messages: Sequence[Tuple[str, str]]):
+        """Add (role, content) messages as one unit, so concurrent exchanges don't interleave."""
+        session = self._session(session_id)
+        with session.lock:
+            for role, content in messages:
+                session.messages.append({"role": role, "content": content})
+                self.db.add_conversation_message(role, content, session_id)
+
+    def clear(self, session_id: str = "default"):
+        """Drop the session's history, in memory and in the database."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        self.db.clear_conversation_history(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "max_messages": self.max_messages,
+                "idle_ttl": self.idle_ttl,
+                "reads": self.reads,
+                "rehydrations": self.rehydrations,
+                "evictions": self.evictions,
+                "idle_evictions": self.idle_evictions
+            }
+
+# Global instance
+conversation_store = ConversationStore()
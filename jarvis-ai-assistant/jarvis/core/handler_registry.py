@@ -0,0 +1,144 @@
+"""
+Handler registry - table-driven command dispatch.
+
+Maps (intent, action) to a handler callable with the uniform signature
+handler(data, raw_text) -> result dict. Handlers can be added or
+replaced at runtime, and every registered handler is wrapped with a
+latency histogram and call/success/failure/error counters.
+
+Handlers are plain blocking callables by default; the async pipeline
+runs them in the event loop's executor. Handlers registered with
+asynchronous=True return an awaitable instead and run on the loop.
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from jarvis.utils.metrics import LatencyHistogram
+
+Handler = Callable[[Optional[Dict[str, Any]], str], Dict[str, Any]]
+
+class InstrumentedHandler:
+    """A handler plus its timing and outcome counters."""
+
+    def __init__(self, name: str, handler: Handler, asynchronous: bool = False):
+        self.name = name
+        self.handler = handler
+        self.asynchronous = asynchronous
+        self.latency = LatencyHistogram()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0  # handler returned success=False
+        self.errors = 0    # handler raised
+
+    def __call__(self, data: Optional[Dict[str, Any]], raw_text: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            result = self.handler(data, raw_text)
+        except Exception:
+            self._record(start, errored=True)
+            raise
+        self._record(start, succeeded=bool(result.get("success", False)))
+        return result
+
+    async def call_async(self, data: Optional[Dict[str, Any]], raw_text: str) -> Dict[str, Any]:
+        """Run the handler without blocking the event loop."""
+        start = time.perf_counter()
+        try:
+            if self.asynchronous:
+                result = self.handler(data, raw_text)
+                if inspect.isawaitable(result):
+                    result = await result
+            else:
+                result = await asyncio.to_thread(self.handler, data, raw_text)
+        except Exception:
+            self._record(start, errored=True)
+            raise
+        self._record(start, succeeded=bool(result.get("success", False)))
+        return result
+
+    def _record(self, start: float, succeeded: bool = False, errored: bool = False):
+        self.latency.observe((time.perf_counter() - start) * 1000)
+        with self._lock:
+            self.calls += 1
+            if errored:
+                self.errors += 1
+            elif succeeded:
+                self.successes += 1
+            else:
+                self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {
+                "calls": self.calls,
+                "successes": self.successes,
+                "failures": self.failures,
+                "errors": self.errors
+            }
+        counters["latency"] = self.latency.snapshot()
+        return counters
+
+    def reset(self):
+        with self._lock:
+            self.calls = self.successes = self.failures = self.errors = 0
+        self.latency.reset()
+
+class HandlerRegistry:
+    """
+    Dispatch table from (intent, action) to instrumented handlers.
+
+    A handler registered without an action is the catch-all for its
+    intent; an exact (intent, action) entry takes precedence over it.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[Tuple[str, Optional[str]], InstrumentedHandler] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        intent: str,
+        handler: Handler,
+        action: Optional[str] = None,
+        asynchronous: bool = False
+    ):
+        """
+        Add or replace a handler.
+
+        Args:
+            intent: Command type from parse_command ('system', 'browser', ...)
+            handler: Callable taking (data, raw_text) and returning a result dict
+            action: Specific action within the intent, or None for all of them
+            asynchronous: The handler returns an awaitable (e.g. it awaits the LLM)
+        """
+        name = f"{intent}.{action}" if action else intent
+        with self._lock:
+            self._handlers[(intent, action)] = InstrumentedHandler(name, handler, asynchronous)
+
+    def unregister(self, intent: str, action: Optional[str] = None):
+        """Remove a handler if present."""
+        with self._lock:
+            self._handlers.pop((intent, action), None)
+
+    def resolve(self, intent: str, action: Optional[str] = None) -> Optional[InstrumentedHandler]:
+        """Exact (intent, action) handler, else the intent's catch-all, else None."""
+        handlers = self._handlers
+        return handlers.get((intent, action)) or handlers.get((intent, None))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-handler counters and latency, keyed 'intent' or 'intent.action'."""
+        with self._lock:
+            handlers = list(self._handlers.values())
+        return {handler.name: handler.stats() for handler in sorted(handlers, key=lambda h: h.name)}
+
+    def reset_stats(self):
+        """Zero every handler's counters and histogram."""
+        with self._lock:
+            handlers = list(self._handlers.values())
+        for handler in handlers:
+            handler.reset()
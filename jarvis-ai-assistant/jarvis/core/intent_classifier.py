@@ -0,0 +1,206 @@
+"""
+Local intent classifier for near-miss commands.
+
+A small multinomial naive Bayes model over hashed word and character
+n-grams, trained from successful command_history rows. It sits between
+the regex parser and the chat fallback: when parse_command says "chat"
+but the model is confident the utterance is really a command ("could you
+pop open spotify"), the command is re-parsed from the point where the
+predicted intent's trigger verb appears and routed to that handler
+instead of making an LLM round-trip.
+"""
+
+import zlib
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+
+import numpy as np
+from loguru import logger
+
+from jarvis.config.settings import (
+    INTENT_CLASSIFIER_ENABLED, INTENT_CLASSIFIER_THRESHOLD, INTENT_CLASSIFIER_MODEL,
+    PARSE_MAX_COMMAND_LENGTH
+)
+from jarvis.utils.cache import FrozenDict
+from jarvis.utils.text_parsing import normalize_text, parse_command, intent_registry
+
+def _stable_hash(feature: str) -> int:
+    # Python's hash() is salted per process; saved models need a stable one
+    return zlib.crc32(feature.encode("utf-8"))
+
+class IntentClassifier:
+    """
+    Hashed n-gram naive Bayes intent model.
+
+    Features are word unigrams and bigrams plus character trigrams of each
+    word, hashed into a fixed number of buckets, so the model size does
+    not grow with the vocabulary.
+    """
+
+    def __init__(self, n_features: int = 2 ** 16, alpha: float = 0.1):
+        self.n_features = n_features
+        self.alpha = alpha
+        self.labels: List[str] = []
+        self._counts: Optional[np.ndarray] = None       # (labels, features)
+        self._label_counts: Optional[np.ndarray] = None  # (labels,)
+        self._log_prior: Optional[np.ndarray] = None
+        self._log_likelihood: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self._log_likelihood is not None
+
+    def featurize(self, text: str) -> np.ndarray:
+        """Bucket indices of the text's n-gram features (with repeats)."""
+        words = normalize_text(text).split()
+        features = list(words)
+        features += [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += [f"#{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return np.fromiter(
+            (_stable_hash(feature) % self.n_features for feature in features),
+            dtype=np.int64,
+            count=len(features)
+        )
+
+    def partial_fit(self, examples: Iterable[Tuple[str, str]]):
+        """
+        Accumulate counts from (text, label) pairs.
+
+        Can be called repeatedly to train from a stream; call
+        finalize() afterwards to compute the model parameters.
+        """
+        for text, label in examples:
+            if label not in self.labels:
+                self.labels.append(label)
+                self._grow()
+            row = self.labels.index(label)
+            np.add.at(self._counts[row], self.featurize(text), 1)
+            self._label_counts[row] += 1
+
+    def _grow(self):
+        """Add a zero row for a newly seen label."""
+        counts = np.zeros((len(self.labels), self.n_features), dtype=np.float32)
+        label_counts = np.zeros(len(self.labels), dtype=np.float64)
+        if self._counts is not None:
+            counts[:-1] = self._counts
+            label_counts[:-1] = self._label_counts
+        self._counts = counts
+        self._label_counts = label_counts
+
+    def finalize(self):
+        """Turn accumulated counts into smoothed log probabilities."""
+        if self._counts is None:
+            raise ValueError("No training examples")
+        smoothed = self._counts + self.alpha
+        self._log_likelihood = np.log(smoothed / smoothed.sum(axis=1, keepdims=True)).astype(np.float32)
+        self._log_prior = np.log(self._label_counts / self._label_counts.sum())
+
+    def fit(self, examples: Iterable[Tuple[str, str]]) -> "IntentClassifier":
+        """Train from (text, label) pairs."""
+        self.partial_fit(examples)
+        self.finalize()
+        return self
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        """
+        Most likely intent and its posterior probability.
+
+        Returns:
+            (label, confidence), or (None, 0.0) if untrained
+        """
+        if not self.is_trained:
+            return None, 0.0
+
+        scores = self._log_prior + self._log_likelihood[:, self.featurize(text)].sum(axis=1)
+        scores = np.exp(scores - scores.max())
+        probabilities = scores / scores.sum()
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    def save(self, path: Path):
+        """Persist the trained model as a NumPy archive."""
+        np.savez_compressed(
+            path,
+            labels=np.array(self.labels),
+            log_prior=self._log_prior,
+            log_likelihood=self._log_likelihood,
+            params=np.array([self.n_features, self.alpha])
+        )
+        logger.info(f"Saved intent classifier to {path}")
+
+    @classmethod
+    def load(cls, path: Path) -> "IntentClassifier":
+        """Load a model written by save()."""
+        with np.load(path) as archive:
+            n_features, alpha = archive["params"]
+            model = cls(n_features=int(n_features), alpha=float(alpha))
+            model.labels = [str(label) for label in archive["labels"]]
+            model._log_prior = archive["log_prior"]
+            model._log_likelihood = archive["log_likelihood"]
+        return model
+
+class IntentRerouter:
+    """
+    Sends confident near-miss "chat" utterances to the right handler.
+    """
+
+    def __init__(
+        self,
+        classifier: Optional[IntentClassifier] = None,
+        threshold: float = INTENT_CLASSIFIER_THRESHOLD
+    ):
+        self.classifier = classifier
+        self.threshold = threshold
+
+    def reroute(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Re-parse an utterance the regex parser classified as chat.
+
+        Args:
+            text: Raw command text
+
+        Returns:
+            A parse_command-style result for the predicted intent, or None
+            to keep treating the utterance as chat
+        """
+        if self.classifier is None or not self.classifier.is_trained:
+            return None
+        if len(text) > PARSE_MAX_COMMAND_LENGTH:
+            return None
+
+        label, confidence = self.classifier.predict(text)
+        if label in (None, "chat") or confidence < self.threshold:
+            return None
+
+        # Slot extraction: re-parse from each point where one of the
+        # predicted intent's trigger verbs starts the rest of the utterance
+        triggers = intent_registry.leading_tokens(label)
+        words = text.split()
+        for start in range(1, len(words)):
+            if triggers and normalize_text(words[start]) not in triggers:
+                continue
+            parsed = parse_command(" ".join(words[start:]))
+            if parsed["type"] == label:
+                logger.info(f"Classifier rerouted chat to {label} ({confidence:.2f}): {text[:50]}")
+                return FrozenDict({
+                    "type": label,
+                    "data": parsed["data"],
+                    "original": text,
+                    "confidence": round(confidence, 4)
+                })
+        return None
+
+def _load_rerouter() -> IntentRerouter:
+    """Build the global rerouter from the saved model, if there is one."""
+    if not INTENT_CLASSIFIER_ENABLED or not INTENT_CLASSIFIER_MODEL.exists():
+        return IntentRerouter()
+    try:
+        return IntentRerouter(IntentClassifier.load(INTENT_CLASSIFIER_MODEL))
+    except Exception as e:
+        logger.error(f"Failed to load intent classifier: {e}")
+        return IntentRerouter()
+
+# Global instance
+intent_rerouter = _load_rerouter()
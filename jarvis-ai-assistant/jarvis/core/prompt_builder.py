@@ -0,0 +1,423 @@
+"""
+Token-budgeted reply prompts.
+
+A reply prompt is the system prompt, the current message (with any
+command context), a rolling summary of older turns and as many recent
+messages, newest first, as fit in PROMPT_BUDGET_TOKENS. Sizes are
+estimated at 4 characters per token.
+
+Messages that age out of the verbatim window (the last
+PROMPT_RECENT_MESSAGES) wait in a per-session list until
+PROMPT_SUMMARY_BATCH of them have collected; a background thread then
+folds them into the session's summary with one LLM call, so summarizing
+never happens on the request path. Until then they are still offered to
+the prompt verbatim (budget permitting). No summary is attempted while
+the client is offline or its circuit breaker is open; the messages keep
+waiting and the next one recorded retries.
+
+The first build for a session the builder doesn't know (after a restart,
+or once it was evicted) seeds its window and pending messages from the
+persisted conversation history, so the summary picks up where it was.
+Seeding may read the database: async callers run seed() in a thread
+before building, so build() never blocks the event loop on it.
+
+Each built prompt's size is recorded, and callers report the LLM
+latency for it, so latency can be read per prompt-size bucket.
+"""
+
+import queue
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from jarvis.api.gemini_client import gemini_client
+from jarvis.api.resilience import OPEN
+from jarvis.config.settings import (
+    JARVIS_NAME, BUDDY_SYSTEM_PROMPT, CONVERSATION_BUFFER_SIZE, CONVERSATION_MAX_SESSIONS,
+    PROMPT_BUDGET_TOKENS, PROMPT_RECENT_MESSAGES, PROMPT_SUMMARY_BATCH, PROMPT_SUMMARY_MAX_TOKENS
+)
+from jarvis.core.conversation_store import conversation_store
+from jarvis.utils.metrics import LatencyHistogram
+
+CHARS_PER_TOKEN = 4
+
+# Upper bounds (estimated tokens) of the prompt-size buckets latency is reported by
+SIZE_BUCKETS = (250, 500, 1000, 2000)
+
+# Smallest piece of a message worth keeping when it has to be cut
+_MIN_MESSAGE_TOKENS = 16
+
+SUMMARY_INSTRUCTIONS = (
+    "You maintain a running summary of a conversation between a user and their "
+    f"voice assistant {JARVIS_NAME}. Keep names, preferences, facts and open requests; "
+    "drop small talk. Reply with the updated summary only, in plain sentences."
+)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of text (4 characters per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def _size_bucket(tokens: int) -> str:
+    for bound in SIZE_BUCKETS:
+        if tokens <= bound:
+            return f"le_{bound}"
+    return "overflow"
+
+def _speaker(message: Dict[str, str]) -> str:
+    return "User" if message["role"] == "user" else JARVIS_NAME
+
+class PromptBuilder:
+    """Builds reply prompts within a size budget and keeps per-session summaries."""
+
+    def __init__(
+        self,
+        client=gemini_client,
+        budget_tokens: int = PROMPT_BUDGET_TOKENS,
+        recent_messages: int = PROMPT_RECENT_MESSAGES,
+        summary_batch: int = PROMPT_SUMMARY_BATCH,
+        summary_max_tokens: int = PROMPT_SUMMARY_MAX_TOKENS,
+        max_sessions: int = CONVERSATION_MAX_SESSIONS,
+        max_pending: int = CONVERSATION_BUFFER_SIZE,
+        background: bool = True,
+        history_source: Optional[Callable[[str, int], List[Dict[str, str]]]] = None
+    ):
+        self.client = client
+        self.history_source = history_source
+        self.budget_tokens = budget_tokens
+        self.recent_messages = max(1, recent_messages)
+        self.summary_batch = max(1, summary_batch)
+        self.summary_max_tokens = summary_max_tokens
+        self.max_sessions = max(1, max_sessions)
+        self.max_pending = max(self.summary_batch, max_pending)
+        self.background = background
+
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._jobs: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+        self._latency = {
+            bucket: LatencyHistogram()
+            for bucket in [f"le_{bound}" for bound in SIZE_BUCKETS] + ["overflow"]
+        }
+        self.prompts = 0
+        self.total_tokens = 0
+        self.max_tokens = 0
+        self.over_budget = 0
+        self.truncated_messages = 0
+        self.omitted_messages = 0
+        self.summaries = 0
+        self.failed_summaries = 0
+        self.dropped_messages = 0
+        self.skipped_summaries = 0
+        self.seeded_sessions = 0
+
+    # Session state
+
+    def _state(self, session_id: str) -> Dict[str, Any]:
+        """The session's summary state, created if needed (caller holds the lock)."""
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = {
+                "summary": "",
+                "window": deque(maxlen=self.recent_messages),
+                "pending": [],
+                "refreshing": False
+            }
+            self._sessions[session_id] = state
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(session_id)
+        return state
+
+    def _push(self, state: Dict[str, Any], role: str, content: str):
+        """Add a message to the window, moving the oldest to pending (caller holds the lock)."""
+        window = state["window"]
+        if len(window) == window.maxlen:
+            state["pending"].append(window.popleft())
+            overflow = len(state["pending"]) - self.max_pending
+            if overflow > 0:
+                # Summarizer is failing or unavailable; forget the oldest
+                del state["pending"][:overflow]
+                self.dropped_messages += overflow
+        window.append({"role": role, "content": content})
+
+    def _claim_refresh(self, state: Dict[str, Any], ready: bool) -> bool:
+        """Mark the session as refreshing if a batch is waiting (caller holds the lock)."""
+        refresh = ready and len(state["pending"]) >= self.summary_batch and not state["refreshing"]
+        if refresh:
+            state["refreshing"] = True
+        return refresh
+
+    def record(self, session_id: str, role: str, content: str):
+        """
+        Note a message added to the session's history.
+
+        Messages pushed out of the verbatim window are queued for the
+        summary; a background refresh starts once a batch has collected.
+        """
+        ready = self._can_summarize()
+        with self._lock:
+            state = self._state(session_id)
+            self._push(state, role, content)
+            refresh = self._claim_refresh(state, ready)
+
+        if refresh:
+            self._schedule(session_id)
+
+    def history_limit(self, session_id: str) -> int:
+        """How many recent messages build() can use verbatim for the session."""
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                return self.recent_messages
+            return max(self.recent_messages, len(state["window"]) + len(state["pending"]))
+
+    def summary(self, session_id: str) -> str:
+        with self._lock:
+            state = self._sessions.get(session_id)
+            return state["summary"] if state else ""
+
+    def clear(self, session_id: str):
+        """Forget the session's summary and pending messages."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def needs_seed(self, session_id: str) -> bool:
+        """True if seed() would load the session's persisted history."""
+        with self._lock:
+            return self.history_source is not None and session_id not in self._sessions
+
+    def seed(self, session_id: str):
+        """
+        Load a session the builder doesn't know from the persisted history.
+
+        Blocking (the history source may query the database); build()
+        calls it, async callers should run it in a thread first.
+        """
+        if not self.needs_seed(session_id):
+            return
+        try:
+            messages = self.history_source(session_id, self.max_pending + self.recent_messages)
+        except Exception as e:
+            # Start the session empty rather than retrying on every build
+            logger.warning(f"Could not load history for {session_id} to seed its summary: {e}")
+            messages = None
+
+        ready = self._can_summarize()
+        with self._lock:
+            if session_id in self._sessions:  # recorded or seeded meanwhile
+                return
+            state = self._state(session_id)
+            for message in messages or []:
+                self._push(state, message["role"], message["content"])
+            self.seeded_sessions += messages is not None
+            refresh = self._claim_refresh(state, ready)
+
+        if refresh:
+            self._schedule(session_id)
+
+    # Building
+
+    def build(
+        self,
+        session_id: Optional[str],
+        user_message: str,
+        context: str = "",
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Assemble a reply prompt within the budget.
+
+        The system prompt and the current message are always included;
+        the summary and then recent messages (newest first) fill what is
+        left. A newest message too long for the remaining budget is cut.
+
+        Args:
+            session_id: Conversation the message belongs to (None: no summary)
+            user_message: What the user said
+            context: Formatted command context, if any
+            history: Recent messages, oldest first
+
+        Returns:
+            Dict with prompt, system_prompt (pass both to the client),
+            tokens, messages, omitted_messages and summary_used
+        """
+        if session_id is not None:
+            self.seed(session_id)
+        system_prompt = BUDDY_SYSTEM_PROMPT.format(name=JARVIS_NAME)
+        current = f"{context}\n\nUser: {user_message}" if context else user_message
+        # GeminiClient wraps the prompt as "<system>\n\nUser: <prompt>\n\n<name>:"
+        fixed = estimate_tokens(f"{system_prompt}\n\nUser: {current}\n\n{JARVIS_NAME}:")
+        remaining = self.budget_tokens - fixed
+
+        summary = self.summary(session_id) if session_id is not None else ""
+        summary_text = ""
+        if summary and remaining > _MIN_MESSAGE_TOKENS:
+            limit = min(remaining, self.summary_max_tokens) * CHARS_PER_TOKEN
+            summary_text = f"Summary of earlier conversation: {summary[:limit]}\n\n"
+            remaining -= estimate_tokens(summary_text)
+
+        history = history or []
+        lines: List[str] = []
+        truncated = 0
+        if history:
+            remaining -= estimate_tokens("Previous conversation:\n\n\nCurrent message: ")
+        for message in reversed(history):
+            line = f"{_speaker(message)}: {message['content']}"
+            cost = estimate_tokens(line) + 1
+            if cost <= remaining:
+                lines.append(line)
+                remaining -= cost
+                continue
+            if not lines and remaining > _MIN_MESSAGE_TOKENS:
+                lines.append(line[:(remaining - 1) * CHARS_PER_TOKEN - 3] + "...")
+                truncated = 1
+            break
+        lines.reverse()
+
+        prompt = current
+        if lines:
+            prompt = "Previous conversation:\n" + "\n".join(lines) + f"\n\nCurrent message: {prompt}"
+        prompt = summary_text + prompt
+
+        tokens = estimate_tokens(f"{system_prompt}\n\nUser: {prompt}\n\n{JARVIS_NAME}:")
+        omitted = len(history) - len(lines)
+        with self._lock:
+            self.prompts += 1
+            self.total_tokens += tokens
+            self.max_tokens = max(self.max_tokens, tokens)
+            self.over_budget += tokens > self.budget_tokens
+            self.truncated_messages += truncated
+            self.omitted_messages += omitted
+
+        return {
+            "prompt": prompt,
+            "system_prompt": system_prompt,
+            "tokens": tokens,
+            "messages": len(lines),
+            "omitted_messages": omitted,
+            "summary_used": bool(summary_text)
+        }
+
+    def observe(self, built: Dict[str, Any], elapsed_ms: float):
+        """Record the LLM latency of a call made with a built prompt."""
+        self._latency[_size_bucket(built["tokens"])].observe(elapsed_ms)
+        logger.debug(
+            f"Reply prompt ~{built['tokens']} tokens ({built['messages']} messages"
+            f"{', summary' if built['summary_used'] else ''}) answered in {elapsed_ms:.0f} ms"
+        )
+
+    # Summaries
+
+    def _can_summarize(self) -> bool:
+        """False while the client is offline or its circuit breaker is open."""
+        if not self.client.is_available():
+            return False
+        breaker = getattr(self.client, "breaker", None)
+        return breaker is None or breaker.state != OPEN
+
+    def _schedule(self, session_id: str):
+        if not self.background:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._summary_loop, name="prompt-summarizer", daemon=True)
+                self._worker.start()
+        self._jobs.put(session_id)
+
+    def _summary_loop(self):
+        while True:
+            session_id = self._jobs.get()
+            if session_id is None:
+                return
+            try:
+                self.refresh(session_id)
+            except Exception as e:
+                logger.error(f"Summary refresh for {session_id} failed: {e}")
+
+    def refresh(self, session_id: str) -> bool:
+        """
+        Fold the session's pending messages into its summary (one LLM call).
+
+        Returns:
+            True if the summary was updated
+        """
+        ready = self._can_summarize()
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                return False
+            batch = list(state["pending"])
+            previous = state["summary"]
+            if not batch:
+                state["refreshing"] = False
+                return False
+            if not ready:
+                # Left pending; the next recorded message retries
+                state["refreshing"] = False
+                self.skipped_summaries += 1
+                return False
+
+        transcript = "\n".join(f"{_speaker(message)}: {message['content']}" for message in batch)
+        prompt = (
+            f"Summary so far: {previous or '(none)'}\n\n"
+            f"New messages:\n{transcript}\n\n"
+            f"Write the updated summary in at most {self.summary_max_tokens * 3 // 4} words."
+        )
+        summary = self.client.complete(
+            prompt, system_prompt=SUMMARY_INSTRUCTIONS, temperature=0.2, call_site="summary"
+        )
+
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:  # cleared or evicted meanwhile
+                return False
+            state["refreshing"] = False
+            if not summary:
+                self.failed_summaries += 1
+                return False
+            folded = {id(message) for message in batch}
+            state["pending"] = [message for message in state["pending"] if id(message) not in folded]
+            state["summary"] = summary.strip()[:self.summary_max_tokens * CHARS_PER_TOKEN]
+            self.summaries += 1
+            refresh = self._claim_refresh(state, True)
+
+        if refresh:
+            self._schedule(session_id)
+        return True
+
+    def stop(self):
+        """Stop the background summarizer."""
+        if self._worker is not None:
+            self._jobs.put(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Prompt sizes, summary counters and LLM latency per prompt-size bucket."""
+        with self._lock:
+            stats = {
+                "budget_tokens": self.budget_tokens,
+                "prompts": self.prompts,
+                "mean_tokens": round(self.total_tokens / self.prompts, 1) if self.prompts else 0.0,
+                "max_tokens": self.max_tokens,
+                "over_budget": self.over_budget,
+                "truncated_messages": self.truncated_messages,
+                "omitted_messages": self.omitted_messages,
+                "sessions": len(self._sessions),
+                "summaries": self.summaries,
+                "failed_summaries": self.failed_summaries,
+                "skipped_summaries": self.skipped_summaries,
+                "dropped_messages": self.dropped_messages,
+                "seeded_sessions": self.seeded_sessions
+            }
+        stats["latency_by_size"] = {
+            bucket: histogram.snapshot()
+            for bucket, histogram in self._latency.items()
+            if histogram.count
+        }
+        return stats
+
+# Global instance
+prompt_builder = PromptBuilder(history_source=conversation_store.history)
@@ -0,0 +1,174 @@
+"""
+Command scheduler - bounded, prioritized execution of commands.
+
+Every command from the phone API, /ask and the voice loop goes through
+one scheduler on the shared event loop. At most SCHEDULER_WORKERS jobs
+run at once; waiting jobs are ordered by priority class
+
+    device control (app launch, browser, system, typing)  >  file  >  chat
+
+and, within a class, round-robin across sources so one chatty client
+cannot starve another. SCHEDULER_RESERVED_SLOTS of the workers are kept
+for device control, so a few slow chat replies can never hold every
+slot while an urgent "mute" waits.
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from jarvis.api.rate_limiter import request_source
+from jarvis.config.settings import SCHEDULER_WORKERS, SCHEDULER_RESERVED_SLOTS
+from jarvis.utils.metrics import LatencyHistogram
+from jarvis.utils.text_parsing import parse_command
+
+T = TypeVar("T")
+
+PRIORITY_DEVICE = 0
+PRIORITY_FILE = 1
+PRIORITY_CHAT = 2
+PRIORITY_NAMES = {PRIORITY_DEVICE: "device", PRIORITY_FILE: "file", PRIORITY_CHAT: "chat"}
+
+_COMMAND_PRIORITIES = {
+    "app_launch": PRIORITY_DEVICE,
+    "browser": PRIORITY_DEVICE,
+    "system": PRIORITY_DEVICE,
+    "typing": PRIORITY_DEVICE,
+    "file": PRIORITY_FILE,
+}
+
+def classify(text: str) -> int:
+    """Priority class of a raw command (chat for anything unrecognized)."""
+    return _COMMAND_PRIORITIES.get(parse_command(text or "")["type"], PRIORITY_CHAT)
+
+class CommandScheduler:
+    """
+    Priority/fair-queuing admission control for async jobs.
+
+    All methods must be called on the event loop that runs the jobs
+    (the shared async_runtime loop), so no locking is needed.
+    """
+
+    def __init__(self, workers: int = SCHEDULER_WORKERS, reserved: int = SCHEDULER_RESERVED_SLOTS):
+        self.workers = max(1, workers)
+        self.reserved = min(max(0, reserved), self.workers - 1)
+        self._running = 0
+        # priority -> source -> waiters; OrderedDict order is the round-robin turn
+        self._queues: Dict[int, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            priority: OrderedDict() for priority in PRIORITY_NAMES
+        }
+        self._wait = {priority: LatencyHistogram() for priority in PRIORITY_NAMES}
+        self._executed = {priority: 0 for priority in PRIORITY_NAMES}
+        self._max_depth = 0
+
+    async def run(self, source: str, priority: int, job: Callable[[], Awaitable[T]]) -> T:
+        """
+        Wait for a worker slot, then run job().
+
+        Args:
+            source: Who submitted the job ('voice', 'phone', 'api', ...)
+            priority: PRIORITY_DEVICE, PRIORITY_FILE or PRIORITY_CHAT
+            job: Coroutine function to run once admitted
+        """
+        await self._acquire(source, priority)
+        # LLM calls made by the job queue under its source
+        token = request_source.set(source)
+        try:
+            return await job()
+        finally:
+            request_source.reset(token)
+            self._release()
+
+    async def stream(self, source: str, priority: int, job: Callable[[], AsyncIterator[T]]) -> AsyncIterator[T]:
+        """Like run(), for a streaming job; the slot is held until the stream ends."""
+        await self._acquire(source, priority)
+        # Not reset: an async generator may be finalized in another context
+        request_source.set(source)
+        try:
+            async for item in job():
+                yield item
+        finally:
+            self._release()
+
+    async def _acquire(self, source: str, priority: int):
+        """Queue for a worker slot and wait until it is handed over."""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._queues[priority].setdefault(source, deque()).append(waiter)
+        self._max_depth = max(self._max_depth, self.depth())
+        enqueued_at = loop.time()
+        self._dispatch()
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release()  # admitted, but cancelled before starting
+            raise
+
+        self._wait[priority].observe((loop.time() - enqueued_at) * 1000)
+        self._executed[priority] += 1
+
+    def _release(self):
+        self._running -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit waiting jobs while there are free (and allowed) slots."""
+        while True:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            self._running += 1
+            waiter.set_result(None)
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        for priority, sources in self._queues.items():
+            limit = self.workers if priority == PRIORITY_DEVICE else self.workers - self.reserved
+            if self._running >= limit:
+                continue
+            while sources:
+                source, waiters = next(iter(sources.items()))
+                waiter = waiters.popleft()
+                # Rotate: this source goes to the back of its class
+                del sources[source]
+                if waiters:
+                    sources[source] = waiters
+                if not waiter.cancelled():
+                    return waiter
+        return None
+
+    def depth(self) -> int:
+        """Jobs waiting for a slot."""
+        return sum(
+            len(waiters) for sources in self._queues.values() for waiters in sources.values()
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Running/queued counts and wait-time histograms per priority class."""
+        return {
+            "workers": self.workers,
+            "reserved_for_device": self.reserved,
+            "running": self._running,
+            "queued": self.depth(),
+            "max_queued": self._max_depth,
+            "classes": {
+                name: {
+                    "queued": sum(len(waiters) for waiters in self._queues[priority].values()),
+                    "executed": self._executed[priority],
+                    "wait": self._wait[priority].snapshot()
+                }
+                for priority, name in PRIORITY_NAMES.items()
+            }
+        }
+
+    async def run_command(self, text: str, source: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Schedule a command for the command router by its priority class."""
+        from jarvis.core.command_router import command_router
+        return await self.run(
+            source, classify(text),
+            lambda: command_router.handle_command_async(text, source, session_id)
+        )
+
+# Global instance
+command_scheduler = CommandScheduler()
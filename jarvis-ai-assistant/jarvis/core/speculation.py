@@ -0,0 +1,92 @@
+"""
+Speculative response generation.
+
+For commands whose reply is phrased by the LLM, the phrasing request is
+started at the same time as the automation call instead of after it.
+One request is started per outcome that could need phrasing (success
+and/or failure); once the action finishes, the matching one is awaited
+and the others are cancelled. Stats record, per command type, how much
+wall-clock time overlapping the two saved.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from jarvis.utils.metrics import LatencyHistogram
+
+async def _timed(awaitable: Awaitable[str]) -> Tuple[str, float]:
+    start = time.perf_counter()
+    response = await awaitable
+    return response, (time.perf_counter() - start) * 1000
+
+class Speculation:
+    """In-flight phrasing requests for one command, one per outcome."""
+
+    def __init__(self, phrase: Callable[[bool], Awaitable[str]], outcomes: Iterable[bool]):
+        self.started_at = time.perf_counter()
+        self._tasks = {
+            success: asyncio.create_task(_timed(phrase(success)))
+            for success in outcomes
+        }
+
+    async def resolve(self, success: Optional[bool]) -> Optional[Tuple[str, float]]:
+        """
+        Keep the request for the actual outcome and cancel the rest.
+
+        Args:
+            success: The action's outcome, or None if no phrasing is needed
+
+        Returns:
+            (response, llm_ms) of the matching request, or None if that
+            outcome was not speculated on
+        """
+        chosen = self._tasks.pop(success, None) if success is not None else None
+        self.cancel()
+        return await chosen if chosen else None
+
+    def cancel(self):
+        """Cancel every request still pending."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+class SpeculationStats:
+    """Per command type: speculations used/wasted and time saved."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._types: Dict[str, Dict[str, Any]] = {}
+
+    def _entry(self, command_type: str) -> Dict[str, Any]:
+        # Caller holds the lock
+        return self._types.setdefault(command_type, {
+            "used": 0, "wasted": 0, "saved_ms_total": 0.0, "saved": LatencyHistogram()
+        })
+
+    def record_used(self, command_type: str, action_ms: float, llm_ms: float, wall_ms: float):
+        """A speculative reply was used: saved = sequential time - actual time."""
+        saved_ms = max(0.0, action_ms + llm_ms - wall_ms)
+        with self._lock:
+            entry = self._entry(command_type)
+            entry["used"] += 1
+            entry["saved_ms_total"] += saved_ms
+        entry["saved"].observe(saved_ms)
+
+    def record_wasted(self, command_type: str):
+        """A speculative reply was started but not needed."""
+        with self._lock:
+            self._entry(command_type)["wasted"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                command_type: {
+                    "used": entry["used"],
+                    "wasted": entry["wasted"],
+                    "saved_ms_total": round(entry["saved_ms_total"], 3),
+                    "saved_ms": entry["saved"].snapshot()
+                }
+                for command_type, entry in sorted(self._types.items())
+            }
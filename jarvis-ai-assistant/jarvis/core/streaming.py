@@ -0,0 +1,70 @@
+"""
+Streaming replies: sentence splitting and latency metrics.
+
+LLM output arrives as arbitrary text chunks. SentenceSplitter turns them
+into complete sentences as early as possible, so the first sentence can
+be spoken (or sent to an /ask client) while the rest is still being
+generated.
+
+A command that wants its reply streamed sets `speech_sink` to a callback
+for the duration of the command; handlers that can stream (chat) hand it
+each sentence as soon as it is complete instead of returning the reply
+in one piece.
+"""
+
+import re
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, List, Optional
+
+from jarvis.utils.metrics import LatencyHistogram
+
+# Per-command destination for streamed sentences (None: don't stream)
+speech_sink: ContextVar[Optional[Callable[[str], None]]] = ContextVar("speech_sink", default=None)
+
+# Command received -> first sentence starts playing (voice loop)
+time_to_first_audio = LatencyHistogram()
+# Request received -> first sentence sent (/ask with stream=true)
+time_to_first_chunk = LatencyHistogram()
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed
+# by whitespace, or a line break
+_BOUNDARY = re.compile(r'[.!?…]+["\')\]]*\s+|\n+')
+# Short tokens whose trailing period does not end a sentence
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e", "no"}
+
+class SentenceSplitter:
+    """Incrementally split streamed text into sentences."""
+
+    def __init__(self, min_chars: int = 2):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add a chunk; return the sentences it completed."""
+        self._buffer += chunk
+        sentences = []
+        start = 0
+        for match in _BOUNDARY.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            last_word = candidate.rsplit(None, 1)[-1].rstrip(".").lower() if candidate else ""
+            if len(candidate) < self.min_chars or last_word in _ABBREVIATIONS:
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is left once the stream has ended."""
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
+
+async def stream_sentences(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Re-chunk a text stream into complete sentences."""
+    splitter = SentenceSplitter()
+    async for chunk in chunks:
+        for sentence in splitter.feed(chunk):
+            yield sentence
+    rest = splitter.flush()
+    if rest:
+        yield rest
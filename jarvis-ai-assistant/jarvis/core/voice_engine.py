@@ -24,6 +24,10 @@ class VoiceEngine:
         self.speaking = False
         self._mic_calibrated = False
         self._mic_available = False
+        # Sentences waiting to be spoken, in order, by one worker thread
+        self._speech_queue: "queue.Queue" = queue.Queue()
+        self._speech_worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
         self._init_tts()
         
     def _init_tts(self):
@@ -166,6 +170,39 @@ class VoiceEngine:
         """Non-blocking speak."""
         return self.speak(text, block=False)
     
+    def enqueue_speech(self, text: str, on_start: Optional[Callable[[], None]] = None):
+        """
+        Queue text to be spoken after everything queued before it.
+        
+        Args:
+            text: Text (typically one sentence) to speak
+            on_start: Called on the speech thread right before it is spoken
+        """
+        with self._worker_lock:
+            if self._speech_worker is None or not self._speech_worker.is_alive():
+                self._speech_worker = threading.Thread(
+                    target=self._speech_loop, name="jarvis-tts", daemon=True
+                )
+                self._speech_worker.start()
+        self._speech_queue.put((text, on_start))
+    
+    def _speech_loop(self):
+        while True:
+            item = self._speech_queue.get()
+            if item is None:
+                return
+            text, on_start = item
+            if on_start is not None:
+                try:
+                    on_start()
+                except Exception as e:
+                    logger.error(f"Speech start callback failed: {e}")
+            self.speak(text, block=True)
+    
+    def pending_speech(self) -> int:
+        """Number of queued sentences not yet started."""
+        return self._speech_queue.qsize()
+    
     def is_speaking(self) -> bool:
         """Check if currently speaking."""
         return self.speaking
@@ -208,6 +245,8 @@ class VoiceEngine:
     
     def stop(self):
         """Clean up resources."""
+        if self._speech_worker is not None:
+            self._speech_queue.put(None)
         if self.tts_engine:
             try:
                 self.tts_engine.stop()
@@ -2,15 +2,23 @@
 Database manager for JARVIS operations.
 """
 
-from typing import Optional, List, Dict, Any
+import threading
+from typing import Optional, List, Dict, Any, Iterator
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 from loguru import logger
+from sqlalchemy import func, insert, delete, select
 
+from jarvis.config.settings import (
+    COMMAND_LOG_WRITE_BEHIND, COMMAND_LOG_BATCH_SIZE, COMMAND_LOG_FLUSH_INTERVAL,
+    COMMAND_LOG_BUFFER_SIZE, COMMAND_LOG_OVERFLOW,
+    CONVERSATION_BUFFER_SIZE, CONVERSATION_WRITE_BEHIND, CONVERSATION_FLUSH_INTERVAL
+)
 from jarvis.database.models import (
     SessionLocal, CommandHistory, UserPreference, 
     ConversationContext, init_db
 )
+from jarvis.database.write_behind import WriteBehindBuffer
 
 @contextmanager
 def get_db():
@@ -31,6 +39,32 @@ class DatabaseManager:
     
     def __init__(self):
         init_db()
+        
+        # Command ids are handed out in-process so log_command can return
+        # one without waiting for the insert (assumes a single writer
+        # process per database)
+        with get_db() as db:
+            self._last_command_id = db.query(func.max(CommandHistory.id)).scalar() or 0
+        self._id_lock = threading.Lock()
+        
+        self.command_log = WriteBehindBuffer(
+            self._insert_commands,
+            max_batch=COMMAND_LOG_BATCH_SIZE,
+            flush_interval=COMMAND_LOG_FLUSH_INTERVAL,
+            capacity=COMMAND_LOG_BUFFER_SIZE,
+            overflow_policy=COMMAND_LOG_OVERFLOW,
+            name="command-log-writer"
+        ) if COMMAND_LOG_WRITE_BEHIND else None
+        
+        self.conversation_log = WriteBehindBuffer(
+            self._insert_conversation,
+            max_batch=COMMAND_LOG_BATCH_SIZE,
+            flush_interval=CONVERSATION_FLUSH_INTERVAL,
+            capacity=COMMAND_LOG_BUFFER_SIZE,
+            overflow_policy=COMMAND_LOG_OVERFLOW,
+            name="conversation-writer"
+        ) if CONVERSATION_WRITE_BEHIND else None
+        
         logger.info("Database initialized")
     
     def log_command(
@@ -42,24 +76,63 @@ class DatabaseManager:
         error_message: Optional[str] = None,
         response_text: Optional[str] = None
     ) -> int:
-        """Log a command to history."""
+        """
+        Log a command to history.
+        
+        With write-behind enabled the row is only queued here; it is
+        inserted by the background writer within COMMAND_LOG_FLUSH_INTERVAL.
+        
+        Returns:
+            The id the row is (or will be) stored under
+        """
+        with self._id_lock:
+            self._last_command_id += 1
+            command_id = self._last_command_id
+        
+        row = {
+            "id": command_id,
+            "timestamp": datetime.utcnow(),
+            "source": source,
+            "raw_text": raw_text,
+            "action_type": action_type,
+            "success": success,
+            "error_message": error_message,
+            "response_text": response_text
+        }
+        if self.command_log is not None:
+            self.command_log.put(row)
+        else:
+            self._insert_commands([row])
+        
+        logger.debug(f"Logged command {command_id}: {action_type}")
+        return command_id
+    
+    def _insert_commands(self, rows: List[Dict[str, Any]]):
+        """Insert command history rows in one multi-row statement."""
         with get_db() as db:
-            entry = CommandHistory(
-                source=source,
-                raw_text=raw_text,
-                action_type=action_type,
-                success=success,
-                error_message=error_message,
-                response_text=response_text
-            )
-            db.add(entry)
-            db.flush()
-            command_id = entry.id
-            logger.debug(f"Logged command {command_id}: {action_type}")
-            return command_id
+            db.execute(insert(CommandHistory), rows)
+    
+    def flush_command_log(self):
+        """Write any queued command history rows now."""
+        if self.command_log is not None:
+            self.command_log.flush()
+    
+    def get_command_log_stats(self) -> Dict[str, Any]:
+        """Write-behind queue depth and counters."""
+        if self.command_log is None:
+            return {"write_behind": False}
+        return {"write_behind": True, **self.command_log.stats()}
+    
+    def close(self):
+        """Flush queued writes and stop the background writers."""
+        if self.command_log is not None:
+            self.command_log.close()
+        if self.conversation_log is not None:
+            self.conversation_log.close()
     
     def get_recent_commands(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent command history."""
+        self.flush_command_log()
         with get_db() as db:
             commands = db.query(CommandHistory).order_by(
                 CommandHistory.timestamp.desc()
@@ -77,8 +150,33 @@ class DatabaseManager:
                 for c in commands
             ]
     
+    def iter_command_history(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every command history row, oldest first.
+
+        Rows are fetched from SQLite batch_size at a time, so the whole
+        table is never loaded into memory.
+        """
+        self.flush_command_log()
+        with get_db() as db:
+            rows = db.query(
+                CommandHistory.id,
+                CommandHistory.raw_text,
+                CommandHistory.action_type,
+                CommandHistory.success
+            ).order_by(CommandHistory.id).yield_per(batch_size)
+            
+            for row in rows:
+                yield {
+                    "id": row.id,
+                    "raw_text": row.raw_text,
+                    "action_type": row.action_type,
+                    "success": row.success
+                }
+    
     def get_command_stats(self) -> Dict[str, Any]:
         """Get command statistics."""
+        self.flush_command_log()
         with get_db() as db:
             total = db.query(CommandHistory).count()
             successful = db.query(CommandHistory).filter(
@@ -122,29 +220,57 @@ class DatabaseManager:
             return pref.value if pref else default
     
     def add_conversation_message(self, role: str, content: str, session_id: str = 'default'):
-        """Add a message to conversation context."""
+        """
+        Add a message to conversation context.
+        
+        With write-behind enabled the message is only queued here; it is
+        written (and the session trimmed to its last CONVERSATION_BUFFER_SIZE
+        messages) by the background writer.
+        """
+        row = {
+            "timestamp": datetime.utcnow(),
+            "role": role,
+            "content": content,
+            "session_id": session_id
+        }
+        if self.conversation_log is not None:
+            self.conversation_log.put(row)
+        else:
+            self._insert_conversation([row])
+    
+    def _insert_conversation(self, rows: List[Dict[str, Any]]):
+        """Insert conversation rows and trim each touched session, in one transaction."""
         with get_db() as db:
-            msg = ConversationContext(
-                role=role,
-                content=content,
-                session_id=session_id
-            )
-            db.add(msg)
-            
-            # Keep only last 20 messages per session
-            old_msgs = db.query(ConversationContext).filter(
-                ConversationContext.session_id == session_id
-            ).order_by(ConversationContext.timestamp.desc()).offset(20).all()
-            
-            for old in old_msgs:
-                db.delete(old)
+            db.execute(insert(ConversationContext), rows)
+            for session_id in {row["session_id"] for row in rows}:
+                keep = select(ConversationContext.id).where(
+                    ConversationContext.session_id == session_id
+                ).order_by(ConversationContext.id.desc()).limit(CONVERSATION_BUFFER_SIZE)
+                db.execute(
+                    delete(ConversationContext).where(
+                        ConversationContext.session_id == session_id,
+                        ConversationContext.id.not_in(keep.scalar_subquery())
+                    ).execution_options(synchronize_session=False)
+                )
+    
+    def flush_conversation_log(self):
+        """Write any queued conversation messages now."""
+        if self.conversation_log is not None:
+            self.conversation_log.flush()
+    
+    def get_conversation_log_stats(self) -> Dict[str, Any]:
+        """Conversation write-behind queue depth and counters."""
+        if self.conversation_log is None:
+            return {"write_behind": False}
+        return {"write_behind": True, **self.conversation_log.stats()}
     
     def get_conversation_history(self, session_id: str = 'default', limit: int = 10) -> List[Dict[str, str]]:
         """Get recent conversation history."""
+        self.flush_conversation_log()
         with get_db() as db:
             msgs = db.query(ConversationContext).filter(
                 ConversationContext.session_id == session_id
-            ).order_by(ConversationContext.timestamp.desc()).limit(limit).all()
+            ).order_by(ConversationContext.timestamp.desc(), ConversationContext.id.desc()).limit(limit).all()
             
             return [
                 {"role": m.role, "content": m.content}
@@ -153,6 +279,7 @@ class DatabaseManager:
     
     def clear_conversation_history(self, session_id: str = 'default'):
         """Clear conversation history for a session."""
+        self.flush_conversation_log()
         with get_db() as db:
             db.query(ConversationContext).filter(
                 ConversationContext.session_id == session_id
@@ -0,0 +1,172 @@
+"""
+Write-behind buffer for high-frequency database inserts.
+
+Callers enqueue rows and return immediately; a background writer thread
+hands them to a flush function in batches, either when max_batch rows
+are waiting or every flush_interval seconds, whichever comes first. The
+buffer is bounded; what happens when it is full is set by the overflow
+policy:
+
+    block        wait (up to block_timeout) for the writer to make room,
+                 then fall back to a synchronous write
+    drop_oldest  discard the oldest queued row to make room (counted)
+    sync         write the new row synchronously in the caller's thread
+"""
+
+import atexit
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List
+
+from loguru import logger
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "sync")
+
+class WriteBehindBuffer:
+    """Bounded queue drained in batches by a background writer thread."""
+
+    def __init__(
+        self,
+        flush_fn: Callable[[List[Any]], None],
+        max_batch: int = 100,
+        flush_interval: float = 0.5,
+        capacity: int = 10000,
+        overflow_policy: str = "sync",
+        block_timeout: float = 1.0,
+        name: str = "write-behind"
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+
+        self.flush_fn = flush_fn
+        self.max_batch = max(1, max_batch)
+        self.flush_interval = flush_interval
+        self.capacity = max(1, capacity)
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.name = name
+
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        # Held for the whole pop-and-write of a batch, so flush() cannot
+        # return while the writer thread still holds rows it popped
+        self._write_lock = threading.Lock()
+        self._closed = False
+
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.sync_writes = 0
+        self.failed = 0
+        self.high_water = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, item: Any):
+        """Queue one row for writing."""
+        with self._cond:
+            if self._closed:
+                overflow = "sync"
+            elif len(self._queue) < self.capacity:
+                overflow = None
+            elif self.overflow_policy == "block":
+                overflow = None if self._cond.wait_for(
+                    lambda: len(self._queue) < self.capacity or self._closed,
+                    timeout=self.block_timeout
+                ) and not self._closed else "sync"
+            else:
+                overflow = self.overflow_policy
+
+            if overflow == "drop_oldest":
+                self._queue.popleft()
+                self.dropped += 1
+                overflow = None
+
+            if overflow is None:
+                self._queue.append(item)
+                self.enqueued += 1
+                self.high_water = max(self.high_water, len(self._queue))
+                if len(self._queue) >= self.max_batch:
+                    self._cond.notify_all()
+                return
+
+        # Synchronous fallback, outside the queue lock
+        with self._write_lock:
+            self.sync_writes += 1
+            self._write([item])
+
+    def _take_batch(self) -> List[Any]:
+        # Caller holds self._cond
+        batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+        if batch:
+            self._cond.notify_all()  # wake writers blocked on a full buffer
+        return batch
+
+    def _write(self, batch: List[Any]):
+        # Caller holds self._write_lock
+        try:
+            self.flush_fn(batch)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"{self.name}: failed to write {len(batch)} rows: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._queue) >= self.max_batch or self._closed,
+                    timeout=self.flush_interval
+                )
+                if self._closed and not self._queue:
+                    return
+            with self._write_lock:
+                with self._cond:
+                    batch = self._take_batch()
+                if batch:
+                    self._write(batch)
+
+    def flush(self):
+        """Write everything queued so far before returning."""
+        with self._write_lock:
+            while True:
+                with self._cond:
+                    batch = self._take_batch()
+                if not batch:
+                    return
+                self._write(batch)
+
+    def close(self, timeout: float = 5.0):
+        """Flush remaining rows and stop the writer thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self.flush()
+        atexit.unregister(self.close)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and write counters."""
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "capacity": self.capacity,
+                "high_water": self.high_water,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "sync_writes": self.sync_writes,
+                "failed": self.failed,
+                "overflow_policy": self.overflow_policy
+            }
@@ -8,7 +8,6 @@ Desktop + Mobile voice-controlled assistant with buddy personality.
 import sys
 import time
 import signal
-import threading
 from pathlib import Path
 
 # Add parent to path for imports
@@ -18,9 +17,16 @@ from jarvis.config.logging_config import setup_logging
 from jarvis.config.settings import WAKE_PHRASE, JARVIS_NAME, FLASK_PORT
 from jarvis.core.voice_engine import voice_engine
 from jarvis.core.command_router import command_router
+from jarvis.core.async_runtime import async_runtime
+from jarvis.core.scheduler import command_scheduler
+from jarvis.core.streaming import speech_sink, time_to_first_audio
+from jarvis.core.ack_engine import ack_engine
 from jarvis.core.ai_engine import ai_engine
+from jarvis.core.prompt_builder import prompt_builder
 from jarvis.api.flask_server import flask_server
 from jarvis.database.db_manager import db_manager
+from jarvis.api.response_cache import response_cache
+from jarvis.api.llm_telemetry import llm_telemetry
 
 from loguru import logger
 
@@ -61,7 +67,7 @@ class JARVIS:
         # Greeting
         greeting = self.ai.greet()
         logger.info(f"{JARVIS_NAME}: {greeting}")
-        self.voice.speak(greeting, block=False)
+        self.voice.enqueue_speech(greeting)
         
         # Start voice loop if enabled
         if self.voice_enabled:
@@ -104,20 +110,32 @@ class JARVIS:
         """Process a voice command."""
         logger.info(f"Processing: {text}")
         
-        # Route command
-        result = self.router.handle_command(text, source="voice")
-        
-        # Speak response
+        # Queue the command on the shared event loop, so the voice loop can go
+        # back to listening while slow commands are still running
+        utterance = _Utterance(self.voice, time.perf_counter())
+        future = async_runtime.submit(self._run_command(text, utterance))
+        future.add_done_callback(lambda done: self._on_command_done(done, utterance))
+    
+    async def _run_command(self, text: str, utterance: "_Utterance"):
+        # Chat replies are streamed sentence by sentence into the speech queue
+        token = speech_sink.set(utterance.say)
+        try:
+            return await command_scheduler.run_command(text, "voice")
+        finally:
+            speech_sink.reset(token)
+    
+    def _on_command_done(self, future, utterance: "_Utterance"):
+        """Queue a finished command's response for speech (unless it was streamed)."""
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Voice command failed: {e}")
+            return
+        if result.get("streamed"):
+            return
         response = result.get("spoken_response", "Done!")
         if response:
-            # Wait for any current speech to finish
-            while self.voice.is_speaking():
-                time.sleep(0.1)
-            
-            self.voice.speak(response, block=False)
-            
-            # Print to console too
-            print(f"[{JARVIS_NAME}]: {response}")
+            utterance.say(response)
     
     def shutdown(self):
         """Graceful shutdown."""
@@ -130,9 +148,36 @@ class JARVIS:
         # Stop Flask
         flask_server.stop()
         
+        # Stop the command event loop, then write out queued history
+        async_runtime.stop()
+        db_manager.close()
+        ack_engine.stop()
+        prompt_builder.stop()
+        response_cache.close()
+        llm_telemetry.stop()
+        
         logger.info("Goodbye!")
         sys.exit(0)
 
+class _Utterance:
+    """Spoken output of one voice command; records its time to first audio."""
+    
+    def __init__(self, voice, started_at: float):
+        self.voice = voice
+        self.started_at = started_at
+        self._first = True
+    
+    def say(self, sentence: str):
+        on_start = self._first_audio if self._first else None
+        self._first = False
+        print(f"[{JARVIS_NAME}]: {sentence}")
+        self.voice.enqueue_speech(sentence, on_start=on_start)
+    
+    def _first_audio(self):
+        elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+        time_to_first_audio.observe(elapsed_ms)
+        logger.debug(f"Time to first audio: {elapsed_ms:.0f} ms")
+
 def main():
     """Entry point."""
     # Setup logging first
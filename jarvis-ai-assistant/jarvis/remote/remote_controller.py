@@ -3,10 +3,11 @@ Remote controller - shared logic for handling remote commands.
 Acts as bridge between API and command router.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from loguru import logger
 
-from jarvis.core.command_router import command_router
+from jarvis.core.async_runtime import async_runtime
+from jarvis.core.scheduler import command_scheduler
 from jarvis.remote.typing_controller import typing_controller
 
 class RemoteController:
@@ -18,20 +19,23 @@ class RemoteController:
     def __init__(self):
         self.typing_controller = typing_controller
     
-    def handle_remote_command(self, command_text: str) -> Dict[str, Any]:
+    def handle_remote_command(self, command_text: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Handle a command from remote source.
         
         Args:
             command_text: Command string from remote device
+            session_id: Device/session id, so confirmations stay per device
             
         Returns:
             Response dict with status and message
         """
         logger.info(f"Remote command received: {command_text}")
         
-        # Use the same router as voice commands
-        result = command_router.handle_command(command_text, source="phone")
+        # Same router as voice commands, queued by priority with them
+        result = async_runtime.run(
+            command_scheduler.run_command(command_text, "phone", session_id)
+        )
         
         return {
             "success": result.get("success", False),
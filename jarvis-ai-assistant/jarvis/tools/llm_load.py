@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Offline load test of the chat path against the local LLM stand-in.
+
+Builds the real stack (command router -> AI engine -> GeminiClient with
+retries and circuit breaker) on top of LocalBackend, then has
+--clients concurrent clients send --requests chat commands each. Reports
+end-to-end latency percentiles, throughput and how many replies were
+fallbacks. No network access is needed; commands are logged to the
+command history with source "loadtest".
+
+Usage:
+    python -m jarvis.tools.llm_load [--clients 8] [--requests 20]
+        [--latency-ms 400] [--jitter-ms 150] [--distribution lognormal]
+        [--error-rate 0.05] [--rpm 60] [--max-concurrent 4] [--mode router|ask]
+        [--output summary.json]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from jarvis.api.gemini_client import GeminiClient
+from jarvis.api.llm_backend import LocalBackend
+from jarvis.api.rate_limiter import RateLimiter
+from jarvis.api.response_cache import ResponseCache
+from jarvis.config.settings import LLM_MAX_CONCURRENT
+from jarvis.core.ack_engine import AckEngine
+from jarvis.core.ai_engine import AIEngine
+from jarvis.core.command_router import CommandRouter
+from jarvis.utils.metrics import LatencyHistogram
+
+DEFAULT_PROMPTS = [
+    "tell me a joke",
+    "what should I cook tonight",
+    "explain black holes simply",
+    "how do I stay focused while working",
+    "recommend a good book",
+]
+
+async def run_load(
+    backend: LocalBackend,
+    clients: int = 8,
+    requests: int = 20,
+    mode: str = "router",
+    prompts: List[str] = DEFAULT_PROMPTS,
+    rpm: float = 0,
+    max_concurrent: int = LLM_MAX_CONCURRENT
+) -> Dict[str, Any]:
+    """
+    Drive concurrent chat traffic through the stack.
+
+    Args:
+        backend: LLM stand-in to run against
+        clients: Concurrent clients
+        requests: Requests per client
+        mode: 'router' (full command path) or 'ask' (AI engine only)
+        prompts: Messages the clients cycle through
+        rpm: Client-side rate limit in requests per minute (0 = unlimited)
+        max_concurrent: Client-side cap on outstanding LLM calls
+
+    Returns:
+        Summary dict with latency percentiles and counts
+    """
+    client = GeminiClient(
+        backend=backend,
+        cache=ResponseCache(path=None, enabled=False),
+        limiter=RateLimiter(rpm=rpm, max_concurrent=max_concurrent)
+    )
+    ai = AIEngine(client)
+    with tempfile.TemporaryDirectory() as tmp:
+        acks = AckEngine(client=client, path=Path(tmp) / "acks.json", enabled=False)
+        router = CommandRouter(ai=ai, acks=acks)
+        fallback = client._fallback_response(error=True)
+        latency = LatencyHistogram()
+        fallbacks = 0
+
+        async def one_client(index: int):
+            nonlocal fallbacks
+            for i in range(requests):
+                message = prompts[(index + i) % len(prompts)]
+                start = time.perf_counter()
+                if mode == "ask":
+                    reply = await ai.generate_reply_async(message, use_history=False)
+                else:
+                    result = await router.handle_command_async(
+                        message, source="loadtest", session_id=f"client-{index}"
+                    )
+                    reply = result.get("spoken_response")
+                latency.observe((time.perf_counter() - start) * 1000)
+                if reply == fallback:
+                    fallbacks += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_client(index) for index in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    total = clients * requests
+    return {
+        "mode": mode,
+        "requests": total,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(total / elapsed, 1) if elapsed else 0,
+        "fallback_replies": fallbacks,
+        "backend": backend.stats(),
+        "circuit": client.breaker.stats(),
+        "rate_limiter": client.limiter.stats(),
+        "latency_ms": latency.snapshot()
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test the chat path against a local LLM stand-in.")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--mode", choices=["router", "ask"], default="router")
+    parser.add_argument("--latency-ms", type=float, default=400)
+    parser.add_argument("--jitter-ms", type=float, default=150)
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=float, default=0, help="client-side rate limit (0 = unlimited)")
+    parser.add_argument("--max-concurrent", type=int, default=LLM_MAX_CONCURRENT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    backend = LocalBackend(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        distribution=args.distribution,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+    summary = asyncio.run(run_load(
+        backend, args.clients, args.requests, args.mode, rpm=args.rpm, max_concurrent=args.max_concurrent
+    ))
+
+    lat = summary["latency_ms"]
+    print(f"{summary['requests']} {summary['mode']} requests in {summary['elapsed_seconds']}s "
+          f"({summary['requests_per_second']} req/s)")
+    print(f"latency ms: p50 {lat['p50_ms']}  p95 {lat['p95_ms']}  p99 {lat['p99_ms']}  max {lat['max_ms']}")
+    print(f"fallback replies: {summary['fallback_replies']}  "
+          f"circuit: {summary['circuit']['state']} (opened {summary['circuit']['opens']}x)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
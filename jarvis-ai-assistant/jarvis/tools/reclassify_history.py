@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Re-classify stored command history with the current parser rules.
+
+Streams command_history.raw_text out of the SQLite database, runs it
+through parse_commands and reports the per-intent distribution plus how
+many rows would now be classified differently from the stored
+action_type.
+
+Usage:
+    python -m jarvis.tools.reclassify_history [--workers N] [--output summary.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from itertools import tee
+from typing import Any, Dict, Iterable
+
+from jarvis.utils.text_parsing import parse_commands
+
+def summarize(rows: Iterable[Dict[str, Any]], workers: int = 1, chunk_size: int = 1000) -> Dict[str, Any]:
+    """
+    Re-classify history rows and build a per-intent summary.
+
+    Args:
+        rows: Iterable of dicts with 'raw_text' and 'action_type'
+        workers: Worker processes for parse_commands
+        chunk_size: Commands per worker task
+
+    Returns:
+        Summary dict with intent counts and changed classifications
+    """
+    rows, texts_source = tee(rows)
+    texts = (row["raw_text"] for row in texts_source)
+
+    intents = Counter()
+    stored = Counter()
+    changes = Counter()
+    total = 0
+
+    start = time.perf_counter()
+    for row, parsed in zip(rows, parse_commands(texts, workers=workers, chunk_size=chunk_size)):
+        total += 1
+        stored_type = row["action_type"] or "none"
+        intents[parsed["type"]] += 1
+        stored[stored_type] += 1
+        if stored_type != parsed["type"]:
+            changes[f"{stored_type} -> {parsed['type']}"] += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "total_rows": total,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(total / elapsed) if elapsed else 0,
+        "intents": dict(intents.most_common()),
+        "stored_intents": dict(stored.most_common()),
+        "changed_rows": sum(changes.values()),
+        "changes": dict(changes.most_common())
+    }
+
+def _print_summary(summary: Dict[str, Any]):
+    total = summary["total_rows"] or 1
+    print(f"Re-classified {summary['total_rows']} rows in {summary['elapsed_seconds']}s "
+          f"({summary['rows_per_second']} rows/s)")
+    print()
+    print(f"{'intent':<14}{'rows':>10}{'share':>9}{'stored':>10}")
+    for intent in sorted(set(summary["intents"]) | set(summary["stored_intents"])):
+        count = summary["intents"].get(intent, 0)
+        print(f"{intent:<14}{count:>10}{count / total:>9.1%}"
+              f"{summary['stored_intents'].get(intent, 0):>10}")
+    print()
+    print(f"Changed classification: {summary['changed_rows']} rows")
+    for change, count in summary["changes"].items():
+        print(f"  {change:<30}{count:>8}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Re-classify command history with the current parser.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes (default: parse in-process)")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="rows per worker task and per database fetch")
+    parser.add_argument("--output", help="also write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    from jarvis.database.db_manager import db_manager
+
+    summary = summarize(
+        db_manager.iter_command_history(batch_size=args.chunk_size),
+        workers=args.workers,
+        chunk_size=args.chunk_size
+    )
+    _print_summary(summary)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Train and evaluate the local intent classifier from command history.
+
+Streams successful command_history rows (raw_text labelled with the
+action_type they were handled as), holds out a deterministic fraction
+for evaluation, reports accuracy and per-utterance classifier latency,
+then trains on every row and saves the model for the command router.
+
+Usage:
+    python -m jarvis.tools.train_intent_classifier [--holdout 0.2] [--dry-run]
+"""
+
+import argparse
+import sys
+import time
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from jarvis.config.settings import INTENT_CLASSIFIER_MODEL
+from jarvis.core.intent_classifier import IntentClassifier
+
+INTENTS = {"app_launch", "browser", "file", "system", "typing", "chat"}
+
+def _examples(rows: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, str]]:
+    for row in rows:
+        if row["success"] and row["action_type"] in INTENTS:
+            yield row["raw_text"], row["action_type"]
+
+def _in_holdout(text: str, holdout: float) -> bool:
+    # Hash-based split: stable across runs, and duplicates never straddle it
+    return zlib.crc32(text.encode("utf-8")) % 1000 < holdout * 1000
+
+def evaluate(model: IntentClassifier, examples: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Accuracy and per-utterance latency of a trained model.
+
+    Returns:
+        Dict with overall/per-label accuracy and latency percentiles (ms)
+    """
+    correct = Counter()
+    totals = Counter()
+    latencies = []
+
+    for text, label in examples:
+        start = time.perf_counter()
+        predicted, _ = model.predict(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+        totals[label] += 1
+        correct[label] += predicted == label
+
+    latencies.sort()
+    count = len(latencies)
+
+    def percentile(p: float) -> float:
+        return round(latencies[min(count - 1, int(p * count))], 4) if count else 0.0
+
+    return {
+        "examples": count,
+        "accuracy": round(sum(correct.values()) / count, 4) if count else 0.0,
+        "per_label": {
+            label: round(correct[label] / totals[label], 4) for label in sorted(totals)
+        },
+        "latency_ms": {
+            "mean": round(sum(latencies) / count, 4) if count else 0.0,
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "max": round(latencies[-1], 4) if count else 0.0
+        }
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Train the local intent classifier.")
+    parser.add_argument("--holdout", type=float, default=0.2,
+                        help="fraction of rows held out for evaluation")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="rows fetched from the database at a time")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="evaluate only, do not save the model")
+    args = parser.parse_args()
+
+    from jarvis.database.db_manager import db_manager
+
+    def stream():
+        return _examples(db_manager.iter_command_history(batch_size=args.batch_size))
+
+    # Pass 1: train on the training split, keep the (small) holdout split
+    model = IntentClassifier()
+    holdout = []
+
+    def training_split():
+        for text, label in stream():
+            if _in_holdout(text, args.holdout):
+                holdout.append((text, label))
+            else:
+                yield text, label
+
+    model.partial_fit(training_split())
+    if not model.labels:
+        print("No successful commands in history to train on.")
+        return 1
+    model.finalize()
+
+    report = evaluate(model, holdout)
+    print(f"Holdout examples: {report['examples']}")
+    print(f"Accuracy:         {report['accuracy']:.2%}")
+    for label, accuracy in report["per_label"].items():
+        print(f"  {label:<12}{accuracy:>8.2%}")
+    latency = report["latency_ms"]
+    print(f"Latency (ms):     mean {latency['mean']}  p50 {latency['p50']}  "
+          f"p95 {latency['p95']}  max {latency['max']}")
+
+    if args.dry_run:
+        return 0
+
+    # Pass 2: final model on every row
+    final = IntentClassifier().fit(stream())
+    final.save(INTENT_CLASSIFIER_MODEL)
+    print(f"Model saved to {INTENT_CLASSIFIER_MODEL} (labels: {', '.join(final.labels)})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Small in-process caching helpers: a thread-safe bounded LRU cache with
+optional TTL and hit/miss/eviction counters, plus read-only containers
+for values that are shared between callers.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class FrozenDict(dict):
+    """
+    A dict that refuses mutation.
+
+    Still a real dict subclass, so it serializes with json/jsonify and
+    compares equal to plain dicts with the same items.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenDict is read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists into read-only equivalents."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache.
+
+    Entries are evicted when the cache exceeds max_size, and (if ttl is
+    set) treated as missing once older than ttl seconds. All operations
+    hold a lock, so one instance can be shared across Flask threads.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_size = max_size
+        self.ttl = ttl or None
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, stored_at = entry
+            if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entries."""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove and return the value for key, or default on a miss."""
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, stored_at = entry
+            if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            return value
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,87 @@
+"""
+Lightweight in-process metrics: thread-safe latency histograms with
+fixed millisecond buckets, cheap enough to record on every command.
+"""
+
+import bisect
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+# Upper bounds (ms) of the histogram buckets; a final overflow bucket
+# catches everything slower
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+class LatencyHistogram:
+    """
+    Bucketed latency distribution.
+
+    Keeps exact count/sum/min/max plus bucket counts, so percentiles are
+    estimated from bucket upper bounds rather than stored samples and
+    memory stays constant however many observations are recorded.
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.bounds = tuple(sorted(buckets_ms))
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+
+    def observe(self, elapsed_ms: float):
+        """Record one duration in milliseconds."""
+        index = bisect.bisect_left(self.bounds, elapsed_ms)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+            if self.min_ms is None or elapsed_ms < self.min_ms:
+                self.min_ms = elapsed_ms
+            if self.max_ms is None or elapsed_ms > self.max_ms:
+                self.max_ms = elapsed_ms
+
+    def _percentile(self, fraction: float) -> float:
+        # Caller holds the lock
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index < len(self.bounds):
+                    return float(min(self.bounds[index], self.max_ms))
+                return float(self.max_ms)
+        return 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Count, mean, min/max and estimated p50/p95/p99 (all in ms)."""
+        with self._lock:
+            if not self.count:
+                return {"count": 0, "mean_ms": 0.0, "min_ms": 0.0, "max_ms": 0.0,
+                        "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "buckets": {}}
+            buckets = {
+                (f"le_{bound}" if index < len(self.bounds) else "overflow"): bucket_count
+                for index, (bound, bucket_count) in enumerate(
+                    zip(self.bounds + (None,), self._counts)
+                )
+                if bucket_count
+            }
+            return {
+                "count": self.count,
+                "mean_ms": round(self.total_ms / self.count, 3),
+                "min_ms": round(self.min_ms, 3),
+                "max_ms": round(self.max_ms, 3),
+                "p50_ms": round(self._percentile(0.5), 3),
+                "p95_ms": round(self._percentile(0.95), 3),
+                "p99_ms": round(self._percentile(0.99), 3),
+                "buckets": buckets
+            }
+
+    def reset(self):
+        """Forget all observations."""
+        with self._lock:
+            self._counts = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.total_ms = 0.0
+            self.min_ms = None
+            self.max_ms = None
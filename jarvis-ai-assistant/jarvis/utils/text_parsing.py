@@ -1,258 +1,601 @@
 """
 Text parsing utilities for natural language command extraction.
+
+All intent patterns are compiled once at import time. Each parser's
+alternatives are joined into a single ordered regex (alternation keeps
+declaration order, so the first alternative that matches still wins),
+and parse_command normalizes the input once before a single pass over
+the intent registry, which only tries intents whose trigger tokens
+appear in the text. Results for short, frequently repeated commands are
+memoized in a bounded LRU cache keyed on the normalized text; parse
+results are read-only so cached entries can be shared safely.
+
+Parsing cost is linear in the input length: typing payloads are
+extracted with string operations, the regex intents match against the
+text with whitespace runs squeezed (so their quantifiers cannot
+backtrack polynomially) and take their captures from the original text,
+and text longer than PARSE_MAX_COMMAND_LENGTH is never handed to a regex
+intent at all.
 """
 
+import bisect
 import re
-from typing import Optional, Dict, Any, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Optional, Dict, Any, Tuple, List, Callable, Iterable, Iterator
 from loguru import logger
 
+from jarvis.config.settings import (
+    PARSE_CACHE_SIZE, PARSE_CACHE_TTL, PARSE_CACHE_MAX_TEXT_LENGTH,
+    PARSE_MAX_COMMAND_LENGTH
+)
+from jarvis.utils.cache import LRUCache, FrozenDict, freeze
+
 def normalize_text(text: str) -> str:
     """Normalize text for parsing."""
     return text.lower().strip().rstrip('.!?')
 
-def extract_quoted_text(text: str) -> Optional[str]:
-    """Extract text between quotes."""
-    patterns = [
-        r'"([^"]+)"',
-        r"'([^']+)'",
-        r'«([^»]+)»',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(1)
-    return None
+class _PatternGroup:
+    """
+    Ordered regex alternatives compiled into one pattern.
 
-def parse_app_launch(text: str) -> Optional[str]:
-    """Parse app launch command."""
-    patterns = [
-        r'open\s+(.+)',
-        r'launch\s+(.+)',
-        r'start\s+(.+)',
-        r'run\s+(.+)',
-    ]
-    
-    text = normalize_text(text)
-    for pattern in patterns:
-        match = re.match(pattern, text)
-        if match:
-            app_name = match.group(1).strip()
-            # Remove extra words
-            app_name = re.sub(r'\s+(please|now|for me)$', '', app_name)
-            return app_name
-    return None
+    Every alternative is wrapped in a named group, so after a match
+    `lastgroup` tells which alternative fired and its own capture groups
+    can be sliced out and handed to that alternative's builder.
 
-def parse_browser_action(text: str) -> Optional[Dict[str, Any]]:
-    """Parse browser-related commands."""
-    text = normalize_text(text)
-    
+    The regex runs on the whitespace-squeezed text, but each capture is
+    cut from the original text, so paths and queries keep their exact
+    spacing.
+    """
+
+    def __init__(self, alternatives: List[Tuple[str, Callable[..., Any]]]):
+        branches = []
+        self._builders = {}
+        for index, (pattern, builder) in enumerate(alternatives):
+            name = f"alt{index}"
+            branches.append(f"(?P<{name}>{pattern})")
+            self._builders[name] = (builder, re.compile(pattern).groups)
+
+        self.regex = re.compile("|".join(branches))
+        self._builders = {
+            name: (builder, self.regex.groupindex[name], group_count)
+            for name, (builder, group_count) in self._builders.items()
+        }
+
+    def match(self, text: str) -> Optional[Any]:
+        """Match at the start of text and build the winning alternative's result."""
+        compact = _SqueezedText(text)
+        match = self.regex.match(compact.text)
+        if not match:
+            return None
+
+        builder, start, group_count = self._builders[match.lastgroup]
+        return builder(*(
+            compact.original(*match.span(group)) if match.group(group) is not None else None
+            for group in range(start + 1, start + group_count + 1)
+        ))
+
+def _strip_quotes(value: str) -> str:
+    return value.strip().strip('"\'')
+
+def _build_url(url: str) -> Dict[str, Any]:
+    if not url.startswith('http'):
+        url = 'https://' + url
+    return {"action": "open_url", "url": url}
+
+_QUOTED_PATTERNS = [
+    re.compile(r'"([^"]+)"'),
+    re.compile(r"'([^']+)'"),
+    re.compile(r'«([^»]+)»'),
+]
+
+# The lookbehind starts the match at the beginning of a whitespace run
+# only, so a long run costs one scan rather than one per position
+_APP_SUFFIX = re.compile(r'(?<!\s)\s+(please|now|for me)$')
+
+_TYPING_VERBS = ("type", "write", "enter", "input")
+_FIRST_TOKEN = re.compile(r'\S+')
+_WHITESPACE_RUN = re.compile(r'\s{4,}')
+
+_APP_LAUNCH = _PatternGroup([
+    (pattern, lambda name: _APP_SUFFIX.sub('', name.strip()))
+    for pattern in (r'open\s+(.+)', r'launch\s+(.+)', r'start\s+(.+)', r'run\s+(.+)')
+])
+
+_BROWSER = _PatternGroup(
     # Google search
-    search_patterns = [
-        r'search\s+(?:google\s+)?for\s+(.+)',
-        r'google\s+(.+)',
-        r'search\s+(.+)',
-        r'look\s+up\s+(.+)',
+    [
+        (pattern, lambda query: {"action": "google_search", "query": query.strip()})
+        for pattern in (
+            r'search\s+(?:google\s+)?for\s+(.+)',
+            r'google\s+(.+)',
+            r'search\s+(.+)',
+            r'look\s+up\s+(.+)',
+        )
     ]
-    for pattern in search_patterns:
-        match = re.match(pattern, text)
-        if match:
-            return {
-                "action": "google_search",
-                "query": match.group(1).strip()
-            }
-    
     # YouTube search
-    youtube_patterns = [
-        r'(?:open\s+)?youtube\s+(?:for\s+)?(.+)',
-        r'search\s+youtube\s+(?:for\s+)?(.+)',
-        r'play\s+(.+)\s+on\s+youtube',
+    + [
+        (pattern, lambda query: {"action": "youtube_search", "query": query.strip()})
+        for pattern in (
+            r'(?:open\s+)?youtube\s+(?:for\s+)?(.+)',
+            r'search\s+youtube\s+(?:for\s+)?(.+)',
+            r'play\s+(.+)\s+on\s+youtube',
+        )
     ]
-    for pattern in youtube_patterns:
-        match = re.match(pattern, text)
-        if match:
-            return {
-                "action": "youtube_search",
-                "query": match.group(1).strip()
-            }
-    
     # Direct URL
-    url_patterns = [
-        r'(?:open\s+|go\s+to\s+)(https?://\S+)',
-        r'(?:open\s+|go\s+to\s+)(www\.\S+)',
+    + [
+        (r'(?:open\s+|go\s+to\s+)(https?://\S+)', _build_url),
+        (r'(?:open\s+|go\s+to\s+)(www\.\S+)', _build_url),
     ]
-    for pattern in url_patterns:
-        match = re.match(pattern, text)
-        if match:
-            url = match.group(1)
-            if not url.startswith('http'):
-                url = 'https://' + url
-            return {
-                "action": "open_url",
-                "url": url
-            }
-    
-    return None
+)
 
-def parse_file_operation(text: str) -> Optional[Dict[str, Any]]:
-    """Parse file operation commands."""
-    text = normalize_text(text)
-    
-    # Copy files
-    copy_patterns = [
-        r'copy\s+(?:files?|folder|directory)?\s*(?:from)?\s+(.+?)\s+to\s+(.+)',
-        r'copy\s+(.+?)\s+(?:to|into)\s+(.+)',
+_FILE = _PatternGroup(
+    [
+        (pattern, lambda source, destination, action=action: {
+            "action": action,
+            "source": _strip_quotes(source),
+            "destination": _strip_quotes(destination)
+        })
+        for action in ("copy", "move")
+        for pattern in (
+            action + r'\s+(?:files?|folder|directory)?\s*(?:from)?\s+(.+?)\s+to\s+(.+)',
+            action + r'\s+(.+?)\s+(?:to|into)\s+(.+)',
+        )
     ]
-    for pattern in copy_patterns:
-        match = re.match(pattern, text)
-        if match:
-            return {
-                "action": "copy",
-                "source": match.group(1).strip().strip('"\''),
-                "destination": match.group(2).strip().strip('"\'')
-            }
-    
-    # Move files
-    move_patterns = [
-        r'move\s+(?:files?|folder|directory)?\s*(?:from)?\s+(.+?)\s+to\s+(.+)',
-        r'move\s+(.+?)\s+(?:to|into)\s+(.+)',
+    + [
+        (pattern, lambda path: {"action": "delete", "path": _strip_quotes(path)})
+        for pattern in (
+            r'delete\s+(?:file|folder)?\s*(?:at|in)?\s+(.+)',
+            r'remove\s+(?:file|folder)?\s*(?:at|in)?\s+(.+)',
+        )
     ]
-    for pattern in move_patterns:
-        match = re.match(pattern, text)
-        if match:
-            return {
-                "action": "move",
-                "source": match.group(1).strip().strip('"\''),
-                "destination": match.group(2).strip().strip('"\'')
-            }
-    
-    # Delete
-    delete_patterns = [
-        r'delete\s+(?:file|folder)?\s*(?:at|in)?\s+(.+)',
-        r'remove\s+(?:file|folder)?\s*(?:at|in)?\s+(.+)',
-    ]
-    for pattern in delete_patterns:
-        match = re.match(pattern, text)
-        if match:
-            return {
-                "action": "delete",
-                "path": match.group(1).strip().strip('"\'')
-            }
-    
-    return None
+)
 
-def parse_system_command(text: str) -> Optional[Dict[str, Any]]:
-    """Parse system control commands."""
-    text = normalize_text(text)
-    
+# System commands match anywhere in the text, so they are checked in order
+# with search() rather than folded into one anchored alternation.
+_SYSTEM = [
     # Volume control
-    if re.search(r'volume\s+up|increase\s+volume|louder', text):
-        return {"action": "volume_up"}
-    if re.search(r'volume\s+down|decrease\s+volume|quieter', text):
-        return {"action": "volume_down"}
-    if re.search(r'mute|silence', text):
-        return {"action": "mute"}
-    if re.search(r'unmute', text):
-        return {"action": "unmute"}
-    
+    (re.compile(r'volume\s+up|increase\s+volume|louder'), "volume_up"),
+    (re.compile(r'volume\s+down|decrease\s+volume|quieter'), "volume_down"),
+    (re.compile(r'mute|silence'), "mute"),
+    (re.compile(r'unmute'), "unmute"),
+
     # Screenshot
-    if re.search(r'screenshot|screen\s+shot|take\s+a?\s*picture', text):
-        return {"action": "screenshot"}
-    
+    (re.compile(r'screenshot|screen\s+shot|take\s+a?\s*picture'), "screenshot"),
+
     # Shutdown/Restart
-    if re.search(r'shut\s*down|turn\s+off|power\s+off', text):
-        return {"action": "shutdown"}
-    if re.search(r'restart|reboot', text):
-        return {"action": "restart"}
-    
-    return None
+    (re.compile(r'shut\s*down|turn\s+off|power\s+off'), "shutdown"),
+    (re.compile(r'restart|reboot'), "restart"),
+]
 
-def parse_typing_command(text: str) -> Optional[str]:
-    """Parse typing commands."""
-    text = normalize_text(text)
-    
-    patterns = [
-        r'type\s+["\']?(.+?)["\']?$',
-        r'write\s+["\']?(.+?)["\']?$',
-        r'enter\s+["\']?(.+?)["\']?$',
-        r'input\s+["\']?(.+?)["\']?$',
-    ]
-    
-    for pattern in patterns:
-        match = re.match(pattern, text)
+def extract_quoted_text(text: str) -> Optional[str]:
+    """Extract text between quotes."""
+    for pattern in _QUOTED_PATTERNS:
+        match = pattern.search(text)
         if match:
-            return match.group(1).strip()
-    
+            return match.group(1)
+    return None
+
+def _match_typing(text: str) -> Optional[str]:
+    """
+    Typing payload from already-normalized text.
+
+    Uses plain string operations instead of a regex, so the cost is linear
+    in the payload length even for several KB of dictation (and payloads
+    may span multiple lines).
+    """
+    first = _FIRST_TOKEN.match(text)
+    if first and first.group() in _TYPING_VERBS:
+        payload = text[first.end():].lstrip()
+        if payload:
+            # Drop one surrounding quote on each side: type 'hello'
+            if len(payload) > 1 and payload[0] in '"\'':
+                payload = payload[1:]
+            if len(payload) > 1 and payload[-1] in '"\'':
+                payload = payload[:-1]
+            return payload.strip()
+
     # Handle "type this: ..." format
     if 'type this' in text or 'type the following' in text:
         parts = text.split(':', 1)
         if len(parts) > 1:
             return parts[1].strip()
-    
+
+    return None
+
+def _match_system(text: str) -> Optional[Dict[str, Any]]:
+    """System action from already-normalized text."""
+    compact = _SqueezedText(text).text
+    for pattern, action in _SYSTEM:
+        if pattern.search(compact):
+            return {"action": action}
     return None
 
+class _SqueezedText:
+    """
+    Text with every whitespace run squeezed to at most three characters,
+    plus the mapping back to the original.
+
+    The intent regexes put several whitespace quantifiers next to each
+    other (e.g. `copy\\s+(?:files?)?\\s*(?:from)?\\s+`); on long runs of
+    whitespace those backtrack polynomially. A longer run keeps only its
+    first three and last characters and its first line break (which `.`
+    stops at), so the patterns match as on the original text, in
+    time linear in the text length, and original() turns a span of the
+    squeezed text back into the user's exact text.
+    """
+
+    def __init__(self, text: str):
+        self.source = text
+        pieces = []
+        # Start of every piece in the squeezed and in the original text
+        self._starts = []
+        self._origins = []
+        position = previous = 0
+        for run in _WHITESPACE_RUN.finditer(text):
+            kept = {run.start(), run.start() + 1, run.start() + 2, run.end() - 1}
+            newline = text.find("\n", run.start(), run.end())
+            if newline >= 0:
+                kept.add(newline)
+            chunks = [(text[previous:run.start()], previous)] if run.start() > previous else []
+            chunks += [(text[index], index) for index in sorted(kept)]
+            for piece, origin in chunks:
+                pieces.append(piece)
+                self._starts.append(position)
+                self._origins.append(origin)
+                position += len(piece)
+            previous = run.end()
+        if previous < len(text):
+            pieces.append(text[previous:])
+            self._starts.append(position)
+            self._origins.append(previous)
+        self.text = "".join(pieces)
+
+    def _position(self, index: int) -> int:
+        piece = bisect.bisect_right(self._starts, index) - 1
+        return self._origins[piece] + index - self._starts[piece]
+
+    def original(self, start: int, end: int) -> str:
+        """The original text behind squeezed text[start:end]."""
+        if start >= end:
+            return ""
+        return self.source[self._position(start):self._position(end - 1) + 1]
+
+def parse_app_launch(text: str) -> Optional[str]:
+    """Parse app launch command."""
+    return _APP_LAUNCH.match(normalize_text(text))
+
+def parse_browser_action(text: str) -> Optional[Dict[str, Any]]:
+    """Parse browser-related commands."""
+    return _BROWSER.match(normalize_text(text))
+
+def parse_file_operation(text: str) -> Optional[Dict[str, Any]]:
+    """Parse file operation commands."""
+    return _FILE.match(normalize_text(text))
+
+def parse_system_command(text: str) -> Optional[Dict[str, Any]]:
+    """Parse system control commands."""
+    return _match_system(normalize_text(text))
+
+def parse_typing_command(text: str) -> Optional[str]:
+    """Parse typing commands."""
+    return _match_typing(normalize_text(text))
+
+def _typing_intent(text: str) -> Optional[Dict[str, Any]]:
+    typed = _match_typing(text)
+    return {"text": typed} if typed else None
+
+def _app_launch_intent(text: str) -> Optional[Dict[str, Any]]:
+    app_name = _APP_LAUNCH.match(text)
+    return {"app_name": app_name} if app_name else None
+
+class _Intent:
+    """A registered intent matcher and its trigger tokens."""
+
+    def __init__(
+        self,
+        name: str,
+        matcher: Callable[[str], Optional[Dict[str, Any]]],
+        leading: Tuple[str, ...],
+        keywords: Tuple[str, ...],
+        unbounded: bool
+    ):
+        self.name = name
+        self.matcher = matcher
+        self.unbounded = unbounded
+        self.leading = frozenset(leading)
+        self.keywords = re.compile(
+            "|".join(re.escape(keyword) for keyword in keywords)
+        ) if keywords else None
+
+    def triggered_by(self, token: str) -> bool:
+        """Whether texts starting with token can reach this intent."""
+        return token in self.leading or not self.leading or self.keywords is not None
+
+class IntentRegistry:
+    """
+    Ordered intent matchers indexed by their trigger tokens.
+
+    An intent registers the leading verbs its patterns start with and/or
+    keywords that must appear somewhere in the text for it to match. An
+    utterance is only run through the matchers of intents whose first
+    token or keywords it contains; intents registered without triggers are
+    always tried. Registration order is match priority.
+
+    Matchers receive the normalized text untouched (the built-in regex
+    intents squeeze whitespace runs themselves, see _SqueezedText).
+    Regex-based matchers are skipped for texts longer than
+    PARSE_MAX_COMMAND_LENGTH; matchers registered as unbounded must run
+    in linear time and are tried at any length.
+    """
+
+    def __init__(self):
+        self._intents: List[_Intent] = []
+        self._by_token: Dict[str, List[_Intent]] = {}
+        self._untriggered: List[_Intent] = []
+
+    def register(
+        self,
+        name: str,
+        matcher: Callable[[str], Optional[Dict[str, Any]]],
+        leading: Tuple[str, ...] = (),
+        keywords: Tuple[str, ...] = (),
+        before: Optional[str] = None,
+        unbounded: bool = False
+    ):
+        """
+        Register an intent matcher.
+
+        Args:
+            name: Command type reported by parse_command
+            matcher: Takes normalized text, returns intent data or None
+            leading: First tokens the intent's patterns can start with
+            keywords: Substrings, any of which may trigger the intent
+            before: Name of an intent to insert ahead of (default: append)
+            unbounded: Matcher is linear-time and handles texts of any length
+        """
+        intent = _Intent(name, matcher, tuple(leading), tuple(keywords), unbounded)
+        position = len(self._intents)
+        if before is not None:
+            position = [i.name for i in self._intents].index(before)
+        self._intents.insert(position, intent)
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Precompute the ordered candidate list for every leading token."""
+        self._untriggered = [
+            intent for intent in self._intents if intent.triggered_by("")
+        ]
+        tokens = set().union(*(intent.leading for intent in self._intents))
+        self._by_token = {
+            token: [intent for intent in self._intents if intent.triggered_by(token)]
+            for token in tokens
+        }
+
+    def match(self, text: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Run normalized text through its candidate intents in priority order.
+
+        Returns:
+            (intent name, data) for the first match, or None
+        """
+        first = _FIRST_TOKEN.match(text)
+        token = first.group() if first else ""
+        candidates = self._by_token.get(token, self._untriggered)
+
+        # Over-long text is only offered to linear-time matchers
+        too_long = len(text) > PARSE_MAX_COMMAND_LENGTH
+
+        for intent in candidates:
+            if too_long and not intent.unbounded:
+                continue
+            if token not in intent.leading and intent.keywords is not None \
+                    and not intent.keywords.search(text):
+                continue
+            data = intent.matcher(text)
+            if data:
+                return intent.name, data
+        return None
+
+    def names(self) -> List[str]:
+        """Registered intent names in priority order."""
+        return [intent.name for intent in self._intents]
+
+    def leading_tokens(self, name: str) -> frozenset:
+        """Leading verbs registered for an intent (empty if none or unknown)."""
+        for intent in self._intents:
+            if intent.name == name:
+                return intent.leading
+        return frozenset()
+
+intent_registry = IntentRegistry()
+
+# Built-in intents in priority order: typing first (most specific), then
+# app launch, browser, file and system. Anything unmatched is chat.
+intent_registry.register(
+    "typing", _typing_intent,
+    leading=_TYPING_VERBS,
+    keywords=("type this", "type the following"),
+    unbounded=True,
+)
+intent_registry.register(
+    "app_launch", _app_launch_intent,
+    leading=("open", "launch", "start", "run"),
+)
+intent_registry.register(
+    "browser", _BROWSER.match,
+    leading=("search", "google", "look", "open", "youtube", "play", "go"),
+)
+intent_registry.register(
+    "file", _FILE.match,
+    leading=("copy", "move", "delete", "remove"),
+)
+intent_registry.register(
+    "system", _match_system,
+    leading=("turn", "volume", "increase", "decrease", "louder", "quieter", "mute", "unmute",
+             "silence", "take", "screenshot", "shut", "shutdown", "power", "restart", "reboot"),
+    keywords=("volume", "louder", "quieter", "mute", "silence", "screen",
+              "picture", "shut", "off", "restart", "reboot"),
+)
+
+_parse_cache = LRUCache(max_size=PARSE_CACHE_SIZE, ttl=PARSE_CACHE_TTL)
+_NOT_CACHED = object()
+
+def register_intent(
+    name: str,
+    matcher: Callable[[str], Optional[Dict[str, Any]]],
+    leading: Tuple[str, ...] = (),
+    keywords: Tuple[str, ...] = (),
+    before: Optional[str] = None,
+    unbounded: bool = False
+):
+    """Register a custom intent with the global registry (see IntentRegistry.register)."""
+    intent_registry.register(name, matcher, leading, keywords, before, unbounded)
+    # Cached results were produced by the old rule set
+    _parse_cache.clear()
+
+def get_parse_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters of the parse cache."""
+    return _parse_cache.stats()
+
+def clear_parse_cache():
+    """Drop all memoized parse results."""
+    _parse_cache.clear()
+
+def _match_intent(normalized: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Registry lookup, memoized for texts short enough to be repeat commands."""
+    if len(normalized) > PARSE_CACHE_MAX_TEXT_LENGTH:
+        return intent_registry.match(normalized)
+
+    matched = _parse_cache.get(normalized, _NOT_CACHED)
+    if matched is _NOT_CACHED:
+        matched = intent_registry.match(normalized)
+        if matched:
+            matched = (matched[0], freeze(matched[1]))
+        _parse_cache.put(normalized, matched)
+    return matched
+
 def parse_command(text: str) -> Dict[str, Any]:
     """
     Main command parser. Returns structured command info.
-    
+
+    The returned dict (and its data) is read-only; copy it before
+    modifying.
+
     Returns dict with:
         - type: 'app_launch', 'browser', 'file', 'system', 'typing', 'chat'
         - data: parsed data specific to command type
         - original: original text
     """
     if not text or not text.strip():
-        return {"type": "unknown", "data": None, "original": text}
-    
-    original = text
-    text = normalize_text(text)
-    
-    # Check for typing first (most specific)
-    typing_text = parse_typing_command(original)
-    if typing_text:
-        return {
-            "type": "typing",
-            "data": {"text": typing_text},
-            "original": original
-        }
-    
-    # Check app launch
-    app_name = parse_app_launch(text)
-    if app_name:
-        return {
-            "type": "app_launch",
-            "data": {"app_name": app_name},
-            "original": original
-        }
-    
-    # Check browser actions
-    browser_data = parse_browser_action(text)
-    if browser_data:
-        return {
-            "type": "browser",
-            "data": browser_data,
-            "original": original
-        }
-    
-    # Check file operations
-    file_data = parse_file_operation(text)
-    if file_data:
-        return {
-            "type": "file",
-            "data": file_data,
-            "original": original
-        }
-    
-    # Check system commands
-    system_data = parse_system_command(text)
-    if system_data:
-        return {
-            "type": "system",
-            "data": system_data,
-            "original": original
-        }
-    
+        return FrozenDict({"type": "unknown", "data": None, "original": text})
+
+    matched = _match_intent(normalize_text(text))
+    if matched:
+        command_type, data = matched
+        return FrozenDict({
+            "type": command_type,
+            "data": data,
+            "original": text
+        })
+
     # Default to chat
-    return {
+    return FrozenDict({
         "type": "chat",
-        "data": {"message": original},
-        "original": original
-    }
\ No newline at end of file
+        "data": FrozenDict({"message": text}),
+        "original": text
+    })
+
+# Conjunctions that can join two commands in one utterance. The lookbehind
+# starts a conjunction match at the beginning of a whitespace run only,
+# which keeps the split linear in the text length.
+_PLAN_SEPARATOR = re.compile(
+    r'((?<!\s),?\s+(?:and\s+then|then|and|also)\s+|,\s*)', re.IGNORECASE
+)
+
+def _starts_own_step(step: Dict[str, Any]) -> bool:
+    """Whether a plan piece opens with one of its intent's leading verbs."""
+    first = _FIRST_TOKEN.match(normalize_text(step["original"]))
+    return first is not None and first.group() in intent_registry.leading_tokens(step["type"])
+
+def parse_plan(text: str) -> List[Dict[str, Any]]:
+    """
+    Split a compound utterance into an ordered list of parsed steps.
+
+    "open chrome and search for flight prices and turn the volume up"
+    becomes three steps (app_launch, browser, system). The split is
+    conservative: a piece only becomes a step of its own when it parses
+    as a command and starts with one of that intent's leading verbs;
+    anything else is glued back onto the previous step ("search for
+    salt and pepper" and "search for pictures and screenshots" stay one
+    search), and a typing step swallows everything after it.
+
+    Returns:
+        List of parse_command results; a single-element list when the
+        text is not a compound command
+    """
+    parsed = parse_command(text)
+    if parsed["type"] in ("unknown", "typing") or len(text) > PARSE_MAX_COMMAND_LENGTH:
+        return [parsed]
+
+    pieces = _PLAN_SEPARATOR.split(text.strip())
+    if len(pieces) < 3:
+        return [parsed]
+
+    # pieces alternates [command, separator, command, separator, ...]
+    steps = [parse_command(pieces[0])]
+    for separator, piece in zip(pieces[1::2], pieces[2::2]):
+        step = parse_command(piece)
+        if not _starts_own_step(step) or steps[-1]["type"] == "typing":
+            steps[-1] = parse_command(steps[-1]["original"] + separator + piece)
+        else:
+            steps.append(step)
+
+    if len(steps) < 2 or steps[0]["type"] == "chat":
+        return [parsed]
+    return steps
+
+def _parse_chunk(texts: List[str]) -> List[Dict[str, Any]]:
+    """Worker-process entry point for parse_commands."""
+    return [parse_command(text) for text in texts]
+
+def parse_commands(
+    texts: Iterable[str],
+    workers: Optional[int] = None,
+    chunk_size: int = 1000
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parse a stream of commands lazily, yielding results in input order.
+
+    The input is consumed incrementally, so arbitrarily large corpora
+    (e.g. a whole command_history table) never have to fit in memory.
+
+    Args:
+        texts: Iterable of raw command strings
+        workers: Number of worker processes; None or 1 parses in-process
+        chunk_size: Commands per task handed to a worker process
+
+    Note:
+        Worker processes only know the built-in intents; intents added
+        with register_intent() at runtime are not seen there.
+    """
+    if not workers or workers <= 1:
+        for text in texts:
+            yield parse_command(text)
+        return
+
+    texts = iter(texts)
+    chunks = iter(lambda: list(islice(texts, chunk_size)), [])
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(pool.submit(_parse_chunk, chunk))
+            # Bound the read-ahead to a couple of chunks per worker
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
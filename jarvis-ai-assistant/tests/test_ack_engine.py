@@ -0,0 +1,57 @@
+"""
+Tests for the acknowledgement engine.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock
+from jarvis.core.ack_engine import AckEngine, DEFAULT_PHRASES
+
+class TestAckEngine:
+    
+    @pytest.fixture
+    def client(self):
+        client = Mock()
+        client.is_available.return_value = False  # no background refills
+        client.chat.return_value = "\n".join([
+            "1. {target} is open and ready!",
+            "2. There you go, {target} is up.",
+            "- Launched {target} for you.",
+            "- {target} coming right up!",
+        ])
+        return client
+    
+    @pytest.fixture
+    def engine(self, client, tmp_path):
+        return AckEngine(client=client, path=tmp_path / "acks.json", pool_size=4, idle_seconds=60)
+    
+    def test_defaults_before_first_refill(self, engine, client):
+        assert engine.acknowledge("app_launch", True, "chrome") in DEFAULT_PHRASES[True]
+        assert engine.acknowledge("app_launch", False) in DEFAULT_PHRASES[False]
+        client.chat.assert_not_called()
+        assert engine.stats()["served_from_defaults"] == 2
+    
+    def test_refill_and_serve(self, engine, client):
+        assert engine.refill("app_launch:ok") == 4
+        
+        replies = {engine.acknowledge("app_launch", True, "chrome") for _ in range(4)}
+        assert replies == {
+            "chrome is open and ready!", "There you go, chrome is up.",
+            "Launched chrome for you.", "chrome coming right up!"
+        }
+        # Pool exhausted: used phrases are recycled, still no LLM call per command
+        assert "chrome" in engine.acknowledge("app_launch", True, "chrome")
+        assert client.chat.call_count == 1
+    
+    def test_pools_persist(self, engine, client, tmp_path):
+        engine.refill("file_copy:ok")
+        saved = json.loads((tmp_path / "acks.json").read_text(encoding="utf-8"))
+        assert len(saved["pools"]["file_copy:ok"]) == 4
+        
+        reloaded = AckEngine(client=client, path=tmp_path / "acks.json", pool_size=4)
+        assert reloaded.stats()["pools"]["file_copy:ok"] == 4
+    
+    def test_fallback_reply_is_not_stored(self, engine, client):
+        client.chat.return_value = "I'm having trouble connecting to my brain right now."
+        assert engine.refill("app_launch:ok") == 0
+        assert engine.stats()["failed_refills"] == 1
@@ -78,6 +78,64 @@ class TestAPIEndpoints:
             data = json.loads(response.data)
             assert data['response'] == "Hello there!"
     
+    def test_parser_stats_endpoint(self, client):
+        response = client.get('/stats/parser')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert {'hits', 'misses', 'evictions', 'size'} <= set(data['cache'])
+    
+    def test_handler_stats(self, client):
+        response = client.get('/stats/handlers')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['handlers']['system.volume_up']['latency']['count'] >= 0
+    
+    def test_ask_endpoint_streams_sentences(self, client):
+        from unittest import mock
+        
+        sessions = []
+        
+        async def reply(message, session_id=None):
+            sessions.append(session_id)
+            for chunk in ["Hello", " there! How", " can I help?"]:
+                yield chunk
+        
+        with mock.patch('jarvis.api.flask_server.ai_engine') as mock_ai:
+            mock_ai.stream_reply_async = reply
+            response = client.post('/ask',
+                data=json.dumps({"message": "hi", "stream": True}),
+                content_type='application/json',
+                headers={"X-Jarvis-Session": "pixel"}
+            )
+            lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        
+        assert response.mimetype == 'application/x-ndjson'
+        assert sessions == ["pixel"]
+        assert [line.get("text") for line in lines[:-1]] == ["Hello there!", "How can I help?"]
+        assert lines[-1]["done"] is True
+        
+        stats = json.loads(client.get('/stats/streaming').data)
+        assert stats['time_to_first_chunk_ms']['count'] >= 1
+    
+    def test_ask_uses_the_callers_session(self, client):
+        from unittest import mock
+        
+        with mock.patch('jarvis.api.flask_server.ai_engine') as mock_ai:
+            mock_ai.generate_reply_async = mock.AsyncMock(return_value="Hi!")
+            client.post('/ask', data=json.dumps({"message": "hi", "device_id": "tablet"}),
+                        content_type='application/json')
+            client.post('/ask', data=json.dumps({"message": "hi", "device_id": "tablet"}),
+                        content_type='application/json', headers={"X-Jarvis-Session": "pixel"})
+        
+        sessions = [call.kwargs["session_id"] for call in mock_ai.generate_reply_async.call_args_list]
+        assert sessions == ["tablet", "pixel"]
+    
+    def test_scheduler_stats(self, client):
+        response = client.get('/stats/scheduler')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert set(data['scheduler']['classes']) == {'device', 'file', 'chat'}
+    
     def test_404_error(self, client):
         response = client.get('/nonexistent')
         assert response.status_code == 404
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Tests for the shared asyncio runtime.
+"""
+
+import asyncio
+import contextvars
+import time
+import pytest
+from jarvis.core.async_runtime import AsyncRuntime
+
+request_source = contextvars.ContextVar("request_source", default=None)
+
+class TestAsyncRuntime:
+    
+    @pytest.fixture
+    def runtime(self):
+        runtime = AsyncRuntime(workers=4)
+        yield runtime
+        runtime.stop()
+    
+    def test_run_and_submit(self, runtime):
+        async def double(value):
+            await asyncio.sleep(0)
+            return value * 2
+        
+        assert runtime.run(double(21)) == 42
+        futures = [runtime.submit(double(i)) for i in range(10)]
+        assert [future.result(1) for future in futures] == [i * 2 for i in range(10)]
+    
+    def test_blocking_calls_keep_context(self, runtime):
+        async def handle():
+            request_source.set("phone")
+            return await asyncio.to_thread(request_source.get)
+        
+        assert runtime.run(handle()) == "phone"
+    
+    def test_run_from_loop_thread_is_rejected(self, runtime):
+        async def nested():
+            inner = asyncio.sleep(0)
+            runtime.run(inner)
+        
+        with pytest.raises(RuntimeError):
+            runtime.run(nested())
+    
+    def test_restart_after_stop(self, runtime):
+        async def value():
+            return 1
+        
+        assert runtime.run(value()) == 1
+        runtime.stop()
+        assert runtime.run(value()) == 1
+    
+    def test_stop_with_work_in_flight(self, runtime):
+        async def forever():
+            await asyncio.sleep(3600)
+        
+        async def hog():
+            time.sleep(0.5)  # blocks the loop past the stop timeout
+        
+        runtime.submit(forever())
+        loop = runtime.loop
+        runtime.stop()
+        assert loop.is_closed()
+        
+        runtime.submit(hog())
+        loop = runtime.loop
+        runtime.stop(timeout=0.1)
+        assert not loop.is_closed()  # still busy; left to its daemon thread
+        for _ in range(100):
+            if loop.is_closed():
+                break
+            time.sleep(0.01)
+        assert loop.is_closed()  # its thread closes it once the hog returns
+    
+    def test_iterate_async_stream(self, runtime):
+        closed = []
+        
+        async def numbers(count):
+            try:
+                for i in range(count):
+                    await asyncio.sleep(0)
+                    yield i
+            finally:
+                closed.append(count)
+        
+        assert list(runtime.iterate(numbers(3))) == [0, 1, 2]
+        
+        stream = runtime.iterate(numbers(100))
+        assert next(stream) == 0
+        stream.close()  # consumer gone: the async stream is shut down too
+        runtime.run(asyncio.sleep(0.05))
+        assert closed == [3, 100]
@@ -0,0 +1,50 @@
+"""
+Tests for caching helpers.
+"""
+
+import pytest
+from jarvis.utils.cache import LRUCache, FrozenDict, freeze
+
+class TestLRUCache:
+    
+    def test_hit_and_miss(self):
+        cache = LRUCache(max_size=2)
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+    
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+    
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = LRUCache(max_size=2, ttl=10, clock=lambda: now[0])
+        cache.put("a", 1)
+        now[0] = 11.0
+        
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+class TestFrozenDict:
+    
+    def test_read_only(self):
+        frozen = freeze({"action": "copy", "paths": ["a", "b"]})
+        assert frozen == {"action": "copy", "paths": ("a", "b")}
+        
+        with pytest.raises(TypeError):
+            frozen["action"] = "move"
+        with pytest.raises(TypeError):
+            frozen.update(action="move")
+        assert isinstance(frozen, FrozenDict)
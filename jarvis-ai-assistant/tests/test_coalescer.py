@@ -0,0 +1,101 @@
+"""
+Tests for command coalescing.
+"""
+
+import asyncio
+import gc
+import pytest
+from jarvis.core.coalescer import Coalescer
+
+class TestCoalescer:
+    
+    def test_burst_is_merged(self):
+        calls = []
+        
+        async def execute(total, callers):
+            calls.append((total, callers))
+            return {"success": True, "total": total}
+        
+        async def burst():
+            coalescer = Coalescer(window_ms=50)
+            results = await asyncio.gather(*(coalescer.submit("volume", 1, execute) for _ in range(4)))
+            return coalescer, results
+        
+        coalescer, results = asyncio.run(burst())
+        assert calls == [(4, 4)]
+        assert [result["total"] for result in results] == [4] * 4
+        results[0]["total"] = 0
+        assert results[1]["total"] == 4  # every caller gets its own copy
+        assert coalescer.stats()["merged"] == 3
+    
+    def test_arrivals_during_execution_form_next_batch(self):
+        calls = []
+        
+        async def execute(total, callers):
+            calls.append(total)
+            await asyncio.sleep(0.02)
+            return {"success": True}
+        
+        async def scenario():
+            coalescer = Coalescer(window_ms=30)
+            first = asyncio.create_task(coalescer.submit("volume", 1, execute))
+            await asyncio.sleep(0.005)  # first batch is now executing
+            later = [coalescer.submit("volume", -1, execute) for _ in range(3)]
+            await asyncio.gather(first, *later)
+        
+        asyncio.run(scenario())
+        assert calls == [1, -3]
+    
+    def test_keys_are_independent_and_errors_propagate(self):
+        async def fail(total, callers):
+            raise RuntimeError("no audio device")
+        
+        async def ok(total, callers):
+            return {"success": True}
+        
+        async def scenario():
+            coalescer = Coalescer(window_ms=10)
+            return await asyncio.gather(
+                coalescer.submit("volume", 1, fail),
+                coalescer.submit("volume", 1, fail),
+                coalescer.submit("mute", 0, ok),
+                return_exceptions=True
+            )
+        
+        volume_a, volume_b, mute = asyncio.run(scenario())
+        assert isinstance(volume_a, RuntimeError) and isinstance(volume_b, RuntimeError)
+        assert mute == {"success": True}
+    
+    def test_pending_flush_survives_garbage_collection(self):
+        async def execute(total, callers):
+            return {"success": True, "total": total}
+        
+        async def scenario():
+            coalescer = Coalescer(window_ms=50)
+            await coalescer.submit("volume", 1, execute)  # the next batch waits out the window
+            second = asyncio.create_task(coalescer.submit("volume", 1, execute))
+            await asyncio.sleep(0)
+            gc.collect()
+            result = await asyncio.wait_for(second, 1)
+            return coalescer, result
+        
+        coalescer, result = asyncio.run(scenario())
+        assert result["total"] == 1
+        assert coalescer.stats()["executions"] == 2
+        assert not coalescer._tasks
+    
+    def test_cancelled_flush_releases_its_callers(self):
+        async def execute(total, callers):
+            return {"success": True}
+        
+        async def scenario():
+            coalescer = Coalescer(window_ms=1000)
+            await coalescer.submit("volume", 1, execute)
+            waiting = asyncio.create_task(coalescer.submit("volume", 1, execute))
+            await asyncio.sleep(0)
+            for task in list(coalescer._tasks):
+                task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await asyncio.wait_for(waiting, 1)
+        
+        asyncio.run(scenario())
@@ -3,8 +3,9 @@ Tests for command router.
 """
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, AsyncMock, patch
 from jarvis.core.command_router import CommandRouter
+from jarvis.utils.text_parsing import parse_plan
 
 class TestCommandRouter:
     
@@ -40,6 +41,334 @@ class TestCommandRouter:
     
     def test_command_logging(self, router):
         with patch('jarvis.core.command_router.db_manager') as mock_db:
-            with patch.object(router, '_handle_chat'):
-                router.handle_command("test command", source="voice")
-                mock_db.log_command.assert_called_once()
\ No newline at end of file
+            with patch.object(router, '_handle_chat', new_callable=AsyncMock) as mock_chat:
+                mock_chat.return_value = {
+                    "action": "chat",
+                    "success": True,
+                    "spoken_response": "Hello!",
+                    "is_chat": True
+                }
+                
+                result = router.handle_command("test command", source="voice")
+                assert result["spoken_response"] == "Hello!"
+                mock_db.log_command.assert_called_once_with(
+                    source="voice",
+                    raw_text="test command",
+                    action_type="chat",
+                    success=True,
+                    error_message=None,
+                    response_text="Hello!"
+                )
+    
+    def test_compound_command_runs_every_step(self, router):
+        with patch('jarvis.core.command_router.db_manager') as mock_db, \
+             patch.object(router, '_handle_app_launch') as app:
+            app.return_value = {"action": "app_launch", "success": True, "spoken_response": "Opened!",
+                                "phrase_request": {"command": "open chrome", "success": True,
+                                                   "details": "Opened!", "target": "chrome"}}
+            router.handlers.register("browser", lambda data, text: {
+                "action": "browser_google_search", "success": True, "spoken_response": "Searching"
+            }, action="google_search")
+            router.handlers.register("system", lambda data, text: {
+                "action": "system_volume_up", "success": True, "spoken_response": "Louder"
+            }, action="volume_up")
+            router.ai = AsyncMock()
+            router.ai.generate_plan_response_async.return_value = "All done!"
+            router.acks = Mock(enabled=False)
+            
+            result = router.handle_command(
+                "open chrome and search for flight prices and turn the volume up", source="test"
+            )
+            
+            assert result["action"] == "plan"
+            assert result["success"] is True
+            assert result["spoken_response"] == "All done!"
+            assert [step["action"] for step in result["details"]["steps"]] == [
+                "app_launch", "browser_google_search", "system_volume_up"
+            ]
+            router.ai.generate_plan_response_async.assert_awaited_once()
+            router.ai.generate_command_response_async.assert_not_called()
+            assert mock_db.log_command.call_count == 3
+    
+    def test_plan_stages_keep_dependent_steps_in_order(self, router):
+        steps = [
+            {"type": "app_launch", "data": {"app_name": "notepad"}},
+            {"type": "system", "data": {"action": "volume_up"}},
+            {"type": "typing", "data": {"text": "hi"}},
+            {"type": "browser", "data": {"action": "google_search", "query": "x"}},
+            {"type": "system", "data": {"action": "shutdown"}},
+        ]
+        assert router._plan_stages(steps) == [[0, 1], [2], [3], [4]]
+    
+    def test_system_actions_dispatch_through_registry(self, router):
+        with patch('jarvis.core.command_router.system_control') as control, \
+             patch('jarvis.core.command_router.db_manager'):
+            control.mute.return_value = (True, "Muted")
+            control.cancel_shutdown.return_value = (True, "Cancelled")
+            
+            assert router.handle_command("mute", source="test")["action"] == "system_mute"
+            assert router.handle_command("cancel the shutdown", source="test")["action"] == "system_cancel_shutdown"
+            
+            result = router.handle_command("shutdown", source="test")
+            assert result["requires_confirmation"] is True
+            control.shutdown.assert_not_called()
+            
+            stats = router.handlers.stats()
+            assert stats["system.mute"]["calls"] == 1
+            assert stats["system.mute"]["successes"] == 1
+            assert stats["system.shutdown"]["failures"] == 1
+    
+    def test_concurrent_async_commands(self, router):
+        import asyncio
+        import threading
+        import time
+        
+        active = []
+        peak = []
+        lock = threading.Lock()
+        
+        def slow_screenshot(data, text):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return {"action": "system_screenshot", "success": True, "spoken_response": "Snap"}
+        
+        router.handlers.register("system", slow_screenshot, action="screenshot")
+        
+        async def run_all():
+            return await asyncio.gather(
+                *(router.handle_command_async("take a screenshot", source="test") for _ in range(5))
+            )
+        
+        with patch('jarvis.core.command_router.db_manager'):
+            results = asyncio.run(run_all())
+        
+        assert all(result["action"] == "system_screenshot" for result in results)
+        assert max(peak) > 1
+    
+    def test_successful_launch_is_acknowledged_without_llm(self, router):
+        with patch('jarvis.core.command_router.app_launcher') as launcher, \
+             patch('jarvis.core.command_router.db_manager'):
+            launcher.open_app.return_value = (True, "Opened chrome")
+            router.ai = AsyncMock()
+            router.acks = Mock(enabled=True)
+            router.acks.acknowledge.return_value = "Chrome is up!"
+            
+            result = router.handle_command("open chrome", source="test")
+            
+            assert result["spoken_response"] == "Chrome is up!"
+            router.acks.acknowledge.assert_called_once_with("app_launch", True, "chrome")
+            router.ai.generate_command_response_async.assert_not_called()
+    
+    def test_speculative_reply_overlaps_action(self, router):
+        import asyncio
+        import time
+        
+        def slow_open(app_name):
+            time.sleep(0.1)
+            return True, f"Opened {app_name}"
+        
+        async def slow_reply(command, success, details):
+            await asyncio.sleep(0.1)
+            return f"{command}: {'yay' if success else 'nay'}"
+        
+        with patch('jarvis.core.command_router.app_launcher') as launcher, \
+             patch('jarvis.core.command_router.db_manager'):
+            launcher.open_app.side_effect = slow_open
+            router.acks = Mock(enabled=False)
+            router.speculative = True
+            router.ai = Mock()
+            router.ai.generate_command_response_async.side_effect = slow_reply
+            
+            start = time.perf_counter()
+            result = router.handle_command("open chrome", source="test")
+            elapsed = time.perf_counter() - start
+        
+        assert result["spoken_response"] == "open chrome: yay"
+        assert elapsed < 0.18
+        stats = router.speculation_stats.snapshot()["app_launch"]
+        assert stats["used"] == 1
+        assert stats["saved_ms_total"] > 50
+    
+    def test_speculative_reply_cancelled_on_failure(self, router):
+        import asyncio
+        
+        cancelled = []
+        
+        async def slow_reply(command, success, details):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(success)
+                raise
+        
+        with patch('jarvis.core.command_router.app_launcher') as launcher, \
+             patch('jarvis.core.command_router.db_manager'):
+            launcher.open_app.return_value = (False, "App not found")
+            router.acks = Mock(enabled=False)
+            router.speculative = True
+            router.ai = Mock()
+            router.ai.generate_command_response_async.side_effect = slow_reply
+            
+            result = router.handle_command("open nothing", source="test")
+        
+        assert result["spoken_response"] == "App not found"
+        assert cancelled == [True]
+        assert router.speculation_stats.snapshot()["app_launch"]["wasted"] == 1
+    
+    def test_speculation_is_opt_in_and_needs_acks_off(self, router):
+        from jarvis.config.settings import SPECULATIVE_RESPONSES
+        
+        assert not SPECULATIVE_RESPONSES
+        router.speculative = True
+        router.acks = Mock(enabled=True)
+        assert not router.speculating
+        assert router._speculative_command("app_launch", {"app_name": "chrome"}, "open chrome") is None
+        router.acks.enabled = False
+        assert router.speculating
+    
+    def test_confirmation_replays_parked_command(self, router):
+        with patch('jarvis.core.command_router.file_manager') as files, \
+             patch('jarvis.core.command_router.db_manager'), \
+             patch('jarvis.core.command_router.parse_plan', wraps=parse_plan) as parser:
+            files.delete_path.return_value = (True, "Deleted")
+            router.acks = Mock(enabled=True)
+            router.acks.acknowledge.return_value = "Gone!"
+            
+            first = router.handle_command("delete file old.txt", source="phone", session_id="pixel")
+            assert first["requires_confirmation"] is True
+            files.delete_path.assert_not_called()
+            
+            # Another device cannot confirm it
+            other = router.handle_command("confirm delete", source="phone", session_id="tablet")
+            assert other["success"] is False
+            files.delete_path.assert_not_called()
+            
+            parses = parser.call_count
+            result = router.handle_command("confirm delete", source="phone", session_id="pixel")
+            assert result["success"] is True
+            files.delete_path.assert_called_once_with("old.txt", confirm=True)
+            assert parser.call_count == parses  # replayed, not re-parsed
+            
+            again = router.handle_command("confirm delete", source="phone", session_id="pixel")
+            assert again["success"] is False
+            files.delete_path.assert_called_once()
+    
+    def test_cancel_drops_pending_shutdown(self, router):
+        with patch('jarvis.core.command_router.system_control') as control, \
+             patch('jarvis.core.command_router.db_manager'):
+            router.handle_command("shutdown", source="voice")
+            assert router.handle_command("never mind", source="voice")["action"] == "confirmation_cancelled"
+            router.handle_command("confirm shutdown", source="voice")
+            control.shutdown.assert_not_called()
+    
+    def test_volume_burst_is_coalesced(self, router):
+        import asyncio
+        
+        async def burst():
+            commands = ["volume up"] * 3 + ["volume down"] + ["volume up"]
+            sources = ["phone", "voice", "phone", "phone", "voice"]
+            return await asyncio.gather(*(
+                router.handle_command_async(text, source=source)
+                for text, source in zip(commands, sources)
+            ))
+        
+        with patch('jarvis.core.command_router.system_control') as control, \
+             patch('jarvis.core.command_router.db_manager') as mock_db:
+            control.volume_up.return_value = (True, "Volume up! 🔊")
+            results = asyncio.run(burst())
+        
+        control.volume_up.assert_called_once_with(step=30)
+        control.volume_down.assert_not_called()
+        assert all(result["spoken_response"] == "Volume up! 🔊" for result in results)
+        assert results[0]["details"]["coalesced_commands"] == 5
+        assert mock_db.log_command.call_count == 5
+    
+    def test_mute_burst_is_coalesced_by_parity(self, router):
+        import asyncio
+        
+        async def burst(commands):
+            return await asyncio.gather(*(
+                router.handle_command_async(text, source="phone") for text in commands
+            ))
+        
+        with patch('jarvis.core.command_router.system_control') as control, \
+             patch('jarvis.core.command_router.db_manager'):
+            control.mute.return_value = (True, "Muted! 🔇")
+            results = asyncio.run(burst(["mute", "mute"]))
+            control.mute.assert_not_called()
+            assert results[0]["details"]["coalesced_commands"] == 2
+            
+            asyncio.run(burst(["mute", "unmute", "mute"]))
+            control.mute.assert_called_once()
+    
+    def test_chat_streams_sentences_to_speech_sink(self, router):
+        import asyncio
+        from jarvis.core.streaming import speech_sink
+        
+        async def reply(*args, **kwargs):
+            for chunk in ["Sure thing", "! Here's a joke", ". Why did", " the chicken cross?"]:
+                yield chunk
+        
+        spoken = []
+        
+        async def voice_command():
+            speech_sink.set(spoken.append)
+            return await router.handle_command_async("tell me a joke", source="test")
+        
+        router.ai = Mock()
+        router.ai.stream_reply_async = reply
+        with patch('jarvis.core.command_router.db_manager'):
+            result = asyncio.run(voice_command())
+        
+        assert spoken == ["Sure thing!", "Here's a joke.", "Why did the chicken cross?"]
+        assert result["streamed"] is True
+        assert result["spoken_response"] == " ".join(spoken)
+    
+    def test_router_runs_on_local_llm_backend(self):
+        import asyncio
+        from jarvis.api.gemini_client import GeminiClient
+        from jarvis.api.llm_backend import LocalBackend
+        from jarvis.api.response_cache import ResponseCache
+        from jarvis.core.ai_engine import AIEngine
+        
+        from jarvis.core.conversation_store import ConversationStore
+        
+        client = GeminiClient(backend=LocalBackend(latency_ms=0), cache=ResponseCache(path=None, enabled=False))
+        conversations = ConversationStore(db=Mock(**{"get_conversation_history.return_value": []}))
+        router = CommandRouter(ai=AIEngine(client, conversations))
+        with patch('jarvis.core.command_router.db_manager'):
+            result = asyncio.run(router.handle_command_async("tell me a joke", source="test"))
+        
+        assert result["action"] == "chat"
+        assert "tell me a joke" in result["spoken_response"]
+    
+    def test_chat_history_is_kept_per_session(self):
+        import asyncio
+        from jarvis.api.gemini_client import GeminiClient
+        from jarvis.api.llm_backend import LocalBackend
+        from jarvis.api.response_cache import ResponseCache
+        from jarvis.core.ai_engine import AIEngine
+        from jarvis.core.conversation_store import ConversationStore
+        from jarvis.core.prompt_builder import PromptBuilder
+        
+        client = GeminiClient(backend=LocalBackend(latency_ms=20, jitter_ms=0), cache=ResponseCache(path=None, enabled=False))
+        conversations = ConversationStore(db=Mock(**{"get_conversation_history.return_value": []}))
+        router = CommandRouter(ai=AIEngine(client, conversations, PromptBuilder(client=client, background=False)))
+        
+        async def both():
+            return await asyncio.gather(
+                router.handle_command_async("recommend a book", source="phone", session_id="pixel"),
+                router.handle_command_async("recommend a film", source="phone", session_id="tablet"),
+            )
+        
+        with patch('jarvis.core.command_router.db_manager'):
+            asyncio.run(both())
+        
+        assert [m["content"] for m in conversations.history("pixel")][0] == "recommend a book"
+        assert [m["content"] for m in conversations.history("tablet")][0] == "recommend a film"
+        assert len(conversations.history("pixel")) == 2
+        assert conversations.history("default") == []
@@ -0,0 +1,68 @@
+"""
+Tests for the pending confirmation store.
+"""
+
+import threading
+import pytest
+from jarvis.core.confirmation_store import ConfirmationStore
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+class TestConfirmationStore:
+    
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+    
+    @pytest.fixture
+    def store(self, clock):
+        return ConfirmationStore(ttl=60, max_size=3, clock=clock)
+    
+    def test_take_is_per_session_and_one_shot(self, store):
+        delete = {"type": "file", "data": {"action": "delete", "path": "a.txt"}, "original": "delete file a.txt"}
+        store.put(("phone", "pixel"), "delete", delete)
+        
+        assert store.take(("voice", "default")) is None
+        assert store.take(("phone", "pixel"), "shutdown") is None  # wrong kind stays pending
+        assert store.take(("phone", "pixel"), "delete") == delete
+        assert store.take(("phone", "pixel")) is None
+    
+    def test_entries_expire(self, store, clock):
+        store.put(("voice", "default"), "shutdown", {"type": "system"})
+        clock.now = 61
+        assert store.take(("voice", "default")) is None
+        assert store.stats()["expirations"] == 1
+    
+    def test_bounded_size(self, store):
+        for index in range(5):
+            store.put(("phone", str(index)), "delete", {"index": index})
+        assert len(store) == 3
+        assert store.take(("phone", "0")) is None
+        assert store.take(("phone", "4")) == {"index": 4}
+    
+    def test_concurrent_take_replays_once(self, store):
+        store.put(("phone", "pixel"), "delete", {"type": "file"})
+        taken = []
+        barrier = threading.Barrier(8)
+        
+        def worker():
+            barrier.wait()
+            taken.append(store.take(("phone", "pixel"), "delete"))
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sum(1 for item in taken if item is not None) == 1
+    
+    def test_discard(self, store):
+        store.put(("voice", "default"), "restart", {"type": "system"})
+        assert store.discard(("voice", "default")) is True
+        assert store.discard(("voice", "default")) is False
@@ -0,0 +1,128 @@
+"""
+Tests for the in-memory conversation store and its persistence.
+"""
+
+import uuid
+import pytest
+from unittest.mock import Mock
+from jarvis.core.conversation_store import ConversationStore
+
+class FakeDB:
+    """Conversation table stand-in that records calls."""
+
+    def __init__(self, rows=None):
+        self.rows = rows or {}
+        self.reads = 0
+        self.writes = []
+
+    def get_conversation_history(self, session_id, limit):
+        self.reads += 1
+        return self.rows.get(session_id, [])[-limit:]
+
+    def add_conversation_message(self, role, content, session_id):
+        self.writes.append((session_id, role, content))
+        self.rows.setdefault(session_id, []).append({"role": role, "content": content})
+
+    def clear_conversation_history(self, session_id):
+        self.rows.pop(session_id, None)
+
+class TestConversationStore:
+
+    def test_rehydrates_once_then_serves_from_memory(self):
+        db = FakeDB({"phone": [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hey"}]})
+        store = ConversationStore(max_messages=4, db=db)
+        assert not store.is_loaded("phone")
+        assert store.history("phone") == db.rows["phone"]
+
+        store.append("phone", "user", "how are you")
+        assert store.history("phone", limit=2)[-1] == {"role": "user", "content": "how are you"}
+        assert db.reads == 1
+        assert db.writes == [("phone", "user", "how are you")]
+
+    def test_ring_buffer_keeps_latest_messages(self):
+        store = ConversationStore(max_messages=3, db=FakeDB())
+        for i in range(5):
+            store.append("voice", "user", f"m{i}")
+        assert [m["content"] for m in store.history("voice")] == ["m2", "m3", "m4"]
+
+    def test_least_recently_used_sessions_are_evicted(self):
+        db = FakeDB()
+        store = ConversationStore(max_sessions=2, db=db)
+        store.append("a", "user", "1")
+        store.append("b", "user", "2")
+        store.history("a")
+        store.append("c", "user", "3")  # evicts b
+        assert not store.is_loaded("b") and store.is_loaded("a")
+        assert store.history("b") == [{"role": "user", "content": "2"}]  # rehydrated
+        assert store.stats()["evictions"] == 2
+
+    def test_clear(self):
+        db = FakeDB()
+        store = ConversationStore(db=db)
+        store.append("voice", "user", "secret")
+        store.clear("voice")
+        assert store.history("voice") == []
+
+class TestConversationPersistence:
+
+    @pytest.fixture
+    def db(self):
+        from jarvis.database.db_manager import db_manager
+        return db_manager
+
+    def test_batched_writes_trim_each_session(self, db):
+        from jarvis.config.settings import CONVERSATION_BUFFER_SIZE
+
+        session = f"test-{uuid.uuid4().hex}"
+        for i in range(CONVERSATION_BUFFER_SIZE + 5):
+            db.add_conversation_message("user", f"m{i}", session)
+
+        history = db.get_conversation_history(session, limit=100)
+        assert len(history) == CONVERSATION_BUFFER_SIZE
+        assert history[-1]["content"] == f"m{CONVERSATION_BUFFER_SIZE + 4}"
+        db.clear_conversation_history(session)
+        assert db.get_conversation_history(session) == []
+
+class TestSessionIsolation:
+
+    def test_idle_sessions_are_evicted_and_reloaded(self):
+        now = [0.0]
+        db = FakeDB()
+        store = ConversationStore(idle_ttl=60, db=db, clock=lambda: now[0])
+        store.append("pixel", "user", "hi")
+        now[0] = 30
+        store.append("tablet", "user", "hello")
+        now[0] = 70  # pixel idle for 70s, tablet for 40s
+        assert store.is_loaded("tablet")
+        store.history("tablet")
+        assert not store.is_loaded("pixel")
+        assert store.stats()["idle_evictions"] == 1
+        assert store.history("pixel") == [{"role": "user", "content": "hi"}]
+
+    def test_slow_rehydration_does_not_block_other_sessions(self):
+        import threading
+
+        release = threading.Event()
+        db = FakeDB({"fast": [{"role": "user", "content": "hi"}]})
+        load = db.get_conversation_history
+
+        def slow_for_one(session_id, limit):
+            if session_id == "slow":
+                release.wait(5)
+            return load(session_id, limit)
+
+        db.get_conversation_history = slow_for_one
+        store = ConversationStore(db=db)
+        loader = threading.Thread(target=store.history, args=("slow",))
+        loader.start()
+        try:
+            assert store.history("fast") == [{"role": "user", "content": "hi"}]
+            assert loader.is_alive()
+        finally:
+            release.set()
+            loader.join(5)
+
+    def test_exchanges_stay_together(self):
+        store = ConversationStore(db=FakeDB())
+        store.extend("pixel", [("user", "q"), ("assistant", "a")])
+        assert [m["role"] for m in store.history("pixel")] == ["user", "assistant"]
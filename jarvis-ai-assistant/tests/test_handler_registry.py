@@ -0,0 +1,68 @@
+"""
+Tests for the handler registry and latency histograms.
+"""
+
+import pytest
+from jarvis.core.handler_registry import HandlerRegistry
+from jarvis.utils.metrics import LatencyHistogram
+
+class TestLatencyHistogram:
+    
+    def test_snapshot(self):
+        histogram = LatencyHistogram(buckets_ms=(1, 10, 100))
+        for elapsed in (0.5, 5, 5, 50, 500):
+            histogram.observe(elapsed)
+        
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 5
+        assert snapshot["min_ms"] == 0.5
+        assert snapshot["max_ms"] == 500
+        assert snapshot["p50_ms"] == 10
+        assert snapshot["p99_ms"] == 500
+        assert snapshot["buckets"] == {"le_1": 1, "le_10": 2, "le_100": 1, "overflow": 1}
+    
+    def test_empty_and_reset(self):
+        histogram = LatencyHistogram()
+        assert histogram.snapshot()["count"] == 0
+        histogram.observe(3)
+        histogram.reset()
+        assert histogram.snapshot()["count"] == 0
+
+class TestHandlerRegistry:
+    
+    @pytest.fixture
+    def registry(self):
+        return HandlerRegistry()
+    
+    def test_exact_action_beats_catch_all(self, registry):
+        registry.register("system", lambda data, text: {"success": True, "via": "any"})
+        registry.register("system", lambda data, text: {"success": True, "via": "mute"}, action="mute")
+        
+        assert registry.resolve("system", "mute")(None, "")["via"] == "mute"
+        assert registry.resolve("system", "volume_up")(None, "")["via"] == "any"
+        assert registry.resolve("browser", "open_url") is None
+    
+    def test_counters(self, registry):
+        def flaky(data, text):
+            if text == "boom":
+                raise RuntimeError(text)
+            return {"success": text == "ok"}
+        
+        registry.register("custom", flaky, action="run")
+        handler = registry.resolve("custom", "run")
+        handler(None, "ok")
+        handler(None, "nope")
+        with pytest.raises(RuntimeError):
+            handler(None, "boom")
+        
+        stats = registry.stats()["custom.run"]
+        assert (stats["calls"], stats["successes"], stats["failures"], stats["errors"]) == (3, 1, 1, 1)
+        assert stats["latency"]["count"] == 3
+        
+        registry.reset_stats()
+        assert registry.stats()["custom.run"]["calls"] == 0
+    
+    def test_unregister(self, registry):
+        registry.register("custom", lambda data, text: {"success": True})
+        registry.unregister("custom")
+        assert registry.resolve("custom") is None
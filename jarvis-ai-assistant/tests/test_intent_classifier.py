@@ -0,0 +1,56 @@
+"""
+Tests for the local intent classifier.
+"""
+
+import pytest
+from jarvis.core.intent_classifier import IntentClassifier, IntentRerouter
+
+TRAINING = [
+    ("open chrome", "app_launch"),
+    ("open spotify", "app_launch"),
+    ("launch notepad", "app_launch"),
+    ("start spotify please", "app_launch"),
+    ("open vs code", "app_launch"),
+    ("volume up", "system"),
+    ("take a screenshot", "system"),
+    ("mute", "system"),
+    ("search for python", "browser"),
+    ("google weather", "browser"),
+    ("how are you today", "chat"),
+    ("tell me a joke", "chat"),
+    ("what is the meaning of life", "chat"),
+    ("thanks buddy", "chat"),
+]
+
+class TestIntentClassifier:
+    
+    @pytest.fixture
+    def model(self):
+        return IntentClassifier(n_features=2 ** 12).fit(TRAINING)
+    
+    def test_predict(self, model):
+        label, confidence = model.predict("open chrome")
+        assert label == "app_launch"
+        assert 0.0 < confidence <= 1.0
+        assert model.predict("tell me a story")[0] == "chat"
+    
+    def test_save_and_load(self, model, tmp_path):
+        path = tmp_path / "model.npz"
+        model.save(path)
+        loaded = IntentClassifier.load(path)
+        
+        assert loaded.labels == model.labels
+        assert loaded.predict("open spotify") == model.predict("open spotify")
+    
+    def test_reroute_near_miss(self, model):
+        rerouter = IntentRerouter(model, threshold=0.5)
+        result = rerouter.reroute("could you pop open spotify")
+        
+        assert result["type"] == "app_launch"
+        assert result["data"]["app_name"] == "spotify"
+        assert result["original"] == "could you pop open spotify"
+    
+    def test_reroute_keeps_chat(self, model):
+        rerouter = IntentRerouter(model, threshold=0.5)
+        assert rerouter.reroute("how are you doing") is None
+        assert IntentRerouter(None).reroute("could you pop open spotify") is None
@@ -0,0 +1,107 @@
+"""
+Tests for pluggable LLM backends and the local stand-in.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from jarvis.api.llm_backend import GeminiBackend, LocalBackend, LocalBackendError, create_backend
+from jarvis.api.gemini_client import GeminiClient
+from jarvis.api.response_cache import ResponseCache
+from jarvis.api.resilience import CircuitBreaker, RetryPolicy, OPEN
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+class TestLocalBackend:
+
+    def test_replies_are_deterministic(self):
+        first, second = LocalBackend(latency_ms=0), LocalBackend(latency_ms=0)
+        prompt = "System\n\nUser: tell me a joke\n\nJARVIS:"
+        reply = first.generate(prompt, 0.7, 500)
+        assert reply == second.generate(prompt, 0.7, 500)
+        assert "tell me a joke" in reply
+
+    def test_streaming_matches_full_reply(self):
+        backend = LocalBackend(latency_ms=0, stream_chunk_chars=5, chunk_delay_ms=0)
+        chunks = asyncio.run(_collect(backend.stream_async("User: hi", 0.7, 500)))
+        assert len(chunks) > 1
+        assert "".join(chunks) == backend.generate("User: hi", 0.7, 500)
+
+    def test_latency_distribution_and_errors(self):
+        backend = LocalBackend(latency_ms=20, jitter_ms=10, distribution="uniform", seed=1)
+        start = time.perf_counter()
+        asyncio.run(backend.generate_async("User: hi", 0.7, 500))
+        assert 0.009 <= time.perf_counter() - start < 0.5
+
+        failing = LocalBackend(latency_ms=0, error_rate=1.0)
+        with pytest.raises(LocalBackendError):
+            failing.generate("User: hi", 0.7, 500)
+        with pytest.raises(TimeoutError):
+            LocalBackend(latency_ms=200, distribution="fixed").generate("User: hi", 0.7, 500, timeout=0.01)
+        assert failing.stats() == {"calls": 1, "errors": 1}
+
+    def test_create_backend(self):
+        assert create_backend("local", latency_ms=0).name == "local"
+        with pytest.raises(ValueError):
+            create_backend("nope")
+
+class TestGeminiBackend:
+
+    @pytest.fixture
+    def backend(self):
+        genai = pytest.importorskip("google.generativeai")
+        glm = pytest.importorskip("google.ai.generativelanguage")
+        backend = GeminiBackend(api_key=None)
+        # The SDK's real GenerativeModel, with only its network client replaced
+        backend._genai = genai
+        backend.model = genai.GenerativeModel("gemini-pro")
+        backend.model._async_client = MagicMock()
+        backend.model._async_client.generate_content = AsyncMock(return_value=glm.GenerateContentResponse(
+            candidates=[glm.Candidate(content=glm.Content(parts=[glm.Part(text="Hi there!")]))]
+        ))
+        return backend
+
+    def test_generate_uses_the_sdk_signature(self, backend):
+        assert backend.generate("User: hi", 0.7, 500, timeout=5) == "Hi there!"
+        request = backend.model._async_client.generate_content.call_args.args[0]
+        assert request.generation_config.max_output_tokens == 500
+
+    def test_generate_cancels_the_call_at_the_timeout(self, backend):
+        cancelled = threading.Event()
+
+        async def hangs(request):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        backend.model._async_client.generate_content = AsyncMock(side_effect=hangs)
+        start = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            backend.generate("User: hi", 0.7, 500, timeout=0.05)
+        assert time.perf_counter() - start < 1
+        assert cancelled.wait(1)  # the call doesn't keep running in the background
+
+class TestClientOnLocalBackend:
+
+    def test_full_client_runs_offline(self):
+        client = GeminiClient(backend=LocalBackend(latency_ms=1, jitter_ms=0), cache=ResponseCache(path=None, enabled=False))
+        assert client.is_available()
+        assert "joke" in client.chat("tell me a joke")
+        streamed = asyncio.run(_collect(client.chat_stream_async("tell me a joke")))
+        assert "".join(streamed) == client.chat("tell me a joke")
+
+    def test_simulated_outage_opens_circuit(self):
+        client = GeminiClient(
+            backend=LocalBackend(latency_ms=0, error_rate=1.0),
+            cache=ResponseCache(path=None, enabled=False),
+            breaker=CircuitBreaker(failure_threshold=2),
+            retry=RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+        )
+        assert "trouble" in asyncio.run(client.chat_async("hi"))
+        assert client.breaker.state == OPEN
+        assert client.backend.stats()["calls"] == 2
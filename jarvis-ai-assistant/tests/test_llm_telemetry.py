@@ -0,0 +1,129 @@
+"""
+Tests for per-call-site LLM telemetry.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+from jarvis.api.gemini_client import GeminiClient
+from jarvis.api.llm_backend import LocalBackend
+from jarvis.api.llm_telemetry import LLMTelemetry
+from jarvis.api.rate_limiter import RateLimiter, request_source
+from jarvis.api.resilience import CircuitBreaker, RetryPolicy
+from jarvis.api.response_cache import ResponseCache
+
+def _client(telemetry, **kwargs):
+    kwargs.setdefault("backend", LocalBackend(latency_ms=0, error_rate=0, chunk_delay_ms=0, seed=1))
+    return GeminiClient(
+        cache=ResponseCache(path=None),
+        retry=RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.002, deadline=2),
+        telemetry=telemetry,
+        **kwargs
+    )
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+class TestLLMTelemetry:
+
+    @pytest.fixture
+    def telemetry(self):
+        return LLMTelemetry(path=None)
+
+    def test_records_per_call_site_and_source(self, telemetry):
+        client = _client(telemetry)
+        client.chat("hello")
+        token = request_source.set("phone")
+        try:
+            client.complete("what went wrong?", cache=True, call_site="explain_error")
+            client.complete("what went wrong?", cache=True, call_site="explain_error")
+        finally:
+            request_source.reset(token)
+
+        stats = telemetry.snapshot()
+        assert stats["calls"] == 3
+        chat = stats["call_sites"]["chat"]["local"]
+        assert chat["calls"] == 1 and chat["attempts"] == 1 and chat["retries"] == 0
+        assert chat["cache"]["off"] == 1 and chat["fallbacks"] == 0
+        assert chat["prompt_chars"]["max"] > len("hello")
+        assert chat["response_chars"]["max"] > 0
+        assert chat["latency_ms"]["count"] == 1
+
+        explain = stats["call_sites"]["explain_error"]["phone"]
+        assert explain["cache"]["miss"] == 1 and explain["cache"]["hit"] == 1
+        assert explain["attempts"] == 1  # the hit made no backend request
+
+    def test_retries_and_fallback_reasons(self, telemetry):
+        backend = LocalBackend(latency_ms=0, error_rate=1, seed=1)
+        client = _client(telemetry, backend=backend, breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60))
+        assert client.complete("hi", call_site="command_response") is None
+        assert client.complete("hi", call_site="command_response") is None
+
+        stats = telemetry.snapshot()["call_sites"]["command_response"]["local"]
+        assert stats["attempts"] == 3 and stats["retries"] == 2  # the second call found the circuit open
+        assert stats["fallback_reasons"] == {"failed": 1, "circuit_open": 1}
+
+    def test_rate_limited_and_offline_fallbacks(self, telemetry):
+        limiter = RateLimiter(rpm=60, burst=1, low_priority_wait=0)
+        client = _client(telemetry, limiter=limiter)
+        client.complete("first", call_site="command_response")
+        assert client.complete("second", call_site="command_response") is None
+
+        offline = _client(telemetry, backend=MagicMock(is_available=MagicMock(return_value=False)))
+        offline.chat("hello")
+
+        call_sites = telemetry.snapshot()["call_sites"]
+        assert call_sites["command_response"]["local"]["fallback_reasons"] == {"rate_limited": 1}
+        assert call_sites["chat"]["local"]["fallback_reasons"] == {"offline": 1}
+
+    def test_shared_calls(self, telemetry):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow(prompt):
+            started.set()
+            release.wait(5)
+            return "Shared answer"
+
+        client = _client(telemetry, backend=LocalBackend(latency_ms=0, error_rate=0, responder=slow))
+        leader = threading.Thread(target=client.chat, args=("same",))
+        leader.start()
+        assert started.wait(5)
+        follower = threading.Thread(target=client.chat, args=("same",))
+        follower.start()
+        while client.single_flight.stats()["shared"] == 0:
+            time.sleep(0.001)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        stats = telemetry.snapshot()["call_sites"]["chat"]["local"]
+        assert stats["cache"]["shared"] == 1 and stats["attempts"] == 1
+
+    def test_streamed_calls(self, telemetry):
+        client = _client(telemetry)
+        chunks = asyncio.run(_collect(client.chat_stream_async("tell me a joke", call_site="unknown_command")))
+
+        stats = telemetry.snapshot()["call_sites"]["unknown_command"]["local"]
+        assert stats["calls"] == 1 and stats["attempts"] == 1
+        assert stats["response_chars"]["max"] == len("".join(chunks))
+
+    def test_snapshots_go_to_the_log_file(self, tmp_path):
+        path = tmp_path / "llm_telemetry.jsonl"
+        telemetry = LLMTelemetry(path=path, interval=0)
+        assert not telemetry.write_snapshot()  # nothing recorded yet
+
+        telemetry.record("chat", latency_ms=12.0, prompt_chars=100, response_chars=40, attempts=1)
+        assert telemetry.write_snapshot()
+        assert not telemetry.write_snapshot()  # nothing new
+        telemetry.record("summary", attempts=2, fallback="failed")
+        telemetry.stop()
+        telemetry.write_snapshot()
+
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [line["calls"] for line in lines] == [1, 2]
+        assert lines[-1]["call_sites"]["summary"]["local"]["retries"] == 1
+        assert telemetry.stats()["snapshots"] == 2
@@ -0,0 +1,101 @@
+"""
+Worst-case timing tests for the command parser.
+
+Adversarial inputs (long whitespace runs, near-miss keywords, quotes and
+newlines in dictation, random token soup) must parse within a fixed
+budget per KB of input. Set PARSE_BUDGET_MS_PER_KB to tighten or relax
+the budget on slow machines.
+"""
+
+import os
+import random
+import time
+
+import pytest
+from jarvis.utils.text_parsing import (
+    parse_command,
+    parse_app_launch,
+    parse_browser_action,
+    parse_file_operation,
+    parse_system_command,
+    parse_typing_command,
+    clear_parse_cache
+)
+
+BUDGET_MS_PER_KB = float(os.getenv("PARSE_BUDGET_MS_PER_KB", 2.0))
+SIZES = [400, 4_000, 64_000]
+
+ADVERSARIAL = {
+    "copy_whitespace_run": lambda n: "copy" + " " * n + "x",
+    "copy_files_whitespace_newline": lambda n: "copy files" + " " * n + "\nx",
+    "move_from_no_destination": lambda n: "move from " + "a " * (n // 2),
+    "copy_many_to_near_misses": lambda n: "copy " + "tox " * (n // 4),
+    "delete_whitespace_newline": lambda n: "delete" + "\t " * (n // 2) + "\n",
+    "play_without_youtube": lambda n: "play " + "x " * (n // 2) + "on youtub",
+    "open_suffix_whitespace": lambda n: "open x" + " " * n + "pleas",
+    "take_picture_spaces": lambda n: "take" + " " * n + "a" + " " * n + "pictur",
+    "type_dictation": lambda n: "type '" + "hello world, " * (n // 13) + "'",
+    "type_multiline": lambda n: "write " + "line of text\n" * (n // 13),
+    "type_this_colon": lambda n: "please type the following: " + "x" * n,
+    "quotes_only": lambda n: "type " + "'\"" * (n // 2),
+    "chat_transcript": lambda n: "so i was thinking " * (n // 18),
+}
+
+def _token_soup(n: int, seed: int) -> str:
+    tokens = ["copy", "move", "to", "into", "from", "files", "delete", "type",
+              "open", "play", "on", "youtube", "volume", "take", "a", "picture",
+              "'", '"', " ", "  ", "\n", "\t", "x", "for", "search", "google"]
+    rng = random.Random(seed)
+    parts = []
+    while sum(map(len, parts)) < n:
+        parts.append(rng.choice(tokens))
+        parts.append(rng.choice([" ", "", "   "]))
+    return "".join(parts)
+
+def _ms_per_kb(parser, text: str) -> float:
+    best = float("inf")
+    for _ in range(3):
+        clear_parse_cache()
+        start = time.perf_counter()
+        parser(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000 / max(len(text) / 1024, 1)
+
+PARSERS = [
+    parse_command,
+    parse_app_launch,
+    parse_browser_action,
+    parse_file_operation,
+    parse_system_command,
+    parse_typing_command,
+]
+
+class TestParserPerformance:
+    
+    @pytest.mark.parametrize("name", sorted(ADVERSARIAL))
+    @pytest.mark.parametrize("size", SIZES)
+    def test_adversarial_within_budget(self, name, size):
+        text = ADVERSARIAL[name](size)
+        for parser in PARSERS:
+            cost = _ms_per_kb(parser, text)
+            assert cost <= BUDGET_MS_PER_KB, \
+                f"{parser.__name__} took {cost:.2f} ms/KB on {name} ({len(text)} chars)"
+    
+    @pytest.mark.parametrize("seed", range(20))
+    def test_fuzz_within_budget(self, seed):
+        text = _token_soup(8_000, seed)
+        for parser in PARSERS:
+            cost = _ms_per_kb(parser, text)
+            assert cost <= BUDGET_MS_PER_KB, \
+                f"{parser.__name__} took {cost:.2f} ms/KB on fuzz seed {seed}"
+    
+    def test_long_dictation_is_typed_verbatim(self):
+        payload = "first line\nsecond  line"
+        result = parse_command(f"type {payload}")
+        assert result["type"] == "typing"
+        assert result["data"]["text"] == payload
+    
+    def test_long_text_is_chat(self):
+        text = "turn the volume up " * 100
+        assert parse_command(text)["type"] == "chat"
+        assert parse_command("turn the volume up")["type"] == "system"
@@ -0,0 +1,168 @@
+"""
+Tests for the token-budgeted prompt builder.
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import AsyncMock, Mock
+from jarvis.api.resilience import CLOSED, OPEN
+from jarvis.core.ai_engine import AIEngine
+from jarvis.core.prompt_builder import PromptBuilder, estimate_tokens
+
+def messages(count, size=40):
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " + "x" * size}
+        for i in range(count)
+    ]
+
+class TestPromptBuilder:
+
+    @pytest.fixture
+    def client(self):
+        client = Mock()
+        client.complete.return_value = "The user is called Sam and likes jazz."
+        return client
+
+    @pytest.fixture
+    def builder(self, client):
+        return PromptBuilder(
+            client=client, budget_tokens=600, recent_messages=2,
+            summary_batch=2, summary_max_tokens=50, background=False
+        )
+
+    def test_keeps_newest_messages_within_budget(self, builder):
+        built = builder.build("s", "what now?", history=messages(40))
+
+        assert built["tokens"] <= 600
+        assert 0 < built["messages"] < 40
+        assert built["omitted_messages"] == 40 - built["messages"]
+        assert "message 39" in built["prompt"] and "message 0 " not in built["prompt"]
+        assert built["prompt"].endswith("Current message: what now?")
+
+    def test_cuts_an_oversized_newest_message(self, builder):
+        built = builder.build("s", "hi", history=messages(1, size=10000))
+        assert built["messages"] == 1 and built["tokens"] <= 600
+        assert "..." in built["prompt"]
+        assert builder.stats()["truncated_messages"] == 1
+
+    def test_aged_out_messages_are_folded_into_the_summary(self, builder, client):
+        for message in messages(4):
+            builder.record("s", message["role"], message["content"])
+        assert builder.history_limit("s") == 4  # 2 verbatim + 2 waiting for the summary
+
+        assert builder.refresh("s")
+        transcript = client.complete.call_args[0][0]
+        assert "message 0" in transcript and "message 1" in transcript and "message 2" not in transcript
+        assert builder.history_limit("s") == 2
+
+        built = builder.build("s", "what's my name?", history=messages(4)[2:])
+        assert built["summary_used"]
+        assert "Sam and likes jazz" in built["prompt"]
+        assert "Sam" not in builder.build(None, "what's my name?")["prompt"]
+
+    def test_failed_summary_keeps_messages_pending(self, builder, client):
+        client.complete.return_value = None
+        for message in messages(4):
+            builder.record("s", message["role"], message["content"])
+        assert not builder.refresh("s")
+        assert builder.history_limit("s") == 4
+        assert builder.stats()["failed_summaries"] == 1
+
+    def test_no_summary_while_offline_or_circuit_open(self, builder, client):
+        client.is_available.return_value = False
+        for message in messages(4):
+            builder.record("s", message["role"], message["content"])
+        assert not builder.refresh("s")
+
+        client.is_available.return_value = True
+        client.breaker.state = OPEN
+        assert not builder.refresh("s")
+        client.complete.assert_not_called()
+        assert builder.history_limit("s") == 4
+        assert builder.stats()["skipped_summaries"] == 2
+
+        client.breaker.state = CLOSED
+        assert builder.refresh("s")
+        assert builder.summary("s")
+
+    def test_first_build_seeds_from_persisted_history(self, client):
+        source = Mock(return_value=messages(6))
+        builder = PromptBuilder(
+            client=client, recent_messages=2, summary_batch=2, background=False, history_source=source
+        )
+        builder.build("s", "remember me?")
+        builder.build("s", "still there?")
+
+        source.assert_called_once()
+        assert source.call_args[0][0] == "s"
+        assert builder.history_limit("s") == 6  # 2 verbatim + 4 waiting for the summary
+        assert builder.stats()["seeded_sessions"] == 1
+
+        assert builder.refresh("s")
+        transcript = client.complete.call_args[0][0]
+        assert "message 3" in transcript and "message 4" not in transcript
+        assert builder.build("s", "what's my name?")["summary_used"]
+
+    def test_async_replies_seed_off_the_event_loop(self, client):
+        seeded_from = []
+
+        def source(session_id, limit):
+            seeded_from.append(threading.current_thread())
+            return messages(6)
+
+        client.is_available.return_value = False  # history isn't read, but the summary is still seeded
+        client.chat_async = AsyncMock(return_value="Offline reply.")
+        prompts = PromptBuilder(client=client, recent_messages=2, background=False, history_source=source)
+        engine = AIEngine(client, Mock(), prompts)
+
+        async def reply():
+            await engine.generate_reply_async("hi", session_id="s")
+            return threading.current_thread()
+
+        loop_thread = asyncio.run(reply())
+        assert len(seeded_from) == 1 and seeded_from[0] is not loop_thread
+        assert not prompts.needs_seed("s")
+
+    def test_failed_seed_starts_the_session_empty(self, client):
+        source = Mock(side_effect=RuntimeError("database is locked"))
+        builder = PromptBuilder(client=client, background=False, history_source=source)
+        builder.build("s", "hi")
+        builder.build("s", "hi again")
+        source.assert_called_once()
+        assert builder.stats()["seeded_sessions"] == 0
+
+    def test_summaries_run_in_the_background(self, client):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_summary(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return "Summary."
+
+        client.complete.side_effect = slow_summary
+        builder = PromptBuilder(client=client, recent_messages=1, summary_batch=1)
+        builder.record("s", "user", "hello")
+        builder.record("s", "assistant", "hi there")  # returns while the summary is pending
+
+        assert started.wait(5)
+        assert builder.summary("s") == ""
+        release.set()
+        for _ in range(100):
+            if builder.summary("s"):
+                break
+            threading.Event().wait(0.01)
+        assert builder.summary("s") == "Summary."
+        builder.stop()
+
+    def test_latency_reported_by_prompt_size(self, builder):
+        small = builder.build("s", "hi")
+        large = builder.build("s", "hi", history=messages(40))
+        builder.observe(small, 120)
+        builder.observe(large, 480)
+
+        stats = builder.stats()
+        assert stats["prompts"] == 2 and stats["max_tokens"] == large["tokens"]
+        assert sum(h["count"] for h in stats["latency_by_size"].values()) == 2
+        assert len(stats["latency_by_size"]) == 2
+        assert estimate_tokens("abcd" * 10) == 10
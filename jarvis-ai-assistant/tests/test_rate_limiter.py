@@ -0,0 +1,125 @@
+"""
+Tests for the LLM rate limiter.
+"""
+
+import asyncio
+import threading
+import pytest
+from jarvis.api.rate_limiter import RateLimiter, request_source
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestRateLimiter:
+
+    def test_bucket_limits_requests_per_minute(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rpm=60, burst=2, max_concurrent=10, low_priority_wait=0.5, clock=clock)
+        assert limiter.acquire("chat") and limiter.acquire("chat")
+
+        # Next token is a second away: a low-priority caller won't wait that long
+        assert not limiter.acquire("command_response")
+        clock.now += 1
+        assert limiter.acquire("command_response")
+
+        stats = limiter.stats()
+        assert stats["call_sites"]["command_response"] == {
+            "granted": 1, "shed": 1, "wait_ms": stats["call_sites"]["command_response"]["wait_ms"]
+        }
+        assert stats["active"] == 3
+
+    def test_concurrency_cap(self):
+        limiter = RateLimiter(rpm=0, max_concurrent=1)
+        assert limiter.acquire("chat")
+        granted = threading.Event()
+
+        def second():
+            limiter.acquire("chat")
+            granted.set()
+
+        thread = threading.Thread(target=second)
+        thread.start()
+        assert not granted.wait(0.05)
+        limiter.release()
+        assert granted.wait(5)
+        thread.join(5)
+        assert limiter.stats()["max_active"] == 1
+
+    def test_queued_low_priority_caller_gives_up_at_its_deadline(self):
+        limiter = RateLimiter(rpm=0, max_concurrent=1, low_priority_wait=0.05)
+        assert limiter.acquire("chat")
+        assert not limiter.acquire("command_response")
+        assert limiter.stats()["queued"] == 0
+
+    def test_priority_then_round_robin_across_sources(self):
+        limiter = RateLimiter(rpm=0, max_concurrent=1, low_priority_wait=5)
+        order = []
+
+        async def caller(call_site, source):
+            request_source.set(source)
+            assert await limiter.acquire_async(call_site)
+            order.append((call_site, source))
+            limiter.release()
+
+        async def main():
+            assert await limiter.acquire_async("chat")  # hold the only slot
+            tasks = [asyncio.create_task(caller(*flow)) for flow in [
+                ("command_response", "phone"),
+                ("chat", "phone"), ("chat", "phone"), ("chat", "phone"),
+                ("chat", "voice"),
+            ]]
+            await asyncio.sleep(0.01)
+            limiter.release()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        assert order == [
+            ("chat", "phone"), ("chat", "voice"), ("chat", "phone"), ("chat", "phone"),
+            ("command_response", "phone"),
+        ]
+        assert limiter.stats()["by_source"] == {"local": 1, "phone": 4, "voice": 1}
+
+    def test_cancelled_waiter_leaves_the_queue(self):
+        limiter = RateLimiter(rpm=0, max_concurrent=1)
+
+        async def main():
+            assert await limiter.acquire_async("chat")
+            waiter = asyncio.create_task(limiter.acquire_async("chat"))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            limiter.release()
+
+        asyncio.run(main())
+        stats = limiter.stats()
+        assert stats["queued"] == 0 and stats["active"] == 0
+
+class TestGeminiClientRateLimiting:
+
+    def test_low_priority_reply_falls_back_locally_when_saturated(self):
+        from jarvis.api.gemini_client import GeminiClient
+        from jarvis.api.llm_backend import LocalBackend
+        from jarvis.api.response_cache import ResponseCache
+
+        backend = LocalBackend(latency_ms=0)
+        limiter = RateLimiter(rpm=0, max_concurrent=1, low_priority_wait=0.05)
+        client = GeminiClient(backend=backend, cache=ResponseCache(path=None, enabled=False), limiter=limiter)
+
+        assert limiter.acquire("chat")  # a long chat holds the only slot
+        reply = client.generate_command_response("open chrome", True)
+        assert reply in {
+            "Done! Got it handled for you, buddy. 🙂", "All set! Anything else you need? 😊",
+            "Finished! That was easy. 🔥", "Done and done! Let me know what's next.",
+            "Success! Your wish is my command. ✨",
+        }
+        assert backend.stats()["calls"] == 0
+
+        limiter.release()
+        client.generate_command_response("open chrome", True)
+        assert backend.stats()["calls"] == 1
+        assert limiter.stats()["active"] == 0
@@ -0,0 +1,21 @@
+"""
+Tests for the command history re-classification tool.
+"""
+
+from jarvis.tools.reclassify_history import summarize
+
+class TestReclassifyHistory:
+    
+    def test_summary_counts(self):
+        rows = [
+            {"raw_text": "open chrome", "action_type": "app_launch"},
+            {"raw_text": "volume up", "action_type": "system"},
+            {"raw_text": "volume up", "action_type": "chat"},
+            {"raw_text": "tell me a joke", "action_type": None},
+        ]
+        
+        summary = summarize(iter(rows))
+        assert summary["total_rows"] == 4
+        assert summary["intents"] == {"system": 2, "app_launch": 1, "chat": 1}
+        assert summary["changed_rows"] == 2
+        assert summary["changes"] == {"chat -> system": 1, "none -> chat": 1}
@@ -0,0 +1,101 @@
+"""
+Tests for the circuit breaker, backoff and Gemini call deadlines.
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+from jarvis.api.resilience import CircuitBreaker, RetryPolicy, CLOSED, OPEN, HALF_OPEN
+from jarvis.api.gemini_client import GeminiClient
+from jarvis.api.response_cache import ResponseCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestCircuitBreaker:
+
+    def test_opens_after_repeated_failures_and_recovers(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        assert breaker.allow() and breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+        clock.now = 10
+        assert breaker.allow()  # the half-open probe
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()  # only one probe at a time
+        breaker.record_success()
+        assert breaker.state == CLOSED and breaker.allow()
+        assert breaker.stats()["rejected"] == 2
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+        clock.now = 5
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        clock.now = 9
+        assert not breaker.allow()
+        assert breaker.stats()["opens"] == 2
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=2.0)
+        delays = [policy.backoff(attempt) for attempt in range(6) for _ in range(20)]
+        assert all(0 <= delay <= 2.0 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_blocking_backoff_is_capped_lower(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=2.0, blocking_max_delay=0.1)
+        delays = [policy.backoff(attempt, blocking=True) for attempt in range(6) for _ in range(20)]
+        assert all(0 <= delay <= 0.1 for delay in delays)
+
+class TestGeminiResilience:
+
+    @pytest.fixture
+    def client(self):
+        client = GeminiClient(
+            api_key=None,
+            cache=ResponseCache(path=None, enabled=False),
+            breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+            retry=RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.02, deadline=0.3)
+        )
+        client.backend.model = MagicMock()
+        return client
+
+    def test_open_circuit_skips_straight_to_local_fallback(self, client):
+        client.backend.model.generate_content_async = AsyncMock(side_effect=RuntimeError("503"))
+        assert "trouble" in client.chat("hello")
+        assert client.breaker.state == OPEN
+        calls = client.backend.model.generate_content_async.call_count
+        assert calls == 2  # third attempt refused by the open circuit
+
+        client._generate_local_response = MagicMock(return_value="Done! (local)")
+        assert client.generate_command_response("open chrome", True) == "Done! (local)"
+        assert client.backend.model.generate_content_async.call_count == calls
+
+    def test_deadline_caps_total_time(self, client):
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(5)
+
+        client.backend.model.generate_content_async = hang
+        start = time.perf_counter()
+        response = asyncio.run(client.chat_async("hello"))
+        assert time.perf_counter() - start < 1.0
+        assert "trouble" in response
+
+    def test_retry_then_success(self, client):
+        client.backend.model.generate_content_async = AsyncMock(
+            side_effect=[RuntimeError("blip"), MagicMock(text="Back online!")]
+        )
+        assert asyncio.run(client.chat_async("hello")) == "Back online!"
+        assert client.breaker.stats()["consecutive_failures"] == 0
@@ -0,0 +1,99 @@
+"""
+Tests for the persistent LLM response cache.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+from jarvis.api.response_cache import ResponseCache, cache_key
+from jarvis.api.gemini_client import GeminiClient
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def make_cache(tmp_path, clock):
+    caches = []
+
+    def make(**kwargs):
+        kwargs.setdefault("ttl", 60)
+        cache = ResponseCache(path=tmp_path / "llm.sqlite3", clock=clock, enabled=True, **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+class TestResponseCache:
+
+    def test_key_covers_generation_parameters(self):
+        assert cache_key(prompt="hi", temperature=0.5) == cache_key(temperature=0.5, prompt="hi")
+        assert cache_key(prompt="hi", temperature=0.5) != cache_key(prompt="hi", temperature=0.7)
+
+    def test_survives_restart(self, make_cache):
+        first = make_cache()
+        first.put("k", "Hello buddy!")
+        assert first.get("k") == "Hello buddy!"
+        first.close()
+
+        second = make_cache()
+        assert second.get("k") == "Hello buddy!"
+        assert second.get("k") == "Hello buddy!"
+        stats = second.stats()
+        assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+
+    def test_ttl_expiry(self, make_cache, clock):
+        cache = make_cache(ttl=10)
+        cache.put("k", "old")
+        clock.now += 11
+        assert cache.get("k") is None
+        assert len(cache) == 0
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction_on_disk(self, make_cache, clock):
+        cache = make_cache(max_entries=2, memory_entries=0)
+        for key in ("a", "b"):
+            cache.put(key, key.upper())
+            clock.now += 1
+        assert cache.get("a") == "A"  # a is now more recently used than b
+        clock.now += 1
+        cache.put("c", "C")
+        assert cache.get("b") is None
+        assert cache.get("a") == "A" and cache.get("c") == "C"
+        assert cache.stats()["evictions"] == 1
+
+class TestGeminiClientCaching:
+
+    @pytest.fixture
+    def client(self, make_cache):
+        client = GeminiClient(api_key=None, cache=make_cache())
+        client.backend.model = MagicMock()
+        client.backend.model.generate_content_async = AsyncMock(return_value=MagicMock(text="Hey there! "))
+        return client
+
+    def test_only_opted_in_calls_are_cached(self, client):
+        assert client.chat("hello", cache=True) == "Hey there!"
+        assert client.chat("hello", cache=True) == "Hey there!"
+        assert client.backend.model.generate_content_async.call_count == 1
+
+        client.chat("hello")
+        assert client.backend.model.generate_content_async.call_count == 2
+
+    def test_async_shares_the_cache_and_skips_fallbacks(self, client):
+        client.backend.model.generate_content_async.side_effect = RuntimeError("quota")
+        fallback = client.chat("hello", cache=True, max_retries=1)
+        assert "trouble" in fallback
+
+        client.backend.model.generate_content_async.side_effect = None
+        assert asyncio.run(client.chat_async("hello", cache=True)) == "Hey there!"
+        assert client.chat("hello", cache=True) == "Hey there!"
+        assert client.backend.model.generate_content_async.call_count == 2  # the failed call and the async one
@@ -0,0 +1,101 @@
+"""
+Tests for the priority command scheduler.
+"""
+
+import asyncio
+import pytest
+from jarvis.core.scheduler import (
+    CommandScheduler, classify, PRIORITY_DEVICE, PRIORITY_FILE, PRIORITY_CHAT
+)
+
+def _job(order, name, hold=0.01):
+    async def job():
+        order.append(name)
+        await asyncio.sleep(hold)
+        return name
+    return job
+
+async def _occupy(scheduler, order, source="busy", priority=PRIORITY_DEVICE):
+    """Fill every slot with one job, then queue behind it."""
+    blocker = asyncio.create_task(scheduler.run(source, priority, _job(order, "blocker", 0.03)))
+    await asyncio.sleep(0)
+    return blocker
+
+class TestCommandScheduler:
+
+    def test_classify(self):
+        assert classify("open chrome") == PRIORITY_DEVICE
+        assert classify("mute") == PRIORITY_DEVICE
+        assert classify("delete file notes.txt") == PRIORITY_FILE
+        assert classify("tell me a joke") == PRIORITY_CHAT
+
+    def test_high_priority_jumps_ahead(self):
+        order = []
+
+        async def scenario():
+            scheduler = CommandScheduler(workers=1, reserved=0)
+            blocker = await _occupy(scheduler, order)
+            jobs = [
+                scheduler.run("api", PRIORITY_CHAT, _job(order, "chat")),
+                scheduler.run("phone", PRIORITY_FILE, _job(order, "file")),
+                scheduler.run("phone", PRIORITY_DEVICE, _job(order, "mute")),
+            ]
+            await asyncio.gather(blocker, *jobs)
+            return scheduler
+
+        scheduler = asyncio.run(scenario())
+        assert order == ["blocker", "mute", "file", "chat"]
+        stats = scheduler.stats()
+        assert stats["classes"]["chat"]["executed"] == 1
+        assert stats["max_queued"] == 3
+        assert stats["running"] == 0 and stats["queued"] == 0
+
+    def test_round_robin_across_sources(self):
+        order = []
+
+        async def scenario():
+            scheduler = CommandScheduler(workers=1, reserved=0)
+            blocker = await _occupy(scheduler, order)
+            jobs = [scheduler.run("phone", PRIORITY_DEVICE, _job(order, f"phone{i}")) for i in range(3)]
+            jobs.append(scheduler.run("voice", PRIORITY_DEVICE, _job(order, "voice0")))
+            await asyncio.gather(blocker, *jobs)
+
+        asyncio.run(scenario())
+        assert order == ["blocker", "phone0", "voice0", "phone1", "phone2"]
+
+    def test_reserved_slot_keeps_device_control_responsive(self):
+        order = []
+
+        async def scenario():
+            scheduler = CommandScheduler(workers=2, reserved=1)
+            chats = [
+                asyncio.create_task(scheduler.run("api", PRIORITY_CHAT, _job(order, f"chat{i}", 0.05)))
+                for i in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            assert scheduler.stats()["running"] == 1  # second chat waits for the shared slot
+            await scheduler.run("phone", PRIORITY_DEVICE, _job(order, "mute"))
+            assert "chat1" not in order  # mute did not wait behind the chats
+            await asyncio.gather(*chats)
+
+        asyncio.run(scenario())
+        assert order == ["chat0", "mute", "chat1"]
+
+    def test_errors_and_cancellation_release_slots(self):
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def scenario():
+            scheduler = CommandScheduler(workers=1, reserved=0)
+            with pytest.raises(RuntimeError):
+                await scheduler.run("phone", PRIORITY_DEVICE, fail)
+            blocker = await _occupy(scheduler, [])
+            waiting = asyncio.create_task(scheduler.run("api", PRIORITY_CHAT, _job([], "chat")))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await blocker
+            assert await scheduler.run("phone", PRIORITY_DEVICE, _job([], "after")) == "after"
+            return scheduler.stats()
+
+        stats = asyncio.run(scenario())
+        assert stats["running"] == 0 and stats["queued"] == 0
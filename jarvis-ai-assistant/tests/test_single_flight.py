@@ -0,0 +1,162 @@
+"""
+Tests for single-flight coalescing of identical in-flight requests.
+"""
+
+import asyncio
+import threading
+import pytest
+from jarvis.api.single_flight import SingleFlight
+
+class TestSingleFlightThreads:
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight(enabled=True)
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return "reply"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while flight.stats()["requests"] < 5:
+            threading.Event().wait(0.005)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == ["reply"] * 5 and len(calls) == 1
+        assert flight.stats()["shared"] == 4 and flight.stats()["in_flight"] == 0
+
+    def test_error_reaches_every_caller(self):
+        flight = SingleFlight(enabled=True)
+        release = threading.Event()
+
+        def failing():
+            release.wait(5)
+            raise RuntimeError("quota")
+
+        errors = []
+
+        def caller():
+            try:
+                flight.do("k", failing)
+            except RuntimeError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=caller) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while flight.stats()["requests"] < 3:
+            threading.Event().wait(0.005)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert errors == ["quota"] * 3
+        assert flight.stats()["errors"] == 1
+
+class TestSingleFlightAsync:
+
+    def test_identical_keys_share_and_others_do_not(self):
+        flight = SingleFlight(enabled=True)
+        calls = []
+
+        async def call(value):
+            calls.append(value)
+            await asyncio.sleep(0.02)
+            return value.upper()
+
+        async def main():
+            return await asyncio.gather(
+                *(flight.do_async("a", lambda: call("a")) for _ in range(4)),
+                flight.do_async("b", lambda: call("b"))
+            )
+
+        assert asyncio.run(main()) == ["A", "A", "A", "A", "B"]
+        assert calls == ["a", "b"]
+        assert flight.stats()["executions"] == 2 and flight.stats()["shared"] == 3
+
+    def test_error_propagates_to_all_waiters(self):
+        flight = SingleFlight(enabled=True)
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("bad prompt")
+
+        async def main():
+            return await asyncio.gather(
+                *(flight.do_async("k", failing) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(main())
+        assert all(isinstance(result, ValueError) for result in results)
+
+    def test_cancelled_waiter_leaves_the_call_running(self):
+        flight = SingleFlight(enabled=True)
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def main():
+            first = asyncio.create_task(flight.do_async("k", call))
+            second = asyncio.create_task(flight.do_async("k", call))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+        assert asyncio.run(main()) == "done"
+        assert len(calls) == 1 and flight.stats()["cancelled"] == 0
+
+    def test_call_is_cancelled_when_every_waiter_gives_up(self):
+        flight = SingleFlight(enabled=True)
+        cancelled = []
+
+        async def call():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def main():
+            waiters = [asyncio.create_task(flight.do_async("k", call)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            await asyncio.sleep(0)
+
+        asyncio.run(main())
+        assert cancelled == [True]
+        assert flight.stats()["cancelled"] == 1 and flight.stats()["in_flight"] == 0
+
+class TestGeminiClientSingleFlight:
+
+    def test_duplicate_prompts_make_one_backend_call(self):
+        from jarvis.api.gemini_client import GeminiClient
+        from jarvis.api.llm_backend import LocalBackend
+        from jarvis.api.response_cache import ResponseCache
+
+        backend = LocalBackend(latency_ms=30, jitter_ms=0)
+        client = GeminiClient(
+            backend=backend, cache=ResponseCache(path=None, enabled=False),
+            single_flight=SingleFlight(enabled=True)
+        )
+
+        async def main():
+            return await asyncio.gather(*(client.chat_async("tell me a joke") for _ in range(3)))
+
+        replies = asyncio.run(main())
+        assert len(set(replies)) == 1
+        assert backend.stats()["calls"] == 1
+        assert client.single_flight.stats()["shared"] == 2
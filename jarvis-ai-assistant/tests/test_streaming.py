@@ -0,0 +1,87 @@
+"""
+Tests for streamed replies: sentence splitting and Gemini streaming.
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+from jarvis.core.streaming import SentenceSplitter, stream_sentences
+from jarvis.api.gemini_client import GeminiClient
+from jarvis.api.resilience import RetryPolicy
+from jarvis.api.response_cache import ResponseCache
+
+async def _chunks(*parts, error=None):
+    for part in parts:
+        await asyncio.sleep(0)
+        yield MagicMock(text=part)
+    if error:
+        raise error
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+class TestSentenceSplitter:
+
+    def test_sentences_complete_as_soon_as_possible(self):
+        splitter = SentenceSplitter()
+        assert splitter.feed("Hey there! I'm") == ["Hey there!"]
+        assert splitter.feed(" on it") == []
+        assert splitter.feed(".\nNext") == ["I'm on it."]
+        assert splitter.flush() == "Next"
+        assert splitter.flush() is None
+
+    def test_abbreviations_and_decimals_do_not_split(self):
+        splitter = SentenceSplitter()
+        sentences = splitter.feed("Ask Dr. Smith, e.g. tomorrow. It costs 3.5 dollars. ")
+        assert sentences == ["Ask Dr. Smith, e.g. tomorrow.", "It costs 3.5 dollars."]
+
+    def test_stream_sentences(self):
+        async def chunks():
+            for part in ["Done", "! Anything", " else?", " Bye"]:
+                yield part
+
+        assert asyncio.run(_collect(stream_sentences(chunks()))) == ["Done!", "Anything else?", "Bye"]
+
+class TestGeminiStreaming:
+
+    @pytest.fixture
+    def client(self):
+        client = GeminiClient(api_key=None, cache=ResponseCache(path=None, enabled=True))
+        client.backend.model = MagicMock()
+        return client
+
+    def test_streams_and_caches_complete_reply(self, client):
+        client.backend.model.generate_content_async = AsyncMock(side_effect=lambda *a, **k: _chunks("Hi ", "buddy!"))
+
+        assert asyncio.run(_collect(client.chat_stream_async("hello", cache=True))) == ["Hi ", "buddy!"]
+        assert client.backend.model.generate_content_async.call_args.kwargs["stream"] is True
+        assert asyncio.run(_collect(client.chat_stream_async("hello", cache=True))) == ["Hi buddy!"]
+        assert client.backend.model.generate_content_async.call_count == 1
+
+    def test_failures(self, client):
+        client.backend.model.generate_content_async = AsyncMock(side_effect=RuntimeError("quota"))
+        [fallback] = asyncio.run(_collect(client.chat_stream_async("hello")))
+        assert "trouble" in fallback
+
+        # A stream that breaks off keeps what was said and is not cached
+        client.backend.model.generate_content_async = AsyncMock(
+            side_effect=lambda *a, **k: _chunks("Partial", error=RuntimeError("reset"))
+        )
+        assert asyncio.run(_collect(client.chat_stream_async("hello", cache=True))) == ["Partial"]
+        assert client.cache.stats()["stores"] == 0
+
+    def test_deadline_caps_a_stalled_stream(self, client):
+        async def stalls():
+            yield MagicMock(text="Hello.")
+            await asyncio.sleep(60)
+            yield MagicMock(text="never")
+
+        client.retry = RetryPolicy(deadline=0.1)
+        client.backend.model.generate_content_async = AsyncMock(side_effect=lambda *a, **k: stalls())
+        start = time.perf_counter()
+        assert asyncio.run(_collect(client.chat_stream_async("hello", cache=True))) == ["Hello."]
+        assert time.perf_counter() - start < 2
+        assert client.breaker.stats()["consecutive_failures"] == 1
+        assert client.limiter.stats()["active"] == 0
+        assert client.cache.stats()["stores"] == 0
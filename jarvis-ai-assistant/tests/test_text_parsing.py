@@ -5,12 +5,15 @@ Tests for text parsing utilities.
 import pytest
 from jarvis.utils.text_parsing import (
     parse_command,
+    parse_commands,
+    parse_plan,
     parse_app_launch,
     parse_browser_action,
     parse_file_operation,
     parse_system_command,
     parse_typing_command,
-    extract_quoted_text
+    extract_quoted_text,
+    IntentRegistry
 )
 
 class TestTextParsing:
@@ -82,4 +85,90 @@ class TestTextParsing:
     def test_extract_quoted_text(self):
         assert extract_quoted_text('say "hello"') == "hello"
         assert extract_quoted_text("type 'world'") == "world"
-        assert extract_quoted_text("no quotes here") is None
\ No newline at end of file
+        assert extract_quoted_text("no quotes here") is None
+    
+    def test_parse_command_data(self):
+        result = parse_command('copy files from "C:/a" to "D:/b"')
+        assert result["data"] == {"action": "copy", "source": "c:/a", "destination": "d:/b"}
+        
+        result = parse_command("Open Spotify please")
+        assert result["data"] == {"app_name": "spotify"}
+        assert result["original"] == "Open Spotify please"
+        
+        result = parse_command("go to www.example.com")
+        assert result["data"] == {"action": "open_url", "url": "https://www.example.com"}
+    
+    def test_captures_keep_original_whitespace(self):
+        assert parse_command('copy "a  b.txt" to x')["data"] == {
+            "action": "copy", "source": "a  b.txt", "destination": "x"
+        }
+        assert parse_file_operation("move  my\tnotes.txt   into  backup dir")["destination"] == "backup dir"
+        assert parse_file_operation("delete file old  report.pdf")["path"] == "old  report.pdf"
+        assert parse_browser_action("search for line one\nline two")["query"] == "line one"
+        assert parse_app_launch("open  visual studio   please") == "visual studio"
+
+    def test_intent_registry_triggers(self):
+        calls = []
+        
+        def matcher(name):
+            def match(text):
+                calls.append(name)
+                return {"text": text}
+            return match
+        
+        registry = IntentRegistry()
+        registry.register("verb", matcher("verb"), leading=("open",))
+        registry.register("keyword", matcher("keyword"), keywords=("volume",))
+        registry.register("early", matcher("early"), leading=("open",), before="verb")
+        
+        assert registry.names() == ["early", "verb", "keyword"]
+        assert registry.match("open chrome")[0] == "early"
+        assert registry.match("turn the volume up")[0] == "keyword"
+        assert registry.match("how are you") is None
+        assert calls == ["early", "keyword"]
+    
+    def test_parse_command_results_are_read_only(self):
+        result = parse_command("open chrome")
+        with pytest.raises(TypeError):
+            result["data"]["app_name"] = "firefox"
+        assert parse_command("Open Chrome!")["data"]["app_name"] == "chrome"
+    
+    def test_parse_commands_stream(self):
+        texts = ["open chrome", "volume up", "how are you"] * 50
+        expected = [parse_command(text) for text in texts]
+        
+        assert list(parse_commands(iter(texts))) == expected
+        assert list(parse_commands(iter(texts), workers=2, chunk_size=16)) == expected
+    
+    def test_parse_plan_splits_compound_commands(self):
+        steps = parse_plan("Open chrome and search for flight prices and turn the volume up")
+        assert [step["type"] for step in steps] == ["app_launch", "browser", "system"]
+        assert steps[0]["data"]["app_name"] == "chrome"
+        assert steps[1]["data"]["query"] == "flight prices"
+        assert steps[1]["original"] == "search for flight prices"
+    
+    def test_parse_plan_keeps_single_commands_whole(self):
+        assert len(parse_plan("search for salt and pepper")) == 1
+        assert len(parse_plan("copy a and b to c")) == 1
+        assert len(parse_plan("how are you and what's up")) == 1
+        
+        steps = parse_plan("open notepad and type hello and goodbye")
+        assert [step["type"] for step in steps] == ["app_launch", "typing"]
+        assert steps[1]["data"]["text"] == "hello and goodbye"
+    
+    def test_parse_plan_needs_a_leading_verb_per_step(self):
+        for text in (
+            "search for pictures and screenshots",
+            "search for cameras, picture frames and volume knobs",
+            "look up restaurants and their opening hours, then the power outage map",
+            "open the notes app and the restart guide",
+        ):
+            assert len(parse_plan(text)) == 1, text
+        
+        steps = parse_plan("search for pictures and take a screenshot")
+        assert [step["type"] for step in steps] == ["browser", "system"]
+    
+    def test_parse_plan_keeps_original_whitespace(self):
+        steps = parse_plan('copy "a  b.txt" to x  and then  open notepad')
+        assert [step["type"] for step in steps] == ["file", "app_launch"]
+        assert steps[0]["data"]["source"] == "a  b.txt"
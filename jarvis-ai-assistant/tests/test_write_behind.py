@@ -0,0 +1,108 @@
+"""
+Tests for the write-behind buffer.
+"""
+
+import threading
+import time
+import pytest
+from jarvis.database.write_behind import WriteBehindBuffer
+
+class RecordingSink:
+    """flush_fn that records batches and can be paused."""
+    
+    def __init__(self):
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+    
+    def __call__(self, batch):
+        self.gate.wait(5)
+        self.batches.append(list(batch))
+    
+    @property
+    def rows(self):
+        return [row for batch in self.batches for row in batch]
+
+class TestWriteBehindBuffer:
+    
+    @pytest.fixture
+    def sink(self):
+        return RecordingSink()
+    
+    def test_flush_writes_in_order_and_batches(self, sink):
+        buffer = WriteBehindBuffer(sink, max_batch=4, flush_interval=60)
+        for i in range(10):
+            buffer.put(i)
+        buffer.flush()
+        
+        assert sink.rows == list(range(10))
+        assert all(len(batch) <= 4 for batch in sink.batches)
+        assert buffer.stats()["written"] == 10
+        buffer.close()
+    
+    def test_time_based_flush(self, sink):
+        buffer = WriteBehindBuffer(sink, max_batch=100, flush_interval=0.05)
+        buffer.put("row")
+        deadline = time.time() + 2
+        while not sink.rows and time.time() < deadline:
+            time.sleep(0.01)
+        assert sink.rows == ["row"]
+        buffer.close()
+    
+    def test_close_flushes_remaining(self, sink):
+        buffer = WriteBehindBuffer(sink, max_batch=100, flush_interval=60)
+        buffer.put(1)
+        buffer.put(2)
+        buffer.close()
+        assert sink.rows == [1, 2]
+        
+        buffer.put(3)  # after close: written synchronously
+        assert sink.rows == [1, 2, 3]
+    
+    def test_overflow_drop_oldest(self, sink):
+        sink.gate.clear()
+        buffer = WriteBehindBuffer(sink, max_batch=100, flush_interval=60,
+                                   capacity=3, overflow_policy="drop_oldest")
+        for i in range(5):
+            buffer.put(i)
+        sink.gate.set()
+        buffer.flush()
+        
+        assert sink.rows == [2, 3, 4]
+        assert buffer.stats()["dropped"] == 2
+        buffer.close()
+    
+    def test_overflow_sync(self, sink):
+        buffer = WriteBehindBuffer(sink, max_batch=100, flush_interval=60,
+                                   capacity=2, overflow_policy="sync")
+        for i in range(3):
+            buffer.put(i)
+        
+        assert sink.rows == [2]
+        assert buffer.stats()["sync_writes"] == 1
+        buffer.close()
+        assert sorted(sink.rows) == [0, 1, 2]
+    
+    def test_overflow_block_falls_back_to_sync(self, sink):
+        buffer = WriteBehindBuffer(sink, max_batch=100, flush_interval=60, capacity=1,
+                                   overflow_policy="block", block_timeout=0.05)
+        buffer.put(0)
+        buffer.put(1)  # no room and the writer is idle: waits, then writes inline
+        
+        assert sink.rows == [1]
+        buffer.close()
+        assert sorted(sink.rows) == [0, 1]
+    
+    def test_failed_batch_is_counted(self):
+        def broken(batch):
+            raise RuntimeError("disk full")
+        
+        buffer = WriteBehindBuffer(broken, max_batch=10, flush_interval=60)
+        buffer.put(1)
+        buffer.flush()
+        assert buffer.stats()["failed"] == 1
+        buffer.close()
+    
+    def test_unknown_policy(self, sink):
+        with pytest.raises(ValueError):
+            WriteBehindBuffer(sink, overflow_policy="explode")